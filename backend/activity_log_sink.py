@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Callable, Awaitable, Optional
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+class ActivityLogSink:
+    def __init__(self, writer: Callable[[List[Dict[str, Any]]], Awaitable[None]]):
+        """
+        Buffered, batching writer for activity log rows
+
+        Rows are queued in memory and written with multi-row inserts when
+        ACTIVITY_LOG_BATCH_SIZE rows are waiting or every
+        ACTIVITY_LOG_FLUSH_INTERVAL seconds. If the database is unavailable
+        the batch is appended to a JSONL spill file. A replay first rotates
+        that file into a sealed segment. It then streams the segments back in
+        batches and records its progress in a small offset file, so nothing
+        is rewritten. After a failed replay the next attempt waits
+        exponentially longer, up to ACTIVITY_LOG_REPLAY_BACKOFF_MAX seconds.
+
+        Args:
+            writer: Coroutine inserting a list of rows in one statement
+        """
+        self.writer = writer
+        self.batch_size = int(os.getenv('ACTIVITY_LOG_BATCH_SIZE', '100'))
+        self.flush_interval = float(os.getenv('ACTIVITY_LOG_FLUSH_INTERVAL', '2'))
+        self.max_buffer = int(os.getenv('ACTIVITY_LOG_MAX_BUFFER', '10000'))
+        self.spill_path = Path(os.getenv('ACTIVITY_LOG_SPILL_PATH', str(ROOT_DIR / 'data' / 'activity_log_spill.jsonl')))
+        self.replay_backoff_max = float(os.getenv('ACTIVITY_LOG_REPLAY_BACKOFF_MAX', '300'))
+
+        self._buffer: deque = deque()
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Rows left on disk by an earlier run are replayed too
+        self._spill_pending = self.spill_path.exists() or bool(self._segments())
+        self._replay_failures = 0
+        self._replay_not_before = 0.0
+
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.flush_errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def enqueue(self, row: Dict[str, Any]):
+        """Queue a row without waiting on the database"""
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+        self._buffer.append(row)
+        self.queued += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def start(self):
+        """Start the background flush loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write (or spill) everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing activity logs: {e}")
+
+    async def flush(self):
+        """Write buffered rows in batches, replaying any spilled rows first"""
+        async with self._flush_lock:
+            if self._spill_pending:
+                if time.monotonic() < self._replay_not_before or not await self._replay_spill():
+                    # Database unavailable or backing off: spill the buffer behind the older rows
+                    await self._spill(self._drain(len(self._buffer)))
+                    return
+
+            while self._buffer:
+                batch = self._drain(self.batch_size)
+                try:
+                    await self.writer(batch)
+                    self.written += len(batch)
+                except Exception as e:
+                    self.flush_errors += 1
+                    logger.warning(f"Activity log insert failed, spilling {len(batch) + len(self._buffer)} rows to disk: {e}")
+                    await self._spill(batch + self._drain(len(self._buffer)))
+                    return
+
+    def _drain(self, count: int) -> List[Dict[str, Any]]:
+        return [self._buffer.popleft() for _ in range(min(count, len(self._buffer)))]
+
+    async def _spill(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+
+        def append_rows():
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, 'a') as spill_file:
+                for row in rows:
+                    spill_file.write(json.dumps(row, default=str) + '\n')
+
+        try:
+            await asyncio.to_thread(append_rows)
+            self.spilled += len(rows)
+            self._spill_pending = True
+        except OSError as e:
+            self.dropped += len(rows)
+            logger.error(f"Could not spill {len(rows)} activity log rows to {self.spill_path}: {e}")
+
+    def _segments(self) -> List[Path]:
+        """Sealed spill segments, oldest first"""
+        return sorted(self.spill_path.parent.glob(f"{self.spill_path.stem}.*.replay"))
+
+    def _read_batch(self, segment: Path, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        rows = []
+        with open(segment, 'rb') as segment_file:
+            segment_file.seek(offset)
+            while len(rows) < self.batch_size:
+                line = segment_file.readline()
+                if not line:
+                    break
+                if line.strip():
+                    rows.append(json.loads(line))
+            return rows, segment_file.tell()
+
+    async def _replay_spill(self) -> bool:
+        """Write spilled rows back to the database; returns False if the database is still failing"""
+
+        def rotate():
+            # New spills go to a fresh file while the sealed segment is replayed
+            if self.spill_path.exists():
+                os.replace(self.spill_path, self.spill_path.with_name(f"{self.spill_path.stem}.{time.time_ns():020d}.replay"))
+            return self._segments()
+
+        def load_offset(offset_path: Path) -> int:
+            return int(offset_path.read_text()) if offset_path.exists() else 0
+
+        def finish(segment: Path, offset_path: Path):
+            segment.unlink()
+            offset_path.unlink(missing_ok=True)
+
+        replayed = 0
+        for segment in await asyncio.to_thread(rotate):
+            offset_path = segment.with_suffix('.offset')
+            offset = await asyncio.to_thread(load_offset, offset_path)
+            while True:
+                batch, next_offset = await asyncio.to_thread(self._read_batch, segment, offset)
+                if not batch:
+                    break
+                try:
+                    await self.writer(batch)
+                except Exception as e:
+                    self.flush_errors += 1
+                    self._replay_failures += 1
+                    delay = min(self.replay_backoff_max, self.flush_interval * 2 ** (self._replay_failures - 1))
+                    self._replay_not_before = time.monotonic() + delay
+                    logger.warning(f"Activity log replay failed, keeping rows spilled and retrying in {delay:.0f}s: {e}")
+                    return False
+                self.written += len(batch)
+                self.replayed += len(batch)
+                replayed += len(batch)
+                offset = next_offset
+                await asyncio.to_thread(offset_path.write_text, str(offset))
+            await asyncio.to_thread(finish, segment, offset_path)
+
+        self._spill_pending = False
+        self._replay_failures = 0
+        logger.info(f"Replayed {replayed} spilled activity log rows")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queued/written/dropped counters"""
+        return {
+            'running': self.running,
+            'buffered': len(self._buffer),
+            'queued': self.queued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'spilled': self.spilled,
+            'replayed': self.replayed,
+            'flush_errors': self.flush_errors,
+            'spill_pending': self._spill_pending,
+            'replay_failures': self._replay_failures
+        }
@@ -0,0 +1,110 @@
+import os
+import io
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from reportlab.lib.utils import ImageReader
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Branding images committed with the backend (point ADYC_LOGO_PATH at a file to override)
+ASSETS_DIR = Path(__file__).parent / 'assets'
+
+# Branding images used by the ID card renderer: name -> (local file name, path override env var, remote source)
+BRANDING_ASSETS = {
+    'adyc_logo': (
+        'adyc_logo.png',
+        'ADYC_LOGO_PATH',
+        "https://customer-assets.emergentagent.com/job_a7d4cce0-5f6d-4a96-91ac-874ffa2967f3/artifacts/etvajhhm_ChatGPT%20Image%20Sep%204%2C%202025%2C%2008_59_21%20AM.png"
+    ),
+}
+
+class AssetRegistry:
+    def __init__(self):
+        self.assets_dir = Path(os.getenv('ADYC_ASSETS_DIR', str(ASSETS_DIR)))
+        # Opt-in: only reach out to the remote source when a local copy is missing
+        self.remote_fallback = os.getenv('ADYC_ASSETS_REMOTE_FALLBACK', 'False').lower() == 'true'
+        self._images: Dict[str, Optional[ImageReader]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self):
+        """Load and decode every branding image once (called at startup)"""
+        with self._lock:
+            if self._loaded:
+                return
+            for name in BRANDING_ASSETS:
+                self._images[name] = self._load_image(name)
+            self._loaded = True
+
+    def get_image(self, name: str) -> Optional[ImageReader]:
+        """
+        Get a pre-decoded branding image
+
+        Args:
+            name: Asset name (e.g. 'adyc_logo')
+
+        Returns:
+            ImageReader ready for canvas.drawImage, or None if the asset is unavailable
+        """
+        if not self._loaded:
+            self.load()
+        return self._images.get(name)
+
+    def _resolve_path(self, name: str) -> Path:
+        filename, override_env, _ = BRANDING_ASSETS[name]
+        override = os.getenv(override_env)
+        return Path(override) if override else self.assets_dir / filename
+
+    def _load_image(self, name: str) -> Optional[ImageReader]:
+        path = self._resolve_path(name)
+        try:
+            if path.exists():
+                image_bytes = path.read_bytes()
+            elif self.remote_fallback:
+                image_bytes = self._fetch_remote(name, path)
+            else:
+                logger.warning(f"Branding asset '{name}' not found at {path}; remote fallback disabled")
+                return None
+
+            reader = ImageReader(io.BytesIO(image_bytes))
+            # Decode now so card renders never touch the source image again
+            reader.getRGBData()
+            logger.info(f"Loaded branding asset '{name}' ({reader.getSize()[0]}x{reader.getSize()[1]})")
+            return reader
+
+        except Exception as e:
+            logger.warning(f"Error loading branding asset '{name}': {e}")
+            return None
+
+    def _fetch_remote(self, name: str, path: Path) -> bytes:
+        """Fetch a missing asset from its remote source and keep a local copy so later startups skip the fetch"""
+        import requests
+
+        _, _, url = BRANDING_ASSETS[name]
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(response.content)
+            logger.info(f"Cached remote branding asset '{name}' at {path}")
+        except OSError as e:
+            logger.warning(f"Could not cache branding asset '{name}' at {path}: {e}")
+
+        return response.content
+
+# Global instance
+_asset_registry = None
+
+def get_asset_registry() -> AssetRegistry:
+    """Get the global asset registry instance"""
+    global _asset_registry
+    if _asset_registry is None:
+        _asset_registry = AssetRegistry()
+    return _asset_registry
@@ -0,0 +1,298 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import zipfile
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, AsyncIterator
+from dotenv import load_dotenv
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+from qr_service import render_member_qr_runs, render_member_qr_pngs
+from worker_pool_service import get_worker_pool, PoolSaturatedError
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+BADGE_FORMATS = {
+    'pdf': 'application/pdf',
+    'zip': 'application/zip',
+}
+
+# A4 sheet of 3 x 4 cut-out badges
+PAGE_WIDTH, PAGE_HEIGHT = A4
+SHEET_MARGIN = 10*mm
+BADGE_COLUMNS = 3
+BADGE_ROWS = 4
+BADGES_PER_SHEET = BADGE_COLUMNS * BADGE_ROWS
+CELL_WIDTH = (PAGE_WIDTH - 2*SHEET_MARGIN) / BADGE_COLUMNS
+CELL_HEIGHT = (PAGE_HEIGHT - 2*SHEET_MARGIN) / BADGE_ROWS
+BADGE_QR_SIZE = 45*mm
+QR_COLOR = colors.HexColor('#FF6600')
+CUT_LINE_COLOR = colors.HexColor('#E0E0E0')
+
+# Columns needed to draw a badge and sign its token
+BADGE_MEMBER_FIELDS = ['member_id', 'full_name', 'id_card_serial_number', 'registration_date']
+
+class BadgeSheetWriter:
+    def __init__(self, path: Path):
+        """Tiles vector member QR badges onto A4 pages"""
+        self.canvas = canvas.Canvas(str(path), pagesize=A4)
+        self.canvas.setTitle("ADYC Member Badges")
+        self.count = 0
+
+    def add_many(self, members: List[Dict[str, Any]], qr_runs: List[tuple]):
+        for member, (size, runs) in zip(members, qr_runs):
+            self.add(member, size, runs)
+
+    def add(self, member: Dict[str, Any], size: int, runs: List[tuple]):
+        position = self.count % BADGES_PER_SHEET
+        if position == 0 and self.count:
+            self.canvas.showPage()
+        self.count += 1
+
+        c = self.canvas
+        column, row = position % BADGE_COLUMNS, position // BADGE_COLUMNS
+        left = SHEET_MARGIN + column * CELL_WIDTH
+        top = PAGE_HEIGHT - SHEET_MARGIN - row * CELL_HEIGHT
+
+        # Cut lines
+        c.setStrokeColor(CUT_LINE_COLOR)
+        c.setLineWidth(0.5)
+        c.setDash(2, 2)
+        c.rect(left, top - CELL_HEIGHT, CELL_WIDTH, CELL_HEIGHT, stroke=1, fill=0)
+        c.setDash()
+
+        c.setFillColor(QR_COLOR)
+        c.setFont("Helvetica-Bold", 9)
+        c.drawCentredString(left + CELL_WIDTH / 2, top - 8*mm, "ADYC MEMBER")
+
+        # QR modules as one filled path of horizontal runs
+        module = BADGE_QR_SIZE / size
+        qr_left = left + (CELL_WIDTH - BADGE_QR_SIZE) / 2
+        qr_top = top - 11*mm
+        path = c.beginPath()
+        for x, y, width in runs:
+            path.rect(qr_left + x * module, qr_top - (y + 1) * module, width * module, module)
+        c.drawPath(path, stroke=0, fill=1)
+
+        name = member.get('full_name') or ''
+        c.setFillColor(colors.HexColor('#333333'))
+        c.setFont("Helvetica-Bold", 8)
+        c.drawCentredString(left + CELL_WIDTH / 2, qr_top - BADGE_QR_SIZE - 5*mm, name[:32] + ('...' if len(name) > 32 else ''))
+        c.setFont("Helvetica", 7)
+        c.drawCentredString(left + CELL_WIDTH / 2, qr_top - BADGE_QR_SIZE - 9*mm, member['member_id'])
+
+    def close(self):
+        self.canvas.save()
+
+class BadgeZipWriter:
+    def __init__(self, path: Path):
+        """One branded PNG per member; PNGs are already compressed, so entries are stored"""
+        self.zip_file = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED)
+
+    def add_many(self, members: List[Dict[str, Any]], pngs: List[bytes]):
+        for member, png_data in zip(members, pngs):
+            self.zip_file.writestr(f"{member['member_id']}.png", png_data)
+
+    def close(self):
+        self.zip_file.close()
+
+class BadgeJob:
+    def __init__(self, output_format: str, created_by: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.output_format = output_format
+        self.created_by = created_by
+        self.status = 'queued'
+        self.total = 0
+        self.completed = 0
+        self.error: Optional[str] = None
+        self.path: Optional[Path] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def notify(self):
+        # Wake everyone waiting on the current event and give later waiters a fresh one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.time()) - self.created_at
+        return {
+            'job_id': self.id,
+            'format': self.output_format,
+            'status': self.status,
+            'total': self.total,
+            'completed': self.completed,
+            'badges_per_minute': round(self.completed / elapsed * 60, 1) if elapsed > 0 else 0.0,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
+
+class BadgeJobManager:
+    def __init__(self):
+        """
+        Background jobs that render member QR badges for event printing
+
+        Members are rendered in chunks across the worker pool and written in
+        order to an A4 PDF of vector badges or a ZIP of PNGs under
+        BADGE_JOB_DIR. Jobs live in the process that created them, so progress
+        and downloads must be requested from the same worker.
+        """
+        self.job_dir = Path(os.getenv('BADGE_JOB_DIR', str(ROOT_DIR / 'data' / 'badge_jobs')))
+        self.chunk_size = int(os.getenv('BADGE_JOB_CHUNK_SIZE', str(BADGES_PER_SHEET * 4)))
+        self.max_members = int(os.getenv('BADGE_JOB_MAX_MEMBERS', '20000'))
+        self.ttl = float(os.getenv('BADGE_JOB_TTL_SECONDS', '3600'))
+        self.jobs: Dict[str, BadgeJob] = {}
+        self._tasks = set()
+
+    def get_job(self, job_id: str) -> Optional[BadgeJob]:
+        return self.jobs.get(job_id)
+
+    def create_job(self, supabase_service, signer, output_format: str, query: Dict[str, Any],
+                   created_by: Optional[str] = None) -> BadgeJob:
+        """
+        Start a badge job in the background
+
+        Args:
+            supabase_service: SupabaseService used to select members
+            signer: QRTokenSigner for the tokens embedded in each QR code
+            output_format: 'pdf' or 'zip'
+            query: filters / registered_from / registered_to as for get_members_page
+            created_by: Admin email, for the record
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if output_format not in BADGE_FORMATS:
+            raise ValueError(f"Unsupported badge format '{output_format}'; use one of: {', '.join(BADGE_FORMATS)}")
+        self._expire_old_jobs()
+
+        job = BadgeJob(output_format, created_by)
+        self.jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, supabase_service, signer, query))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def _expire_old_jobs(self):
+        cutoff = time.time() - self.ttl
+        for job_id, job in list(self.jobs.items()):
+            if job.finished and job.finished_at < cutoff:
+                if job.path is not None:
+                    job.path.unlink(missing_ok=True)
+                del self.jobs[job_id]
+
+    async def _select_members(self, supabase_service, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        members = []
+        cursor = None
+        while True:
+            page = await supabase_service.get_members_page(limit=500, cursor=cursor, fields=BADGE_MEMBER_FIELDS, **query)
+            members.extend(page['members'])
+            if len(members) > self.max_members:
+                raise ValueError(f"More than {self.max_members} members match; narrow the filter")
+            cursor = page['next_cursor']
+            if not cursor:
+                return members
+
+    async def _render_chunk(self, output_format: str, chunk: List[Dict[str, Any]], signer) -> list:
+        if output_format == 'pdf':
+            fn, items = render_member_qr_runs, [(m['member_id'], signer.sign_member(m)) for m in chunk]
+        else:
+            fn, items = render_member_qr_pngs, [(m['member_id'], m.get('full_name'), signer.sign_member(m)) for m in chunk]
+        # A batch job yields to interactive requests instead of failing when the pool is full
+        while True:
+            try:
+                return await get_worker_pool().run(fn, items)
+            except PoolSaturatedError as e:
+                await asyncio.sleep(e.retry_after)
+
+    async def _run(self, job: BadgeJob, supabase_service, signer, query: Dict[str, Any]):
+        try:
+            job.status = 'running'
+            members = await self._select_members(supabase_service, query)
+            job.total = len(members)
+            job.notify()
+
+            self.job_dir.mkdir(parents=True, exist_ok=True)
+            path = self.job_dir / f"{job.id}.{job.output_format}"
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            writer_class = BadgeSheetWriter if job.output_format == 'pdf' else BadgeZipWriter
+            writer = await asyncio.to_thread(writer_class, tmp_path)
+
+            # Keep every worker busy while writing finished chunks in member order
+            in_flight = deque()
+            try:
+                chunks = [members[i:i + self.chunk_size] for i in range(0, len(members), self.chunk_size)]
+                for chunk in chunks:
+                    in_flight.append((chunk, asyncio.create_task(self._render_chunk(job.output_format, chunk, signer))))
+                    if len(in_flight) >= get_worker_pool().max_workers:
+                        await self._write_next(job, writer, in_flight)
+                while in_flight:
+                    await self._write_next(job, writer, in_flight)
+                await asyncio.to_thread(writer.close)
+            except BaseException:
+                for _, task in in_flight:
+                    task.cancel()
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            os.replace(tmp_path, path)
+            job.path = path
+            job.status = 'done'
+            logger.info(f"Badge job {job.id} rendered {job.completed} badges")
+        except Exception as e:
+            logger.error(f"Badge job {job.id} failed: {e}")
+            job.status = 'failed'
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.notify()
+
+    async def _write_next(self, job: BadgeJob, writer, in_flight: deque):
+        chunk, task = in_flight.popleft()
+        rendered = await task
+        await asyncio.to_thread(writer.add_many, chunk, rendered)
+        job.completed += len(chunk)
+        job.notify()
+
+    async def stream_events(self, job: BadgeJob) -> AsyncIterator[str]:
+        """Server-sent events: progress on every finished chunk, then done or failed"""
+        while True:
+            snapshot = job.snapshot()
+            event = 'progress' if not job.finished else job.status
+            yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+            if job.finished:
+                return
+            if not await job.wait_for_change(timeout=15):
+                yield ": keep-alive\n\n"
+
+# Global instance
+_badge_job_manager = None
+
+def get_badge_job_manager() -> BadgeJobManager:
+    """Get the global badge job manager instance"""
+    global _badge_job_manager
+    if _badge_job_manager is None:
+        _badge_job_manager = BadgeJobManager()
+    return _badge_job_manager
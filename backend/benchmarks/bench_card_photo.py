@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark ID card photo preparation
+
+Compares the old WebP round-trip (thumbnail -> WebP -> decode -> JPEG) with
+prepare_card_photo (draft decode -> thumbnail -> single JPEG encode) on
+synthetic photos of typical upload sizes, and reports the CPU saved per card.
+
+Usage: python benchmarks/bench_card_photo.py [iterations]
+"""
+
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image, ImageDraw
+from id_card_template import prepare_card_photo, PHOTO_TARGET_WIDTH, PHOTO_TARGET_HEIGHT
+
+PHOTO_SIZES = [(800, 800), (1920, 2560), (3024, 4032)]
+
+def legacy_prepare_card_photo(image_bytes: bytes) -> bytes:
+    """The previous _optimize_photo_from_bytes pipeline, kept here for comparison"""
+    img = Image.open(io.BytesIO(image_bytes))
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGB')
+    img.thumbnail((PHOTO_TARGET_WIDTH, PHOTO_TARGET_HEIGHT), Image.Resampling.LANCZOS)
+    if img.size[0] < PHOTO_TARGET_WIDTH or img.size[1] < PHOTO_TARGET_HEIGHT:
+        background = Image.new('RGB', (PHOTO_TARGET_WIDTH, PHOTO_TARGET_HEIGHT), 'white')
+        background.paste(img, ((PHOTO_TARGET_WIDTH - img.size[0]) // 2, (PHOTO_TARGET_HEIGHT - img.size[1]) // 2))
+        img = background
+    output = io.BytesIO()
+    img.save(output, format='WebP', quality=85, optimize=True)
+    output.seek(0)
+    final_output = io.BytesIO()
+    Image.open(output).convert('RGB').save(final_output, format='JPEG', quality=90, optimize=True)
+    return final_output.getvalue()
+
+def make_photo(width: int, height: int) -> bytes:
+    """Build a JPEG with gradients and shapes so the encoder has real work to do"""
+    img = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    draw = ImageDraw.Draw(img)
+    for i in range(0, min(width, height) // 2, max(1, min(width, height) // 40)):
+        draw.ellipse([i, i, width - i, height - i], outline=(i % 255, 120, 255 - i % 255), width=3)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=92)
+    return buffer.getvalue()
+
+def time_per_call(fn, image_bytes: bytes, iterations: int) -> float:
+    fn(image_bytes)  # warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(image_bytes)
+    return (time.process_time() - start) / iterations * 1000
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'source':>12} {'legacy ms':>10} {'new ms':>8} {'saved ms':>9} {'speedup':>8}")
+    for width, height in PHOTO_SIZES:
+        image_bytes = make_photo(width, height)
+        legacy_ms = time_per_call(legacy_prepare_card_photo, image_bytes, iterations)
+        new_ms = time_per_call(prepare_card_photo, image_bytes, iterations)
+        print(f"{f'{width}x{height}':>12} {legacy_ms:>10.2f} {new_ms:>8.2f} {legacy_ms - new_ms:>9.2f} {legacy_ms / new_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark members listing: keyset vs OFFSET pagination
+
+Fills a scratch copy of the members table (bench_members, dropped afterwards)
+in DATABASE_URL with growing numbers of rows and times fetching a page near the
+start, middle and end of the listing. The keyset query is the one
+SupabaseService.get_members_page sends through PostgREST; its latency should
+stay flat as the table grows, while OFFSET grows with the page depth.
+
+Usage: DATABASE_URL=postgresql://... python benchmarks/bench_members_pagination.py [max_rows] [page_size]
+"""
+
+import os
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+import asyncpg
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+
+TABLE_SIZES = [10_000, 100_000, 1_000_000]
+REPEATS = 5
+
+SETUP_SQL = """
+DROP TABLE IF EXISTS bench_members;
+CREATE TABLE bench_members (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    member_id TEXT NOT NULL,
+    full_name TEXT NOT NULL,
+    state TEXT NOT NULL,
+    lga TEXT NOT NULL,
+    gender TEXT NOT NULL,
+    registration_date TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX bench_members_registration_idx ON bench_members (registration_date DESC, id DESC);
+"""
+
+FILL_SQL = """
+INSERT INTO bench_members (member_id, full_name, state, lga, gender, registration_date)
+SELECT 'ADYC-BENCH-' || g, 'Member ' || g, 'State ' || (g % 37), 'LGA ' || (g % 774),
+       CASE WHEN g % 2 = 0 THEN 'male' ELSE 'female' END,
+       NOW() - (g || ' seconds')::interval
+FROM generate_series($1::bigint, $2::bigint) AS g
+"""
+
+KEYSET_SQL = """
+SELECT id, member_id, full_name, state, lga, gender, registration_date FROM bench_members
+WHERE registration_date < $1 OR (registration_date = $1 AND id < $2)
+ORDER BY registration_date DESC, id DESC LIMIT $3
+"""
+
+OFFSET_SQL = """
+SELECT id, member_id, full_name, state, lga, gender, registration_date FROM bench_members
+ORDER BY registration_date DESC, id DESC OFFSET $1 LIMIT $2
+"""
+
+POSITION_SQL = """
+SELECT registration_date, id FROM bench_members
+ORDER BY registration_date DESC, id DESC OFFSET $1 LIMIT 1
+"""
+
+async def time_query(conn, sql: str, *args) -> float:
+    """Best-of-REPEATS latency in milliseconds"""
+    await conn.fetch(sql, *args)  # warm up
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await conn.fetch(sql, *args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+async def main():
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url or '[password]' in database_url:
+        sys.exit("Set DATABASE_URL to a Postgres database you can create tables in")
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else TABLE_SIZES[-1]
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    conn = await asyncpg.connect(database_url)
+    try:
+        await conn.execute(SETUP_SQL)
+        filled = 0
+        print(f"{'rows':>10} {'depth':>7} {'keyset ms':>10} {'offset ms':>10}")
+        for size in [size for size in TABLE_SIZES if size <= max_rows]:
+            await conn.execute(FILL_SQL, filled + 1, size)
+            filled = size
+            await conn.execute("ANALYZE bench_members")
+
+            for label, depth in (('start', 0), ('middle', size // 2), ('end', size - page_size - 1)):
+                registration_date, member_uuid = await conn.fetchrow(POSITION_SQL, depth)
+                keyset_ms = await time_query(conn, KEYSET_SQL, registration_date, member_uuid, page_size)
+                offset_ms = await time_query(conn, OFFSET_SQL, depth + 1, page_size)
+                print(f"{size:>10} {label:>7} {keyset_ms:>10.2f} {offset_ms:>10.2f}")
+    finally:
+        await conn.execute("DROP TABLE IF EXISTS bench_members")
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline verification bundles
+
+Builds bundles for synthetic member sets (up to 1M members, 0.5% revoked)
+with a throwaway signing key and reports bundle size (raw and gzipped, as
+served over a compressing proxy), full and incremental build time, the time
+a scanner needs to load and authenticate the bundle, and per-scan lookup
+time.
+
+Usage: python benchmarks/bench_verification_bundle.py [max_members]
+"""
+
+import sys
+import gzip
+import time
+import random
+from array import array
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from qr_token_verifier import OfflineBundle, bundle_fingerprint, public_key_id
+from verification_bundle import encode_bundle, merge_fingerprints
+
+MEMBER_COUNTS = [10_000, 100_000, 1_000_000]
+INCREMENT = 1_000
+LOOKUPS = 100_000
+
+def member_ids(count: int, offset: int = 0):
+    return [f"ADYC-2025-{i:06X}" for i in range(offset, offset + count)]
+
+def main():
+    max_members = int(sys.argv[1]) if len(sys.argv) > 1 else MEMBER_COUNTS[-1]
+    key = Ed25519PrivateKey.generate()
+    key_id = public_key_id(key.public_key())
+    public_keys = {key_id: key.public_key()}
+
+    print(f"{'members':>9} {'size MB':>8} {'gzip MB':>8} {'full s':>7} {'+1k ms':>7} {'load ms':>8} {'lookup us':>10}")
+    for count in [count for count in MEMBER_COUNTS if count <= max_members]:
+        ids = member_ids(count)
+        serials = [f"SN-{i:08X}" for i in range(count)]
+        revoked = array('Q', sorted(bundle_fingerprint(serial) for serial in random.sample(serials, count // 200)))
+
+        start = time.perf_counter()
+        members = merge_fingerprints(array('Q'), (bundle_fingerprint(member_id) for member_id in ids))
+        bundle = encode_bundle(members, revoked, {'generated_at': 'bench'}, key_id, key.sign)
+        full_s = time.perf_counter() - start
+
+        # Incremental build: fingerprint and merge one page of new registrations, then re-sign
+        start = time.perf_counter()
+        updated = merge_fingerprints(members, (bundle_fingerprint(member_id) for member_id in member_ids(INCREMENT, count)))
+        encode_bundle(updated, revoked, {'generated_at': 'bench'}, key_id, key.sign)
+        increment_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        offline = OfflineBundle(bundle, public_keys)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        probes = random.sample(ids, min(LOOKUPS // 2, count)) + member_ids(LOOKUPS // 2, count + INCREMENT)
+        start = time.perf_counter()
+        found = sum(offline.check(member_id) == 'verified' for member_id in probes)
+        lookup_us = (time.perf_counter() - start) / len(probes) * 1_000_000
+        assert found == min(LOOKUPS // 2, count)
+
+        print(f"{count:>9} {len(bundle) / 1e6:>8.2f} {len(gzip.compress(bundle)) / 1e6:>8.2f} "
+              f"{full_s:>7.2f} {increment_ms:>7.1f} {load_ms:>8.1f} {lookup_us:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Stress test one-time ID card issuance
+
+Resets a member's id_card_generated flag, then races CONCURRENCY claims for
+the same card and checks that exactly one wins. By default the claims go
+straight through SupabaseService.claim_id_card_issuance; with --url they are
+concurrent GETs to the running API's /members/{member_id}/id-card endpoint,
+where exactly one response must be a 200 PDF and the rest 400s.
+
+The member's card is left un-issued afterwards, so only point this at a test
+member.
+
+Usage: python benchmarks/stress_id_card_claim.py MEMBER_ID [concurrency] [--url http://localhost:8001/api]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from supabase_service import get_supabase_service
+
+async def race_service(service, member_id: str, concurrency: int) -> Counter:
+    results = await asyncio.gather(
+        *(service.claim_id_card_issuance(member_id) for _ in range(concurrency)),
+        return_exceptions=True
+    )
+    return Counter(
+        'error' if isinstance(result, Exception) else 'claimed' if result else 'rejected'
+        for result in results
+    )
+
+async def race_http(base_url: str, member_id: str, concurrency: int) -> Counter:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        responses = await asyncio.gather(
+            *(client.get(f"/members/{member_id}/id-card") for _ in range(concurrency)),
+            return_exceptions=True
+        )
+    return Counter(
+        'error' if isinstance(response, Exception) else
+        'claimed' if response.status_code == 200 and response.content.startswith(b'%PDF') else
+        'rejected' if response.status_code == 400 else f"http_{response.status_code}"
+        for response in responses
+    )
+
+async def main():
+    parser = argparse.ArgumentParser(description="Race concurrent ID card claims for one member")
+    parser.add_argument('member_id')
+    parser.add_argument('concurrency', nargs='?', type=int, default=50)
+    parser.add_argument('--url', help="API base URL; claims go through the service directly when omitted")
+    args = parser.parse_args()
+    member_id, concurrency, base_url = args.member_id, args.concurrency, args.url
+
+    service = get_supabase_service()
+    await service.connect()
+    try:
+        if not await service.get_member_by_id(member_id):
+            sys.exit(f"Member {member_id} not found")
+        await service.release_id_card_claim(member_id)
+
+        start = time.perf_counter()
+        if base_url:
+            outcome = await race_http(base_url, member_id, concurrency)
+        else:
+            outcome = await race_service(service, member_id, concurrency)
+        elapsed = time.perf_counter() - start
+
+        print(f"{concurrency} concurrent claims in {elapsed:.2f}s: {dict(outcome)}")
+        await service.release_id_card_claim(member_id)
+    finally:
+        await service.close()
+
+    if outcome['claimed'] != 1 or outcome['claimed'] + outcome['rejected'] != concurrency:
+        print("FAIL: expected exactly one issuance")
+        sys.exit(1)
+    print("OK: exactly one issuance")
+
+if __name__ == "__main__":
+    asyncio.run(main())
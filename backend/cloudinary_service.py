@@ -2,17 +2,53 @@ import os
 import logging
 import base64
 import io
+import asyncio
 from typing import Dict, Any, Optional
 import cloudinary
 import cloudinary.uploader
 from PIL import Image
 from dotenv import load_dotenv
+from worker_pool_service import get_worker_pool, PoolSaturatedError
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+def prepare_member_photo(base64_image: str) -> bytes:
+    """
+    Decode a base64 member photo and shrink it for upload (runs in the worker pool)
+    
+    Args:
+        base64_image: Base64 encoded image string (with or without data URL prefix)
+        
+    Returns:
+        bytes: Image bytes ready for upload
+    """
+    # Remove data URL prefix if present (data:image/jpeg;base64,)
+    if base64_image.startswith('data:image'):
+        base64_image = base64_image.split(',')[1]
+    
+    # Decode base64 to bytes
+    image_bytes = base64.b64decode(base64_image)
+    
+    # Open image with PIL to validate and potentially resize
+    image = Image.open(io.BytesIO(image_bytes))
+    
+    # Resize image if too large (max 1MB for efficiency)
+    max_size = (800, 800)  # Max dimensions
+    if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
+        # Preserve original format if possible, else use JPEG
+        format_type = image.format if image.format in ['JPEG', 'PNG'] else 'JPEG'
+        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+        
+        # Convert back to bytes
+        img_buffer = io.BytesIO()
+        image.save(img_buffer, format=format_type, quality=85)
+        image_bytes = img_buffer.getvalue()
+    
+    return image_bytes
+
 class CloudinaryService:
     def __init__(self):
         # Configure Cloudinary
@@ -43,30 +79,12 @@ class CloudinaryService:
             Dict containing Cloudinary response with URL, public_id, etc.
         """
         try:
-            # Remove data URL prefix if present (data:image/jpeg;base64,)
-            if base64_image.startswith('data:image'):
-                base64_image = base64_image.split(',')[1]
-            
-            # Decode base64 to bytes
-            image_bytes = base64.b64decode(base64_image)
-            
-            # Open image with PIL to validate and potentially resize
-            image = Image.open(io.BytesIO(image_bytes))
-            
-            # Resize image if too large (max 1MB for efficiency)
-            max_size = (800, 800)  # Max dimensions
-            if image.size[0] > max_size[0] or image.size[1] > max_size[1]:
-                image.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Convert back to bytes
-                img_buffer = io.BytesIO()
-                # Preserve original format if possible, else use JPEG
-                format_type = image.format if image.format in ['JPEG', 'PNG'] else 'JPEG'
-                image.save(img_buffer, format=format_type, quality=85)
-                image_bytes = img_buffer.getvalue()
+            # Decode and resize in the worker pool so the event loop stays free
+            image_bytes = await get_worker_pool().run(prepare_member_photo, base64_image)
             
             # Upload to Cloudinary
-            upload_result = cloudinary.uploader.upload(
+            upload_result = await asyncio.to_thread(
+                cloudinary.uploader.upload,
                 image_bytes,
                 public_id=f"adyc/members/{member_id}",
                 folder="adyc/members",
@@ -90,6 +108,8 @@ class CloudinaryService:
                 'bytes': upload_result.get('bytes')
             }
             
+        except PoolSaturatedError:
+            raise
         except Exception as e:
             logger.error(f"Error uploading member photo for {member_id}: {e}")
             raise ValueError(f"Failed to upload photo: {str(e)}")
@@ -0,0 +1,117 @@
+import os
+import math
+import hashlib
+import logging
+from typing import Dict, Any, Iterable
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+class EmailBloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Bloom filter of registered emails
+
+        "Not present" answers are certain, so registrations with a new email
+        skip the duplicate check entirely; "maybe present" answers must be
+        confirmed against the database.
+
+        Args:
+            capacity: Expected number of emails
+            error_rate: Target false positive rate at capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def _normalize(email: str) -> bytes:
+        return email.strip().lower().encode('utf-8')
+
+    def _positions(self, email: str):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(self._normalize(email), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size_bits for i in range(self.hash_count))
+
+    def add(self, email: str):
+        for position in self._positions(email):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def add_many(self, emails: Iterable[str]):
+        for email in emails:
+            self.add(email)
+
+    def might_contain(self, email: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(email))
+
+class RegisteredEmailFilter:
+    def __init__(self):
+        """
+        Optional per-process pre-check that rejects duplicate registrations before the photo upload
+
+        Disabled unless REGISTRATION_EMAIL_FILTER=true. Until the filter has
+        been loaded from the members table every email is let through, and
+        the UNIQUE constraint on members.email stays the source of truth: a
+        registration made through another worker process is still caught by
+        the insert, just after its upload.
+        """
+        self.enabled = os.getenv('REGISTRATION_EMAIL_FILTER', 'false').lower() == 'true'
+        self.bloom = EmailBloomFilter(
+            int(os.getenv('REGISTRATION_EMAIL_FILTER_CAPACITY', '1000000')),
+            float(os.getenv('REGISTRATION_EMAIL_FILTER_ERROR_RATE', '0.001'))
+        )
+        self.ready = False
+        self.checks = 0
+        self.filter_negatives = 0
+        self.confirmed_duplicates = 0
+        self.false_positives = 0
+
+    def mark_loaded(self):
+        self.ready = True
+        logger.info(f"Registered email filter loaded with {self.bloom.count} emails")
+        if self.bloom.count > self.bloom.capacity:
+            logger.warning("Registered email filter is over capacity; raise REGISTRATION_EMAIL_FILTER_CAPACITY")
+
+    def add(self, email: str):
+        if self.enabled:
+            self.bloom.add(email)
+
+    def might_contain(self, email: str) -> bool:
+        """False means the email is definitely not registered (or the filter is off or still loading)"""
+        if not (self.enabled and self.ready):
+            return False
+        self.checks += 1
+        if not self.bloom.might_contain(email):
+            self.filter_negatives += 1
+            return False
+        return True
+
+    def record_confirmation(self, duplicate: bool):
+        if duplicate:
+            self.confirmed_duplicates += 1
+        else:
+            self.false_positives += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get load state and check counters"""
+        return {
+            'enabled': self.enabled,
+            'ready': self.ready,
+            'emails': self.bloom.count,
+            'capacity': self.bloom.capacity,
+            'size_bytes': len(self.bloom._bits),
+            'hash_count': self.bloom.hash_count,
+            'checks': self.checks,
+            'filter_negatives': self.filter_negatives,
+            'confirmed_duplicates': self.confirmed_duplicates,
+            'false_positives': self.false_positives
+        }
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Durable outbound email queue
+
+Emails are written to a local SQLite outbox and delivered by a worker, either
+a thread inside the API process (EMAIL_OUTBOX_WORKER=inprocess, the default)
+or a separate process started with `python email_outbox.py`
+(EMAIL_OUTBOX_WORKER=external). The in-process worker renders ID card PDFs in
+the API's worker pool so it never holds the GIL for a render. Every claim
+counts as an attempt, including reclaims of leases left behind by a crashed
+worker; failed sends are retried with exponential backoff and dead-lettered
+after EMAIL_OUTBOX_MAX_ATTEMPTS. Delivered jobs, which
+carry member details, are purged by the worker after EMAIL_OUTBOX_RETENTION_DAYS.
+
+With ADMIN_NOTIFICATION_MODE=digest, new registrations are collected and the
+admin receives one summary email per window/batch instead of one per signup.
+"""
+
+import os
+import json
+import time
+import asyncio
+import random
+import sqlite3
+import logging
+import threading
+from contextlib import closing
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Job kinds and the EmailService method that delivers each
+JOB_REGISTRATION = 'registration'
+JOB_ADMIN_NOTIFICATION = 'admin_notification'
+JOB_CONTACT = 'contact'
+JOB_ADMIN_DIGEST = 'admin_digest'
+
+CREATE_OUTBOX_SQL = """
+CREATE TABLE IF NOT EXISTS email_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_email_jobs_due ON email_jobs(status, next_attempt_at);
+
+-- New registrations waiting to be summarised in the next admin digest
+CREATE TABLE IF NOT EXISTS admin_digest_members (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    member_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    digest_job_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_admin_digest_members_pending ON admin_digest_members(digest_job_id, created_at);
+"""
+
+class EmailOutbox:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('EMAIL_OUTBOX_PATH', str(ROOT_DIR / 'data' / 'email_outbox.db'))
+        self.max_attempts = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', '6'))
+        self.backoff_base = float(os.getenv('EMAIL_OUTBOX_BACKOFF_BASE', '30'))
+        self.backoff_max = float(os.getenv('EMAIL_OUTBOX_BACKOFF_MAX', '3600'))
+        # A claimed job whose worker died becomes due again after this many seconds
+        self.lease_seconds = float(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', '300'))
+        # 'immediate' sends one admin email per registration, 'digest' batches them
+        self.admin_notification_mode = os.getenv('ADMIN_NOTIFICATION_MODE', 'immediate').lower()
+        self.digest_window = float(os.getenv('ADMIN_DIGEST_WINDOW_SECONDS', '3600'))
+        self.digest_max_members = int(os.getenv('ADMIN_DIGEST_MAX_MEMBERS', '50'))
+        # Delivered jobs (and the member details they carry) are deleted after this many days
+        self.retention_days = float(os.getenv('EMAIL_OUTBOX_RETENTION_DAYS', '7'))
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(CREATE_OUTBOX_SQL)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # PRODUCER OPERATIONS
+    def enqueue(self, kind: str, payload: Dict[str, Any]) -> int:
+        """Add one email job to the outbox"""
+        return self.enqueue_many([(kind, payload)])[0]
+
+    def enqueue_many(self, jobs: List[tuple]) -> List[int]:
+        """
+        Add several email jobs in one transaction
+
+        Args:
+            jobs: List of (kind, payload) tuples
+
+        Returns:
+            List of job ids
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            ids = []
+            for kind, payload in jobs:
+                cursor = conn.execute(
+                    "INSERT INTO email_jobs (kind, payload, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    (kind, json.dumps(payload, default=str), now, now, now)
+                )
+                ids.append(cursor.lastrowid)
+            conn.execute("COMMIT")
+            return ids
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def enqueue_registration_emails(self, member_data: Dict[str, Any]) -> List[int]:
+        """Queue the member confirmation and the admin notification (or digest entry) for a new registration"""
+        if self.admin_notification_mode != 'digest':
+            return self.enqueue_many([
+                (JOB_REGISTRATION, {'member': member_data}),
+                (JOB_ADMIN_NOTIFICATION, {'member': member_data})
+            ])
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "INSERT INTO email_jobs (kind, payload, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (JOB_REGISTRATION, json.dumps({'member': member_data}, default=str), now, now, now)
+            )
+            conn.execute(
+                "INSERT INTO admin_digest_members (member_id, payload, created_at) VALUES (?, ?, ?)",
+                (member_data.get('member_id'), json.dumps(member_data, default=str), now)
+            )
+            conn.execute("COMMIT")
+            return [cursor.lastrowid]
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def flush_admin_digest(self, force: bool = False) -> Optional[int]:
+        """
+        Turn pending digest entries into one admin_digest job once the batch is due
+
+        A batch is due when ADMIN_DIGEST_MAX_MEMBERS registrations are waiting
+        or the oldest has waited ADMIN_DIGEST_WINDOW_SECONDS.
+
+        Args:
+            force: Flush whatever is pending regardless of size and age
+
+        Returns:
+            The new job id, or None if nothing was due
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            pending_count, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM admin_digest_members WHERE digest_job_id IS NULL"
+            ).fetchone()
+            due = pending_count and (
+                force or pending_count >= self.digest_max_members or now - oldest >= self.digest_window
+            )
+            if not due:
+                conn.execute("COMMIT")
+                return None
+
+            rows = conn.execute(
+                "SELECT id, payload FROM admin_digest_members WHERE digest_job_id IS NULL ORDER BY created_at LIMIT ?",
+                (self.digest_max_members,)
+            ).fetchall()
+            members = [json.loads(row['payload']) for row in rows]
+            cursor = conn.execute(
+                "INSERT INTO email_jobs (kind, payload, next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (JOB_ADMIN_DIGEST, json.dumps({'members': members}, default=str), now, now, now)
+            )
+            job_id = cursor.lastrowid
+            conn.executemany(
+                "UPDATE admin_digest_members SET digest_job_id = ? WHERE id = ?",
+                [(job_id, row['id']) for row in rows]
+            )
+            conn.execute("COMMIT")
+            logger.info(f"Queued admin digest job {job_id} for {len(members)} registrations")
+            return job_id
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # WORKER OPERATIONS
+    def claim_due(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Lease up to `limit` due jobs to the calling worker
+
+        The attempt is counted when the job is claimed, so a job whose worker
+        dies mid-send (its lease expires with status 'sending') still moves
+        towards the dead letters instead of being retried forever.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT * FROM email_jobs WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            jobs = []
+            for row in rows:
+                if row['attempts'] >= self.max_attempts:
+                    # Only an expired lease gets here: the last allowed attempt never reported back
+                    conn.execute(
+                        "UPDATE email_jobs SET status = 'dead', last_error = ?, updated_at = ? WHERE id = ?",
+                        ("Lease expired on the final attempt (worker crashed or hung)", now, row['id'])
+                    )
+                    logger.error(f"Email job {row['id']} dead-lettered after {row['attempts']} attempts: lease expired")
+                    continue
+                conn.execute(
+                    "UPDATE email_jobs SET status = 'sending', attempts = attempts + 1, next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                    (now + self.lease_seconds, now, row['id'])
+                )
+                job = dict(row)
+                job['attempts'] += 1
+                jobs.append(job)
+            conn.execute("COMMIT")
+            return jobs
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def mark_sent(self, job_id: int):
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE email_jobs SET status = 'sent', last_error = NULL, updated_at = ? WHERE id = ?",
+                (now, job_id)
+            )
+
+    def mark_failed(self, job_id: int, attempts: int, error: str):
+        """Schedule a retry with exponential backoff, or dead-letter the job (attempts includes this one)"""
+        now = time.time()
+        if attempts >= self.max_attempts:
+            status, next_attempt_at = 'dead', now
+            logger.error(f"Email job {job_id} dead-lettered after {attempts} attempts: {error}")
+        else:
+            delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+            status, next_attempt_at = 'pending', now + delay * random.uniform(0.8, 1.2)
+            logger.warning(f"Email job {job_id} failed (attempt {attempts}), retrying in {delay:.0f}s: {error}")
+
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE email_jobs SET status = ?, next_attempt_at = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                (status, next_attempt_at, error[:1000], now, job_id)
+            )
+
+    # ADMIN OPERATIONS
+    def retry_dead(self, job_id: int) -> bool:
+        """Move a dead-lettered job back to the queue"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "UPDATE email_jobs SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'dead'",
+                (now, now, job_id)
+            )
+            return cursor.rowcount > 0
+
+    def purge_sent(self, older_than_days: Optional[float] = None) -> int:
+        """Delete delivered jobs, and the digest rows they summarised, older than the retention window"""
+        days = self.retention_days if older_than_days is None else older_than_days
+        cutoff = time.time() - days * 86400
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM admin_digest_members WHERE digest_job_id IN "
+                "(SELECT id FROM email_jobs WHERE status = 'sent' AND updated_at < ?)", (cutoff,))
+            cursor = conn.execute("DELETE FROM email_jobs WHERE status = 'sent' AND updated_at < ?", (cutoff,))
+            conn.execute("COMMIT")
+            return cursor.rowcount
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and failure counts"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            by_status = {row['status']: row['count'] for row in conn.execute(
+                "SELECT status, COUNT(*) AS count FROM email_jobs GROUP BY status")}
+            retrying = conn.execute(
+                "SELECT COUNT(*) FROM email_jobs WHERE status = 'pending' AND attempts > 0").fetchone()[0]
+            oldest_pending = conn.execute(
+                "SELECT MIN(created_at) FROM email_jobs WHERE status IN ('pending', 'sending')").fetchone()[0]
+            digest_pending = conn.execute(
+                "SELECT COUNT(*) FROM admin_digest_members WHERE digest_job_id IS NULL").fetchone()[0]
+            dead_letters = [dict(row) for row in conn.execute(
+                "SELECT id, kind, attempts, last_error, created_at, updated_at FROM email_jobs "
+                "WHERE status = 'dead' ORDER BY updated_at DESC LIMIT 20")]
+        finally:
+            conn.close()
+
+        return {
+            'queue_depth': by_status.get('pending', 0) + by_status.get('sending', 0),
+            'pending': by_status.get('pending', 0),
+            'in_flight': by_status.get('sending', 0),
+            'retrying': retrying,
+            'sent': by_status.get('sent', 0),
+            'dead': by_status.get('dead', 0),
+            'oldest_pending_age_seconds': round(now - oldest_pending, 1) if oldest_pending else 0.0,
+            'admin_notification_mode': self.admin_notification_mode,
+            'admin_digest_pending': digest_pending,
+            'recent_dead_letters': dead_letters
+        }
+
+class EmailOutboxWorker:
+    def __init__(self, outbox: EmailOutbox, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Deliver queued emails with bounded concurrency
+
+        Args:
+            outbox: The outbox to drain
+            loop: Event loop of the API process when running in-process; ID card
+                PDFs are then rendered in its worker pool instead of on this thread
+        """
+        self.outbox = outbox
+        self.loop = loop
+        self.concurrency = int(os.getenv('EMAIL_OUTBOX_CONCURRENCY', '2'))
+        self.poll_interval = float(os.getenv('EMAIL_OUTBOX_POLL_INTERVAL', '2'))
+        self.purge_interval = float(os.getenv('EMAIL_OUTBOX_PURGE_INTERVAL', '3600'))
+        self._last_purge: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _deliver(self, job: Dict[str, Any]):
+        from email_service import get_email_service
+
+        email_service = get_email_service()
+        payload = json.loads(job['payload'])
+        kind = job['kind']
+
+        if kind == JOB_REGISTRATION:
+            member = payload['member']
+            success = email_service.send_registration_email(member, self._render_id_card(member))
+        elif kind == JOB_ADMIN_NOTIFICATION:
+            member = payload['member']
+            success = email_service.send_admin_notification_email(member, self._render_id_card(member))
+        elif kind == JOB_ADMIN_DIGEST:
+            success = email_service.send_admin_digest_email(payload['members'])
+        elif kind == JOB_CONTACT:
+            success = email_service.send_contact_notification(payload['contact'])
+        else:
+            raise ValueError(f"Unknown email job kind: {kind}")
+
+        if not success:
+            raise RuntimeError(f"{kind} email was not sent (see email service log)")
+
+    def _render_id_card(self, member_data: Dict[str, Any]) -> Optional[bytes]:
+        """Render the card in the API's worker pool, or return None to let the email service render it here"""
+        if self.loop is None:
+            return None
+        from id_card_service import get_id_card_service
+
+        future = asyncio.run_coroutine_threadsafe(get_id_card_service().get_id_card_pdf_async(member_data), self.loop)
+        # Poll so shutdown, which blocks the loop while joining this thread, is not deadlocked
+        while not self._stop.is_set():
+            try:
+                return future.result(timeout=1)
+            except FutureTimeoutError:
+                continue
+        future.cancel()
+        raise RuntimeError("Email outbox worker stopped while rendering the ID card")
+
+    def _process(self, job: Dict[str, Any]):
+        try:
+            self._deliver(job)
+            self.outbox.mark_sent(job['id'])
+        except Exception as e:
+            self.outbox.mark_failed(job['id'], job['attempts'], str(e))
+
+    def _purge_if_due(self):
+        now = time.monotonic()
+        if self._last_purge is not None and now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        try:
+            purged = self.outbox.purge_sent()
+            if purged:
+                logger.info(f"Purged {purged} delivered email jobs older than {self.outbox.retention_days} days")
+        except Exception as e:
+            logger.error(f"Error purging email outbox: {e}")
+
+    def run_forever(self):
+        """Poll the outbox and deliver due jobs until stopped"""
+        logger.info(f"Email outbox worker started (concurrency {self.concurrency}, outbox {self.outbox.path})")
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while not self._stop.is_set():
+                self._purge_if_due()
+                try:
+                    self.outbox.flush_admin_digest()
+                    jobs = self.outbox.claim_due(self.concurrency)
+                    if jobs:
+                        # Wait for the batch so no more than `concurrency` sends run at once
+                        list(executor.map(self._process, jobs))
+                        continue
+                except Exception as e:
+                    logger.error(f"Error polling email outbox: {e}")
+                self._stop.wait(self.poll_interval)
+        logger.info("Email outbox worker stopped")
+
+    def start(self):
+        """Run the worker in a background thread of the current process"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name='email-outbox-worker', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 30):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+# Global instances
+_email_outbox = None
+_email_outbox_worker = None
+
+def get_email_outbox() -> EmailOutbox:
+    """Get the global email outbox instance"""
+    global _email_outbox
+    if _email_outbox is None:
+        _email_outbox = EmailOutbox()
+    return _email_outbox
+
+def start_inprocess_worker():
+    """Start the in-process outbox worker unless an external worker process is configured"""
+    global _email_outbox_worker
+    if os.getenv('EMAIL_OUTBOX_WORKER', 'inprocess').lower() != 'inprocess':
+        logger.info("Email outbox worker runs externally (EMAIL_OUTBOX_WORKER != inprocess)")
+        return
+    if _email_outbox_worker is None:
+        # Called from the API's startup hook, so render ID cards on its event loop's worker pool
+        _email_outbox_worker = EmailOutboxWorker(get_email_outbox(), loop=asyncio.get_running_loop())
+        _email_outbox_worker.start()
+
+def stop_inprocess_worker():
+    """Stop the in-process outbox worker if it was started"""
+    global _email_outbox_worker
+    if _email_outbox_worker is not None:
+        _email_outbox_worker.stop()
+        _email_outbox_worker = None
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    worker = EmailOutboxWorker(get_email_outbox())
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        pass
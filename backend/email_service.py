@@ -1,23 +1,12 @@
-import smtplib
 import os
-import base64
-import io
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.units import inch, mm
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from PIL import Image as PILImage
-from io import BytesIO
-import requests
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from id_card_template import get_id_card_template
+from smtp_pool import SMTPConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -29,404 +18,40 @@ class EmailService:
         self.password = os.getenv('EMAIL_PASSWORD')
         self.use_tls = os.getenv('EMAIL_USE_TLS', 'True').lower() == 'true'
         
+        # Attach one combined multi-card PDF to admin digest emails
+        self.digest_attach_cards = os.getenv('ADMIN_DIGEST_ATTACH_CARDS', 'False').lower() == 'true'
+        
         if not self.username or not self.password:
             raise ValueError("Email credentials not configured properly")
+        
+        # Authenticated sessions are kept open and reused across messages
+        self.smtp_pool = SMTPConnectionPool(
+            host=self.smtp_server,
+            port=self.smtp_port,
+            username=self.username,
+            password=self.password,
+            use_tls=self.use_tls
+        )
 
     def generate_id_card_pdf(self, member_data):
         """Generate an enhanced ID card PDF with front and back sides"""
-        from reportlab.lib.pagesizes import letter
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import mm
-        from reportlab.lib import colors
-        from reportlab.lib.utils import ImageReader
-        import io
-        import base64
-        
-        try:
-            # Create PDF buffer
-            buffer = io.BytesIO()
-            
-            # ID card dimensions (credit card size)
-            card_width = 85.6*mm  # Standard credit card width
-            card_height = 53.98*mm  # Standard credit card height
-            
-            # Create canvas with two pages (front and back)
-            c = canvas.Canvas(buffer, pagesize=(card_width, card_height))
-            
-            # =================== FRONT SIDE ===================
-            self._generate_front_side(c, member_data, card_width, card_height)
-            c.showPage()  # Move to next page
-            
-            # =================== BACK SIDE ===================
-            self._generate_back_side(c, member_data, card_width, card_height)
-            
-            # Save PDF
-            c.save()
-            buffer.seek(0)
-            return buffer.getvalue()
-            
-        except Exception as e:
-            logger.error(f"Error generating ID card PDF: {e}")
-            raise
-    
-    def _generate_front_side(self, c, member_data, card_width, card_height):
-        """Generate the front side of the ID card with specific layout"""
-        from reportlab.lib.units import mm
-        from reportlab.lib import colors
-        from reportlab.lib.utils import ImageReader
-        import io
-        import base64
-        
-        # Background gradient effect
-        c.setFillColor(colors.HexColor('#f8fafc'))
-        c.rect(0, 0, card_width, card_height, fill=1)
-        
-        # Enhanced watermark - Multiple ADYC logos for forgery prevention
-        c.saveState()
-        c.setFillColor(colors.HexColor('#f8f9fa'))
-        c.setFillAlpha(0.06)  # Very subtle watermark
-        c.setFont("Helvetica-Bold", 14)
-        
-        # Create a complex watermark pattern
-        c.rotate(30)
-        for i in range(-20, 40, 12):
-            for j in range(-10, 20, 8):
-                c.drawString(i*mm, j*mm, "ADYC")
-                c.drawString(i*mm+2*mm, j*mm-2*mm, "OFFICIAL")
-        c.restoreState()
-        
-        # Security line pattern
-        c.saveState()
-        c.setStrokeColor(colors.HexColor('#e5e7eb'))
-        c.setLineWidth(0.1)
-        for i in range(0, int(card_width/mm), 3):
-            c.line(i*mm, 0, i*mm, card_height)
-        for j in range(0, int(card_height/mm), 3):
-            c.line(0, j*mm, card_width, j*mm)
-        c.restoreState()
-        
-        # Header section with ADYC logo
-        try:
-            # ADYC Logo
-            logo_size = 14*mm
-            c.drawImage(
-                "https://customer-assets.emergentagent.com/job_a7d4cce0-5f6d-4a96-91ac-874ffa2967f3/artifacts/etvajhhm_ChatGPT%20Image%20Sep%204%2C%202025%2C%2008_59_21%20AM.png",
-                4*mm, card_height-18*mm, 
-                width=logo_size, height=logo_size,
-                preserveAspectRatio=True, mask='auto'
-            )
-        except:
-            # Fallback logo
-            c.setFillColor(colors.HexColor('#f97316'))
-            c.rect(4*mm, card_height-18*mm, 14*mm, 14*mm, fill=1)
-            c.setFillColor(colors.white)
-            c.setFont("Helvetica-Bold", 8)
-            c.drawString(7*mm, card_height-13*mm, "ADYC")
-        
-        # Organization name
-        c.setFillColor(colors.black)
-        c.setFont("Helvetica-Bold", 10)
-        c.drawString(20*mm, card_height-8*mm, "AFRICAN DEMOCRATIC")
-        c.drawString(20*mm, card_height-12*mm, "YOUTH CONGRESS")
-        
-        # Member photo
-        try:
-            passport_data = member_data.get('passport')
-            if passport_data:
-                photo_stream = None
-                
-                # Handle both Cloudinary URLs and base64 data
-                if passport_data.startswith('http'):
-                    # It's a Cloudinary URL - download and optimize
-                    photo_stream = self._download_and_optimize_photo(passport_data)
-                elif ',' in passport_data:
-                    # It's base64 data - decode it
-                    image_data = base64.b64decode(passport_data.split(',')[1])
-                    photo_stream = self._optimize_photo_from_bytes(image_data)
-                
-                if photo_stream:
-                    img = ImageReader(photo_stream)
-                    
-                    photo_width = 16*mm
-                    photo_height = 20*mm
-                    photo_x = card_width - photo_width - 4*mm
-                    photo_y = card_height - photo_height - 4*mm
-                    
-                    c.drawImage(img, photo_x, photo_y, width=photo_width, height=photo_height, preserveAspectRatio=True, mask='auto')
-                    
-                    # Photo frame with security border
-                    c.setStrokeColor(colors.HexColor('#f97316'))
-                    c.setLineWidth(1.5)
-                    c.rect(photo_x-1, photo_y-1, photo_width+2, photo_height+2, fill=0, stroke=1)
-                    
-        except Exception as e:
-            logger.warning(f"Error processing member photo: {e}")
-            
-        # If no photo was successfully processed, show placeholder
-        if not passport_data or not photo_stream:
-            photo_x = card_width - 16*mm - 4*mm
-            photo_y = card_height - 20*mm - 4*mm
-            c.setFillColor(colors.HexColor('#e5e7eb'))
-            c.rect(photo_x, photo_y, 16*mm, 20*mm, fill=1)
-            c.setFillColor(colors.HexColor('#6b7280'))
-            c.setFont("Helvetica", 6)
-            c.drawString(photo_x+5*mm, photo_y+9*mm, "PHOTO")
-        
-        # Member information - Specific layout as requested
-        info_start_y = card_height - 26*mm
-        c.setFillColor(colors.black)
-        
-        # NAME: ZITTA VICTOR
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(4*mm, info_start_y, "NAME:")
-        c.setFont("Times-Bold", 8)  # Using Times font as shown in image
-        name = member_data.get('full_name', 'ZITTA VICTOR').upper()
-        c.drawString(4*mm, info_start_y-3*mm, name)
-        
-        # ID: ADYC-2025-5A5514
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(4*mm, info_start_y-8*mm, "ID:")
-        c.setFont("Times-Bold", 8)
-        member_id = member_data.get('member_id', 'ADYC-2025-5A5514')
-        c.drawString(4*mm, info_start_y-11*mm, member_id)
-        
-        # STATE: PLATEAU
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(4*mm, info_start_y-16*mm, "STATE:")
-        c.setFont("Times-Bold", 8)
-        state = member_data.get('state', 'PLATEAU').upper()
-        c.drawString(15*mm, info_start_y-16*mm, state)
-        
-        # EMAIL: zittavictor26@gmail.com (on right side)
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(45*mm, info_start_y, "EMAIL:")
-        c.setFont("Times-Roman", 6)
-        email = member_data.get('email', 'zittavictor26@gmail.com')[:30]  # Truncate long emails
-        c.drawString(45*mm, info_start_y-3*mm, email)
-        
-        # GENDER: MALE
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(45*mm, info_start_y-8*mm, "GENDER:")
-        c.setFont("Times-Bold", 8)
-        gender = member_data.get('gender', 'MALE').upper()
-        c.drawString(58*mm, info_start_y-8*mm, gender)
-        
-        # DOB: 2005-07-15
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(45*mm, info_start_y-13*mm, "DOB:")
-        c.setFont("Times-Bold", 8)
-        dob = member_data.get('dob', '2005-07-15')
-        c.drawString(52*mm, info_start_y-13*mm, dob)
-        
-        # LGA: JOS NORTH
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(45*mm, info_start_y-18*mm, "LGA:")
-        c.setFont("Times-Bold", 8)
-        lga = member_data.get('lga', 'JOS NORTH').upper()
-        c.drawString(52*mm, info_start_y-18*mm, lga)
-        
-        # Footer with holographic strip
-        c.setFillColor(colors.HexColor('#16a34a'))
-        c.rect(0, 0, card_width, 6*mm, fill=1)
-        
-        # Serial number and validity
-        c.setFillColor(colors.white)
-        c.setFont("Helvetica-Bold", 5)
-        serial_number = member_data.get('id_card_serial_number', 'SN-UNKNOWN')
-        c.drawString(3*mm, 2*mm, f"S/N: {serial_number}")
-        
-        c.setFont("Helvetica", 5)
-        reg_date = member_data.get('registration_date', datetime.now())
-        if isinstance(reg_date, str):
-            reg_date = datetime.fromisoformat(reg_date)
-        
-        c.drawString(3*mm, 4*mm, f"VALID NATIONWIDE • ISSUED: {reg_date.year}")
-        
-        # Slogan
-        c.setFont("Helvetica-Bold", 6)
-        slogan_text = "ARISE, IT'S YOUTH O'CLOCK!"
-        text_width = c.stringWidth(slogan_text, "Helvetica-Bold", 6)
-        c.drawString((card_width - text_width) / 2, 0.5*mm, slogan_text)
-        
-        # Enhanced security hologram corner with logo
-        c.saveState()
-        c.setFillColor(colors.HexColor('#fbbf24'))
-        c.setFillAlpha(0.8)
-        # Security triangle using path
-        p = c.beginPath()
-        p.moveTo(card_width-8*mm, card_height)
-        p.lineTo(card_width, card_height)
-        p.lineTo(card_width, card_height-8*mm)
-        p.close()
-        c.drawPath(p, fill=1)
-        c.setFillColor(colors.black)
-        c.setFillAlpha(1)
-        c.setFont("Helvetica-Bold", 3)
-        c.drawString(card_width-7*mm, card_height-2*mm, "SECURE")
-        c.restoreState()
-    
-    def _generate_back_side(self, c, member_data, card_width, card_height):
-        """Generate the back side of the ID card with specific terms and conditions"""
-        from reportlab.lib.units import mm
-        from reportlab.lib import colors
-        
-        # Background
-        c.setFillColor(colors.HexColor('#f8fafc'))
-        c.rect(0, 0, card_width, card_height, fill=1)
-        
-        # Enhanced watermark pattern
-        c.saveState()
-        c.setFillColor(colors.HexColor('#f1f5f9'))
-        c.setFillAlpha(0.5)
-        c.setFont("Helvetica-Bold", 10)
-        c.rotate(-25)
-        for i in range(-15, 20, 10):
-            for j in range(-8, 12, 6):
-                c.drawString(i*mm, j*mm, "ADYC")
-        c.restoreState()
-        
-        # Header
-        c.setFillColor(colors.HexColor('#16a34a'))
-        c.rect(0, card_height-12*mm, card_width, 12*mm, fill=1)
-        
-        c.setFillColor(colors.white)
-        c.setFont("Helvetica-Bold", 9)
-        c.drawString(5*mm, card_height-7*mm, "AFRICAN DEMOCRATIC YOUTH CONGRESS")
-        c.setFont("Helvetica-Bold", 7)
-        c.drawString(5*mm, card_height-10*mm, "MEMBERSHIP TERMS & CONDITIONS")
-        
-        # Terms and conditions - Specific content as requested
-        c.setFont("Times-Roman", 6)
-        terms_y = card_height - 18*mm
-        c.setFillColor(colors.black)
-        
-        terms = [
-            "• This card is the property of ADYC and must be returned upon request.",
-            "• Misuse of this card is prohibited and may result in membership termination.",
-            "• Report lost or stolen cards immediately to ADYC administration.",
-            "• This card grants access to ADYC programs and events nationwide.", 
-            "• Valid for active members in good standing only."
-        ]
-        
-        for i, term in enumerate(terms):
-            c.drawString(3*mm, terms_y - (i * 3*mm), term)
-        
-        # Contact Information Section
-        contact_y = terms_y - 18*mm
-        c.setFillColor(colors.HexColor('#f97316'))
-        c.setFont("Helvetica-Bold", 8)
-        c.drawString(3*mm, contact_y, "CONTACT INFORMATION:")
-        
-        c.setFillColor(colors.black)
-        c.setFont("Times-Roman", 7)
-        c.drawString(3*mm, contact_y - 4*mm, "Phone: 08156257998")
-        c.drawString(3*mm, contact_y - 8*mm, "Email: africandemocraticyouthcongress@gmail.com")
-        
-        # Footer with holographic design
-        c.setFillColor(colors.HexColor('#059669'))
-        c.rect(0, 0, card_width, 8*mm, fill=1)
-        
-        c.setFillColor(colors.white)
-        c.setFont("Helvetica-Bold", 6)
-        c.drawString(3*mm, 5*mm, "OFFICIAL MEMBERSHIP CARD")
-        c.setFont("Helvetica", 4)
-        c.drawString(3*mm, 3*mm, "WhatsApp: wa.me/c/2349156257998 | TikTok: @adyc676")
-        c.drawString(3*mm, 1*mm, "www.adyc.org | Follow @ADYC_Official")
-        
-        # Security QR Code placeholder (enhanced)
-        qr_size = 12*mm
-        qr_x = card_width - qr_size - 3*mm
-        qr_y = contact_y - 12*mm
-        c.setFillColor(colors.HexColor('#e5e7eb'))
-        c.rect(qr_x, qr_y, qr_size, qr_size, fill=1)
-        c.setStrokeColor(colors.HexColor('#6b7280'))
-        c.setLineWidth(0.5)
-        c.rect(qr_x, qr_y, qr_size, qr_size, fill=0, stroke=1)
-        
-        # QR placeholder with security text
-        c.setFillColor(colors.HexColor('#6b7280'))
-        c.setFont("Helvetica-Bold", 4)
-        c.drawString(qr_x+2*mm, qr_y+7*mm, "SECURITY")
-        c.drawString(qr_x+2*mm, qr_y+5*mm, "QR CODE")
-        c.drawString(qr_x+1.5*mm, qr_y+3*mm, "VERIFICATION")
-        
-        # Serial number on back
-        c.setFillColor(colors.black)
-        c.setFont("Helvetica", 5)
-        serial_number = member_data.get('id_card_serial_number', 'SN-UNKNOWN')
-        c.drawString(qr_x, qr_y-3*mm, f"Serial: {serial_number}")
-    
-    def _download_and_optimize_photo(self, cloudinary_url: str):
-        """Download photo from Cloudinary URL and optimize it for ID card use"""
-        import requests
-        from PIL import Image
-        import io
-        
-        try:
-            # Download the image from Cloudinary
-            response = requests.get(cloudinary_url, timeout=10)
-            response.raise_for_status()
-            
-            # Optimize the downloaded image
-            return self._optimize_photo_from_bytes(response.content)
-            
-        except Exception as e:
-            logger.error(f"Error downloading photo from Cloudinary: {e}")
-            raise
-    
-    def _optimize_photo_from_bytes(self, image_bytes: bytes):
-        """Optimize photo bytes for ID card use with WebP conversion"""
-        from PIL import Image
-        import io
-        
-        try:
-            # Open the image
-            img = Image.open(io.BytesIO(image_bytes))
-            
-            # Convert to RGB if necessary (WebP requires RGB)
-            if img.mode not in ('RGB', 'RGBA'):
-                img = img.convert('RGB')
-            
-            # Calculate optimal size for ID card (maintain aspect ratio)
-            # ID card photo should be roughly 16mm x 20mm at 300 DPI
-            target_width = int(16 * 300 / 25.4)  # ~189 pixels
-            target_height = int(20 * 300 / 25.4)  # ~236 pixels
-            
-            # Resize while maintaining aspect ratio
-            img.thumbnail((target_width, target_height), Image.Resampling.LANCZOS)
-            
-            # Create a white background if image is smaller
-            if img.size[0] < target_width or img.size[1] < target_height:
-                background = Image.new('RGB', (target_width, target_height), 'white')
-                # Center the image on the background
-                x = (target_width - img.size[0]) // 2
-                y = (target_height - img.size[1]) // 2
-                background.paste(img, (x, y))
-                img = background
-            
-            # Convert to WebP for optimal quality and size
-            output = io.BytesIO()
-            img.save(output, format='WebP', quality=85, optimize=True)
-            output.seek(0)
-            
-            # Since ReportLab needs the image in a format it can handle,
-            # convert back to JPEG for ReportLab compatibility
-            img_webp = Image.open(output)
-            final_output = io.BytesIO()
-            img_webp.convert('RGB').save(final_output, format='JPEG', quality=90, optimize=True)
-            final_output.seek(0)
-            
-            return final_output
-            
-        except Exception as e:
-            logger.error(f"Error optimizing photo: {e}")
-            raise
+        return get_id_card_template().render(member_data)
 
-    def send_registration_email(self, member_data: Dict[str, Any]) -> bool:
+    def get_smtp_stats(self) -> Dict[str, Any]:
+        """Get SMTP pool throughput and handshake counters"""
+        return self.smtp_pool.get_stats()
+
+    def close(self):
+        """Close pooled SMTP sessions"""
+        self.smtp_pool.close_all()
+
+    def send_registration_email(self, member_data: Dict[str, Any], pdf_data: Optional[bytes] = None) -> bool:
         """Send registration confirmation email with ID card PDF attachment"""
         try:
-            # Generate ID card PDF
-            pdf_data = self.generate_id_card_pdf(member_data)
+            # Reuse the member's rendered ID card PDF
+            if pdf_data is None:
+                from id_card_service import get_id_card_service
+                pdf_data = get_id_card_service().get_id_card_pdf(member_data)
             
             # Create email message
             msg = MIMEMultipart()
@@ -520,12 +145,8 @@ class EmailService:
                                     filename=f"ADYC_ID_Card_{member_data['member_id']}.pdf")
             msg.attach(pdf_attachment)
             
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            # Send email over a pooled SMTP session
+            self.smtp_pool.send_message(msg)
             
             logger.info(f"Registration email sent successfully to {member_data['email']}")
             return True
@@ -534,11 +155,13 @@ class EmailService:
             logger.error(f"Error sending registration email: {e}")
             return False
 
-    def send_admin_notification_email(self, member_data: Dict[str, Any]) -> bool:
+    def send_admin_notification_email(self, member_data: Dict[str, Any], pdf_data: Optional[bytes] = None) -> bool:
         """Send admin notification email when a new member registers"""
         try:
-            # Generate ID card PDF for admin notification
-            pdf_data = self.generate_id_card_pdf(member_data)
+            # Reuse the member's rendered ID card PDF
+            if pdf_data is None:
+                from id_card_service import get_id_card_service
+                pdf_data = get_id_card_service().get_id_card_pdf(member_data)
             
             # Create email message
             msg = MIMEMultipart()
@@ -663,12 +286,8 @@ class EmailService:
                                     filename=f"ADYC_ID_Card_{member_data['member_id']}.pdf")
             msg.attach(pdf_attachment)
             
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            # Send email over a pooled SMTP session
+            self.smtp_pool.send_message(msg)
             
             logger.info(f"Admin notification email sent successfully for new member: {member_data['full_name']} ({member_data['member_id']})")
             return True
@@ -677,6 +296,98 @@ class EmailService:
             logger.error(f"Error sending admin notification email: {e}")
             return False
 
+    def send_admin_digest_email(self, members: List[Dict[str, Any]]) -> bool:
+        """Send one admin summary email covering a batch of new registrations"""
+        try:
+            if not members:
+                return True
+            
+            msg = MIMEMultipart()
+            msg['From'] = self.username
+            msg['To'] = self.username  # Send to ADYC admin email
+            msg['Subject'] = f"🔔 ADYC Registration Digest - {len(members)} new member{'s' if len(members) != 1 else ''}"
+            
+            def format_date(value):
+                if isinstance(value, str):
+                    value = datetime.fromisoformat(value)
+                return value.strftime('%b %d, %Y %I:%M %p')
+            
+            rows_html = "".join(f"""
+                                <tr>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb; color: #f97316; font-weight: bold;">{member['member_id']}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">{member['full_name']}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">{member['email']}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">{member['state']} / {member['lga']}</td>
+                                    <td style="padding: 6px; border-bottom: 1px solid #e5e7eb;">{format_date(member['registration_date'])}</td>
+                                </tr>""" for member in members)
+            
+            html_body = f"""
+            <html>
+                <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                    <div style="max-width: 760px; margin: 0 auto; padding: 20px;">
+                        <div style="text-align: center; margin-bottom: 20px;">
+                            <h1 style="color: #f97316; margin: 0;">New Member Registrations</h1>
+                            <p style="font-size: 16px; color: #22c55e; font-weight: bold;">African Democratic Youth Congress</p>
+                        </div>
+                        
+                        <p>{len(members)} new member{'s have' if len(members) != 1 else ' has'} registered since the last digest:</p>
+                        
+                        <table style="width: 100%; border-collapse: collapse; font-size: 13px;">
+                            <tr style="background-color: #f3f4f6; text-align: left;">
+                                <th style="padding: 6px;">Member ID</th>
+                                <th style="padding: 6px;">Full Name</th>
+                                <th style="padding: 6px;">Email</th>
+                                <th style="padding: 6px;">State / LGA</th>
+                                <th style="padding: 6px;">Registered</th>
+                            </tr>{rows_html}
+                        </table>
+                        
+                        {'<p style="margin-top: 20px;">📎 The ID cards for these members are attached as one PDF.</p>' if self.digest_attach_cards else ''}
+                        
+                        <div style="border-top: 2px solid #f97316; padding-top: 20px; margin-top: 30px; text-align: center; color: #666;">
+                            <p><strong>ADYC Admin Notification System</strong></p>
+                            <p>This is an automated notification. Please do not reply to this email.</p>
+                        </div>
+                    </div>
+                </body>
+            </html>
+            """
+            
+            rows_text = "\n".join(
+                f"            - {member['member_id']} | {member['full_name']} | {member['email']} | "
+                f"{member['state']} / {member['lga']} | {format_date(member['registration_date'])}"
+                for member in members
+            )
+            text_body = f"""
+            ADYC REGISTRATION DIGEST
+            
+            {len(members)} new member(s) registered since the last digest:
+            
+{rows_text}
+            
+            ADYC Admin Notification System
+            """
+            
+            msg.attach(MIMEText(text_body, 'plain'))
+            msg.attach(MIMEText(html_body, 'html'))
+            
+            if self.digest_attach_cards:
+                # One combined PDF; the static card layers are shared across all pages
+                pdf_data = get_id_card_template().render_many(members)
+                pdf_attachment = MIMEApplication(pdf_data, _subtype="pdf")
+                pdf_attachment.add_header('Content-Disposition', 'attachment',
+                                        filename=f"ADYC_ID_Cards_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf")
+                msg.attach(pdf_attachment)
+            
+            self.smtp_pool.send_message(msg)
+            
+            logger.info(f"Admin digest email sent for {len(members)} new members")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error sending admin digest email: {e}")
+            return False
+
     def send_contact_notification(self, contact_data: Dict[str, Any]) -> bool:
         """Send notification email for contact form submissions"""
         try:
@@ -697,11 +408,7 @@ class EmailService:
             
             msg.attach(MIMEText(body, 'plain'))
             
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                if self.use_tls:
-                    server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
+            self.smtp_pool.send_message(msg)
             
             return True
             
@@ -718,3 +425,8 @@ def get_email_service():
     if email_service is None:
         email_service = EmailService()
     return email_service
+
+def shutdown_email_service():
+    """Close the email service's SMTP sessions if it was ever initialized"""
+    if email_service is not None:
+        email_service.close()
@@ -0,0 +1,219 @@
+import os
+import re
+import shutil
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional
+from dotenv import load_dotenv
+from id_card_template import get_id_card_template, render_id_card_pdf
+from worker_pool_service import get_worker_pool
+
+ROOT_DIR = Path(__file__).parent
+# Load environment variables
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the card layout changes so cached PDFs from the old layout are not reused
+ID_CARD_TEMPLATE_VERSION = os.getenv('ID_CARD_TEMPLATE_VERSION', '3')
+
+# Member fields that end up on the rendered card
+CARD_FIELDS = (
+    'member_id', 'full_name', 'email', 'state', 'lga', 'gender', 'dob',
+    'passport', 'id_card_serial_number', 'registration_date'
+)
+
+class IDCardService:
+    def __init__(self, renderer: Callable[[Dict[str, Any]], bytes], max_entries: Optional[int] = None):
+        """
+        Render-once store for ID card PDFs
+
+        Level one is an in-memory LRU per process. Level two is a directory of
+        PDFs (ID_CARD_CACHE_DIR, empty to disable) keyed by member_id, template
+        version and field fingerprint, so a card rendered by one process - the
+        API, its worker pool, or an external email outbox worker on the same
+        host or volume - is reused by the others and kept across restarts.
+
+        Args:
+            renderer: Callable producing the PDF bytes for a member
+            max_entries: Maximum number of PDFs kept in memory (LRU eviction)
+        """
+        self.renderer = renderer
+        self.max_entries = max_entries or int(os.getenv('ID_CARD_CACHE_MAX_ENTRIES', '256'))
+        cache_dir = os.getenv('ID_CARD_CACHE_DIR', str(ROOT_DIR / 'data' / 'id_cards'))
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._artifacts: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _artifact_key(self, member_data: Dict[str, Any]) -> str:
+        """Build the cache key from member_id, template version and the card's field values"""
+        fingerprint = hashlib.sha256(
+            '\x1f'.join(str(member_data.get(field, '')) for field in CARD_FIELDS).encode()
+        ).hexdigest()[:16]
+        return f"{member_data.get('member_id')}:{ID_CARD_TEMPLATE_VERSION}:{fingerprint}"
+
+    def get_id_card_pdf(self, member_data: Dict[str, Any]) -> bytes:
+        """
+        Return the ID card PDF for a member, rendering it only on first use
+
+        Args:
+            member_data: Member record as stored in the database
+
+        Returns:
+            bytes: The rendered PDF
+        """
+        key = self._artifact_key(member_data)
+
+        pdf_data = self._lookup(key)
+        if pdf_data is not None:
+            return pdf_data
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one thread renders a given card; concurrent callers wait for its result
+        with key_lock:
+            pdf_data = self._lookup(key)
+            if pdf_data is not None:
+                return pdf_data
+            with self._lock:
+                self.misses += 1
+
+            try:
+                pdf_data = self.renderer(member_data)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+            self.store(key, pdf_data)
+            logger.info(f"Rendered ID card PDF for member {member_data.get('member_id')}")
+            return pdf_data
+
+    async def get_id_card_pdf_async(self, member_data: Dict[str, Any]) -> bytes:
+        """
+        Async variant of get_id_card_pdf that renders cache misses in the worker pool
+
+        Args:
+            member_data: Member record as stored in the database
+
+        Returns:
+            bytes: The rendered PDF
+        """
+        key = self._artifact_key(member_data)
+
+        pdf_data = self._lookup_memory(key)
+        if pdf_data is None:
+            pdf_data = await asyncio.to_thread(self._lookup_disk, key)
+        if pdf_data is not None:
+            return pdf_data
+
+        with self._lock:
+            self.misses += 1
+
+        pdf_data = await get_worker_pool().run(render_id_card_pdf, member_data)
+        await asyncio.to_thread(self.store, key, pdf_data)
+        logger.info(f"Rendered ID card PDF for member {member_data.get('member_id')}")
+        return pdf_data
+
+    def _member_dir(self, member_id: str) -> Path:
+        safe_id = re.sub(r'[^A-Za-z0-9_-]', '_', str(member_id))
+        return self.cache_dir / hashlib.sha256(safe_id.encode()).hexdigest()[:2] / safe_id
+
+    def _disk_path(self, key: str) -> Path:
+        member_id, version, fingerprint = key.rsplit(':', 2)
+        return self._member_dir(member_id) / f"{version}-{fingerprint}.pdf"
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        """Return a cached PDF from memory or disk and count the hit, or None"""
+        pdf_data = self._lookup_memory(key)
+        return pdf_data if pdf_data is not None else self._lookup_disk(key)
+
+    def _lookup_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            pdf_data = self._artifacts.get(key)
+            if pdf_data is not None:
+                self._artifacts.move_to_end(key)
+                self.hits += 1
+            return pdf_data
+
+    def _lookup_disk(self, key: str) -> Optional[bytes]:
+        if self.cache_dir is None:
+            return None
+        try:
+            pdf_data = self._disk_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"ID card cache read failed: {e}")
+            return None
+        self._remember(key, pdf_data)
+        with self._lock:
+            self.disk_hits += 1
+        return pdf_data
+
+    def _remember(self, key: str, pdf_data: bytes):
+        with self._lock:
+            self._artifacts[key] = pdf_data
+            self._artifacts.move_to_end(key)
+            while len(self._artifacts) > self.max_entries:
+                self._artifacts.popitem(last=False)
+                self.evictions += 1
+
+    def store(self, key: str, pdf_data: bytes):
+        """Store a rendered PDF under its artifact key in memory (LRU) and on disk"""
+        self._remember(key, pdf_data)
+        if self.cache_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(pdf_data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"ID card cache write failed: {e}")
+
+    def invalidate(self, member_id: str):
+        """Drop every cached PDF for a member, in memory and on disk"""
+        prefix = f"{member_id}:"
+        with self._lock:
+            for key in [k for k in self._artifacts if k.startswith(prefix)]:
+                del self._artifacts[key]
+        if self.cache_dir is not None:
+            shutil.rmtree(self._member_dir(member_id), ignore_errors=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'template_version': ID_CARD_TEMPLATE_VERSION,
+                'entries': len(self._artifacts),
+                'max_entries': self.max_entries,
+                'bytes': sum(len(pdf) for pdf in self._artifacts.values()),
+                'disk_dir': str(self.cache_dir) if self.cache_dir else None,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
+
+# Global instance
+_id_card_service = None
+
+def get_id_card_service() -> IDCardService:
+    """Get the global ID card service instance"""
+    global _id_card_service
+    if _id_card_service is None:
+        _id_card_service = IDCardService(renderer=get_id_card_template().render)
+    return _id_card_service
@@ -0,0 +1,518 @@
+import io
+import os
+import base64
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Tuple
+from reportlab.lib import colors
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader, simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+from asset_service import get_asset_registry
+from qr_service import get_qr_service, qr_module_runs
+from qr_signing import get_qr_token_signer
+
+logger = logging.getLogger(__name__)
+
+# ID card dimensions (credit card size)
+CARD_WIDTH = 85.6*mm  # Standard credit card width
+CARD_HEIGHT = 53.98*mm  # Standard credit card height
+
+# Static geometry, computed once per process instead of once per card
+FRONT_WATERMARK_POSITIONS = [
+    (i*mm, j*mm) for i in range(-20, 40, 12) for j in range(-10, 20, 8)
+]
+BACK_WATERMARK_POSITIONS = [
+    (i*mm, j*mm) for i in range(-15, 20, 10) for j in range(-8, 12, 6)
+]
+SECURITY_GRID_LINES = (
+    [(i*mm, 0, i*mm, CARD_HEIGHT) for i in range(0, int(CARD_WIDTH/mm), 3)] +
+    [(0, j*mm, CARD_WIDTH, j*mm) for j in range(0, int(CARD_HEIGHT/mm), 3)]
+)
+
+MEMBERSHIP_TERMS = [
+    "• This card is the property of ADYC and must be returned upon request.",
+    "• Misuse of this card is prohibited and may result in membership termination.",
+    "• Report lost or stolen cards immediately to ADYC administration.",
+    "• This card grants access to ADYC programs and events nationwide.",
+    "• Valid for active members in good standing only."
+]
+
+# Photo slot on the front side
+PHOTO_WIDTH = 16*mm
+PHOTO_HEIGHT = 20*mm
+PHOTO_X = CARD_WIDTH - PHOTO_WIDTH - 4*mm
+PHOTO_Y = CARD_HEIGHT - PHOTO_HEIGHT - 4*mm
+# Photo slot size in pixels at 300 DPI (16mm x 20mm)
+PHOTO_TARGET_WIDTH = int(16 * 300 / 25.4)  # ~189 pixels
+PHOTO_TARGET_HEIGHT = int(20 * 300 / 25.4)  # ~236 pixels
+
+# Layout anchors shared by the static layers and the per-member fields
+INFO_START_Y = CARD_HEIGHT - 26*mm
+BACK_FOOTER_HEIGHT = 8*mm
+
+# Verification QR on the back: right-hand column between header and footer. The
+# signed URL needs a version ~10 code, so the slot is kept large enough for
+# ~0.33mm modules at error correction M; the white pad extends the 2-module
+# quiet zone drawn as part of the code.
+QR_SIZE = 20*mm
+QR_PADDING = 1*mm
+QR_X = CARD_WIDTH - QR_SIZE - 4*mm
+QR_Y = BACK_FOOTER_HEIGHT + 4*mm
+QR_ERROR_CORRECTION = 'M'
+QR_BORDER_MODULES = 2
+
+# Terms and contact details fill the column left of the QR
+BACK_TEXT_X = 3*mm
+BACK_TEXT_WIDTH = QR_X - QR_PADDING - 1*mm - BACK_TEXT_X
+BACK_TERMS_Y = CARD_HEIGHT - 16.5*mm
+BACK_CONTACT_Y = BACK_FOOTER_HEIGHT + 8*mm
+BACK_TERMS_FONT = ("Times-Roman", 6)
+
+def wrap_membership_terms():
+    """Wrap the terms to the back's text column as (x, text) lines, continuation lines aligned past the bullet"""
+    font_name, font_size = BACK_TERMS_FONT
+    lines = []
+    for term in MEMBERSHIP_TERMS:
+        bullet, text = term.split(' ', 1)
+        indent = stringWidth(bullet + ' ', font_name, font_size)
+        for i, line in enumerate(simpleSplit(text, font_name, font_size, BACK_TEXT_WIDTH - indent)):
+            lines.append((BACK_TEXT_X, f"{bullet} {line}") if i == 0 else (BACK_TEXT_X + indent, line))
+    return lines
+
+BACK_TERM_LINES = wrap_membership_terms()
+# Line spacing that keeps the wrapped terms clear of the contact block
+BACK_TERMS_LEADING = min(3*mm, (BACK_TERMS_Y - BACK_CONTACT_Y - 4*mm) / max(len(BACK_TERM_LINES) - 1, 1))
+
+# Form XObject names for the static layers
+FRONT_BASE_FORM = 'adycCardFrontBase'
+BACK_BASE_FORM = 'adycCardBackBase'
+
+class IDCardTemplate:
+    """
+    ID card renderer that splits each side into static layers and member fields
+
+    The security grid, branding, terms and footers are identical for every
+    member, so they are drawn once per PDF document as form XObjects and
+    stamped onto each page with ``doForm``. The translucent watermarks and
+    hologram are drawn on the page itself: ReportLab registers alpha
+    ExtGStates on the page resources only, so a ``gs`` inside a form would
+    point at a resource the form does not have.
+    """
+
+    def __init__(self):
+        # Per-member QR module runs (LRU), keyed by the exact data encoded
+        self.qr_cache_max_entries = int(os.getenv('ID_CARD_QR_CACHE_MAX_ENTRIES', '1024'))
+        self._qr_runs: "OrderedDict[Tuple[str, str], Tuple[int, List[Tuple[int, int, int]]]]" = OrderedDict()
+        self._qr_lock = threading.Lock()
+
+    def render(self, member_data: Dict[str, Any]) -> bytes:
+        """Render a two-page (front and back) ID card PDF for a single member"""
+        return self.render_many([member_data])
+
+    def render_many(self, members: Iterable[Dict[str, Any]]) -> bytes:
+        """
+        Render ID cards for several members into one PDF
+
+        The static layers are defined once for the whole document and reused
+        by every card, so batch printing only pays for the per-member fields.
+        """
+        try:
+            buffer = io.BytesIO()
+            c = canvas.Canvas(buffer, pagesize=(CARD_WIDTH, CARD_HEIGHT))
+            self._define_static_forms(c)
+
+            for member_data in members:
+                # =================== FRONT SIDE ===================
+                self._draw_front_side(c, member_data)
+                c.showPage()
+
+                # =================== BACK SIDE ===================
+                self._draw_back_side(c, member_data)
+                c.showPage()
+
+            c.save()
+            return buffer.getvalue()
+
+        except Exception as e:
+            logger.error(f"Error generating ID card PDF: {e}")
+            raise
+
+    # STATIC LAYERS
+    def _define_static_forms(self, c):
+        """Define the member-independent layers as form XObjects on this document"""
+        c.beginForm(FRONT_BASE_FORM)
+        self._draw_front_base(c)
+        c.endForm()
+
+        c.beginForm(BACK_BASE_FORM)
+        self._draw_back_base(c)
+        c.endForm()
+
+    def _draw_front_background(self, c):
+        """Background and translucent watermark of the front side, drawn on the page"""
+        # Background gradient effect
+        c.setFillColor(colors.HexColor('#f8fafc'))
+        c.rect(0, 0, CARD_WIDTH, CARD_HEIGHT, fill=1)
+
+        # Enhanced watermark - Multiple ADYC logos for forgery prevention
+        c.saveState()
+        c.setFillColor(colors.HexColor('#f8f9fa'))
+        c.setFillAlpha(0.06)  # Very subtle watermark
+        c.rotate(30)
+        watermark = c.beginText()
+        watermark.setFont("Helvetica-Bold", 14)
+        for x, y in FRONT_WATERMARK_POSITIONS:
+            watermark.setTextOrigin(x, y)
+            watermark.textOut("ADYC")
+            watermark.setTextOrigin(x+2*mm, y-2*mm)
+            watermark.textOut("OFFICIAL")
+        c.drawText(watermark)
+        c.restoreState()
+
+    def _draw_front_base(self, c):
+        """Security grid, header and footer strip of the front side"""
+        # Security line pattern
+        c.saveState()
+        c.setStrokeColor(colors.HexColor('#e5e7eb'))
+        c.setLineWidth(0.1)
+        c.lines(SECURITY_GRID_LINES)
+        c.restoreState()
+
+        # Header section with ADYC logo (pre-decoded at startup by the asset registry)
+        logo = get_asset_registry().get_image('adyc_logo')
+        if logo is not None:
+            logo_size = 14*mm
+            c.drawImage(
+                logo,
+                4*mm, CARD_HEIGHT-18*mm,
+                width=logo_size, height=logo_size,
+                preserveAspectRatio=True, mask='auto'
+            )
+        else:
+            # Fallback logo
+            c.setFillColor(colors.HexColor('#f97316'))
+            c.rect(4*mm, CARD_HEIGHT-18*mm, 14*mm, 14*mm, fill=1)
+            c.setFillColor(colors.white)
+            c.setFont("Helvetica-Bold", 8)
+            c.drawString(7*mm, CARD_HEIGHT-13*mm, "ADYC")
+
+        # Organization name
+        c.setFillColor(colors.black)
+        c.setFont("Helvetica-Bold", 10)
+        c.drawString(20*mm, CARD_HEIGHT-8*mm, "AFRICAN DEMOCRATIC")
+        c.drawString(20*mm, CARD_HEIGHT-12*mm, "YOUTH CONGRESS")
+
+        # Field labels
+        c.setFont("Helvetica-Bold", 7)
+        c.drawString(4*mm, INFO_START_Y, "NAME:")
+        c.drawString(4*mm, INFO_START_Y-8*mm, "ID:")
+        c.drawString(4*mm, INFO_START_Y-16*mm, "STATE:")
+        c.drawString(45*mm, INFO_START_Y, "EMAIL:")
+        c.drawString(45*mm, INFO_START_Y-8*mm, "GENDER:")
+        c.drawString(45*mm, INFO_START_Y-13*mm, "DOB:")
+        c.drawString(45*mm, INFO_START_Y-18*mm, "LGA:")
+
+        # Footer with holographic strip
+        c.setFillColor(colors.HexColor('#16a34a'))
+        c.rect(0, 0, CARD_WIDTH, 6*mm, fill=1)
+
+        # Slogan
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 6)
+        slogan_text = "ARISE, IT'S YOUTH O'CLOCK!"
+        text_width = c.stringWidth(slogan_text, "Helvetica-Bold", 6)
+        c.drawString((CARD_WIDTH - text_width) / 2, 0.5*mm, slogan_text)
+
+    def _draw_front_overlay(self, c):
+        """Security hologram corner, drawn above the member photo"""
+        c.saveState()
+        c.setFillColor(colors.HexColor('#fbbf24'))
+        c.setFillAlpha(0.8)
+        # Security triangle using path
+        p = c.beginPath()
+        p.moveTo(CARD_WIDTH-8*mm, CARD_HEIGHT)
+        p.lineTo(CARD_WIDTH, CARD_HEIGHT)
+        p.lineTo(CARD_WIDTH, CARD_HEIGHT-8*mm)
+        p.close()
+        c.drawPath(p, fill=1)
+        c.setFillColor(colors.black)
+        c.setFillAlpha(1)
+        c.setFont("Helvetica-Bold", 3)
+        c.drawString(CARD_WIDTH-7*mm, CARD_HEIGHT-2*mm, "SECURE")
+        c.restoreState()
+
+    def _draw_back_background(self, c):
+        """Background and translucent watermark of the back side, drawn on the page"""
+        # Background
+        c.setFillColor(colors.HexColor('#f8fafc'))
+        c.rect(0, 0, CARD_WIDTH, CARD_HEIGHT, fill=1)
+
+        # Enhanced watermark pattern
+        c.saveState()
+        c.setFillColor(colors.HexColor('#f1f5f9'))
+        c.setFillAlpha(0.5)
+        c.rotate(-25)
+        watermark = c.beginText()
+        watermark.setFont("Helvetica-Bold", 10)
+        for x, y in BACK_WATERMARK_POSITIONS:
+            watermark.setTextOrigin(x, y)
+            watermark.textOut("ADYC")
+        c.drawText(watermark)
+        c.restoreState()
+
+    def _draw_back_base(self, c):
+        """Everything on the back side except the background, serial number and QR code"""
+        # Header
+        c.setFillColor(colors.HexColor('#16a34a'))
+        c.rect(0, CARD_HEIGHT-12*mm, CARD_WIDTH, 12*mm, fill=1)
+
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 9)
+        c.drawString(5*mm, CARD_HEIGHT-7*mm, "AFRICAN DEMOCRATIC YOUTH CONGRESS")
+        c.setFont("Helvetica-Bold", 7)
+        c.drawString(5*mm, CARD_HEIGHT-10*mm, "MEMBERSHIP TERMS & CONDITIONS")
+
+        # Terms and conditions
+        c.setFont(*BACK_TERMS_FONT)
+        c.setFillColor(colors.black)
+        for i, (x, line) in enumerate(BACK_TERM_LINES):
+            c.drawString(x, BACK_TERMS_Y - i * BACK_TERMS_LEADING, line)
+
+        # Contact Information Section
+        c.setFillColor(colors.HexColor('#f97316'))
+        c.setFont("Helvetica-Bold", 8)
+        c.drawString(BACK_TEXT_X, BACK_CONTACT_Y, "CONTACT INFORMATION:")
+
+        c.setFillColor(colors.black)
+        c.setFont("Times-Roman", 7)
+        c.drawString(BACK_TEXT_X, BACK_CONTACT_Y - 3.2*mm, "Phone: 08156257998")
+        c.drawString(BACK_TEXT_X, BACK_CONTACT_Y - 6.4*mm, "Email: africandemocraticyouthcongress@gmail.com")
+
+        # Footer with holographic design
+        c.setFillColor(colors.HexColor('#059669'))
+        c.rect(0, 0, CARD_WIDTH, BACK_FOOTER_HEIGHT, fill=1)
+
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 6)
+        c.drawString(3*mm, 5*mm, "OFFICIAL MEMBERSHIP CARD")
+        c.setFont("Helvetica", 4)
+        c.drawString(3*mm, 3*mm, "WhatsApp: wa.me/c/2349156257998 | TikTok: @adyc676")
+        c.drawString(3*mm, 1*mm, "www.adyc.org | Follow @ADYC_Official")
+
+        # Quiet zone behind the member's QR code
+        c.setFillColor(colors.white)
+        c.setStrokeColor(colors.HexColor('#6b7280'))
+        c.setLineWidth(0.5)
+        c.rect(QR_X - QR_PADDING, QR_Y - QR_PADDING, QR_SIZE + 2*QR_PADDING, QR_SIZE + 2*QR_PADDING, fill=1, stroke=1)
+
+    # PER-MEMBER LAYERS
+    def _draw_front_side(self, c, member_data: Dict[str, Any]):
+        """Stamp the front static layers and draw the member's photo and fields"""
+        self._draw_front_background(c)
+        c.doForm(FRONT_BASE_FORM)
+        self._draw_member_photo(c, member_data)
+
+        # Member information
+        c.setFillColor(colors.black)
+        c.setFont("Times-Bold", 8)
+        name = member_data.get('full_name', 'ZITTA VICTOR').upper()
+        c.drawString(4*mm, INFO_START_Y-3*mm, name)
+        member_id = member_data.get('member_id', 'ADYC-2025-5A5514')
+        c.drawString(4*mm, INFO_START_Y-11*mm, member_id)
+        state = member_data.get('state', 'PLATEAU').upper()
+        c.drawString(15*mm, INFO_START_Y-16*mm, state)
+        gender = member_data.get('gender', 'MALE').upper()
+        c.drawString(58*mm, INFO_START_Y-8*mm, gender)
+        dob = member_data.get('dob', '2005-07-15')
+        c.drawString(52*mm, INFO_START_Y-13*mm, dob)
+        lga = member_data.get('lga', 'JOS NORTH').upper()
+        c.drawString(52*mm, INFO_START_Y-18*mm, lga)
+
+        c.setFont("Times-Roman", 6)
+        email = member_data.get('email', 'zittavictor26@gmail.com')[:30]  # Truncate long emails
+        c.drawString(45*mm, INFO_START_Y-3*mm, email)
+
+        # Serial number and validity
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 5)
+        serial_number = member_data.get('id_card_serial_number', 'SN-UNKNOWN')
+        c.drawString(3*mm, 2*mm, f"S/N: {serial_number}")
+
+        c.setFont("Helvetica", 5)
+        reg_date = member_data.get('registration_date', datetime.now())
+        if isinstance(reg_date, str):
+            reg_date = datetime.fromisoformat(reg_date)
+        c.drawString(3*mm, 4*mm, f"VALID NATIONWIDE • ISSUED: {reg_date.year}")
+
+        self._draw_front_overlay(c)
+
+    def _draw_member_photo(self, c, member_data: Dict[str, Any]):
+        """Draw the member photo, or a placeholder if it cannot be loaded"""
+        photo_stream = None
+        try:
+            passport_data = member_data.get('passport')
+            if passport_data:
+                # Handle both Cloudinary URLs and base64 data
+                if passport_data.startswith('http'):
+                    # It's a Cloudinary URL - download and optimize
+                    photo_stream = self._download_and_optimize_photo(passport_data)
+                elif ',' in passport_data:
+                    # It's base64 data - decode it
+                    image_data = base64.b64decode(passport_data.split(',')[1])
+                    photo_stream = self._optimize_photo_from_bytes(image_data)
+
+            if photo_stream:
+                img = ImageReader(photo_stream)
+                c.drawImage(img, PHOTO_X, PHOTO_Y, width=PHOTO_WIDTH, height=PHOTO_HEIGHT,
+                            preserveAspectRatio=True, mask='auto')
+
+                # Photo frame with security border
+                c.setStrokeColor(colors.HexColor('#f97316'))
+                c.setLineWidth(1.5)
+                c.rect(PHOTO_X-1, PHOTO_Y-1, PHOTO_WIDTH+2, PHOTO_HEIGHT+2, fill=0, stroke=1)
+                return
+
+        except Exception as e:
+            logger.warning(f"Error processing member photo: {e}")
+
+        # If no photo was successfully processed, show placeholder
+        c.setFillColor(colors.HexColor('#e5e7eb'))
+        c.rect(PHOTO_X, PHOTO_Y, PHOTO_WIDTH, PHOTO_HEIGHT, fill=1)
+        c.setFillColor(colors.HexColor('#6b7280'))
+        c.setFont("Helvetica", 6)
+        c.drawString(PHOTO_X+5*mm, PHOTO_Y+9*mm, "PHOTO")
+
+    def _draw_back_side(self, c, member_data: Dict[str, Any]):
+        """Stamp the back static layer and draw the member's serial number and QR code"""
+        self._draw_back_background(c)
+        c.doForm(BACK_BASE_FORM)
+
+        # Serial number on back
+        c.setFillColor(colors.black)
+        c.setFont("Helvetica", 5)
+        serial_number = member_data.get('id_card_serial_number', 'SN-UNKNOWN')
+        c.drawString(QR_X - QR_PADDING, QR_Y - QR_PADDING - 2.2*mm, f"Serial: {serial_number}")
+
+        self._draw_member_qr(c, member_data)
+
+    def _draw_member_qr(self, c, member_data: Dict[str, Any]):
+        """Draw the member's verification QR code as vector modules, one filled path of runs"""
+        size, runs = self._member_qr_runs(member_data)
+        module = QR_SIZE / size
+        c.setFillColor(colors.black)
+        path = c.beginPath()
+        for x, y, width in runs:
+            path.rect(QR_X + x*module, QR_Y + QR_SIZE - (y+1)*module, width*module, module)
+        c.drawPath(path, stroke=0, fill=1)
+
+    def _member_qr_runs(self, member_data: Dict[str, Any]) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """QR matrix size and dark-module runs for the member's (signed) verification URL"""
+        member_id = member_data.get('member_id', '')
+        token = get_qr_token_signer().sign_member(member_data) if member_id else None
+        key = (member_id, token or '')
+        with self._qr_lock:
+            cached = self._qr_runs.get(key)
+            if cached is not None:
+                self._qr_runs.move_to_end(key)
+                return cached
+
+        matrix = get_qr_service().make_member_qr(
+            member_id, token, error_correction=QR_ERROR_CORRECTION, border=QR_BORDER_MODULES
+        ).get_matrix()
+        result = (len(matrix), list(qr_module_runs(matrix)))
+        with self._qr_lock:
+            self._qr_runs[key] = result
+            while len(self._qr_runs) > self.qr_cache_max_entries:
+                self._qr_runs.popitem(last=False)
+        return result
+
+    # PHOTO PROCESSING
+    def _download_and_optimize_photo(self, cloudinary_url: str):
+        """Download photo from Cloudinary URL and optimize it for ID card use"""
+        import requests
+
+        try:
+            # Download the image from Cloudinary
+            response = requests.get(cloudinary_url, timeout=10)
+            response.raise_for_status()
+
+            # Optimize the downloaded image
+            return self._optimize_photo_from_bytes(response.content)
+
+        except Exception as e:
+            logger.error(f"Error downloading photo from Cloudinary: {e}")
+            raise
+
+    def _optimize_photo_from_bytes(self, image_bytes: bytes):
+        """Prepare photo bytes for ID card use (see prepare_card_photo)"""
+        try:
+            return io.BytesIO(prepare_card_photo(image_bytes))
+
+        except Exception as e:
+            logger.error(f"Error optimizing photo: {e}")
+            raise
+
+def prepare_card_photo(image_bytes: bytes) -> bytes:
+    """
+    Fit a member photo to the card's photo slot and encode it once as JPEG
+
+    JPEG sources are decoded in draft mode, letting libjpeg scale them down by
+    1/2, 1/4 or 1/8 while decoding instead of materialising every pixel of a
+    phone-camera photo. The result is a single baseline JPEG, which ReportLab
+    embeds as-is (DCTDecode passthrough) without decoding or recompressing it.
+
+    Args:
+        image_bytes: Raw photo bytes in any format PIL can read
+
+    Returns:
+        bytes: JPEG bytes sized for the photo slot at 300 DPI
+    """
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(image_bytes))
+
+    # Shrink during decode; must happen before anything loads the pixels
+    if img.format == 'JPEG':
+        img.draft('RGB', (PHOTO_TARGET_WIDTH, PHOTO_TARGET_HEIGHT))
+
+    # Flatten transparency onto white so transparent areas don't turn black
+    if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+        rgba = img.convert('RGBA')
+        img = Image.new('RGB', rgba.size, 'white')
+        img.paste(rgba, mask=rgba.getchannel('A'))
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    # Resize while maintaining aspect ratio
+    img.thumbnail((PHOTO_TARGET_WIDTH, PHOTO_TARGET_HEIGHT), Image.Resampling.LANCZOS)
+
+    # Create a white background if image is smaller
+    if img.size[0] < PHOTO_TARGET_WIDTH or img.size[1] < PHOTO_TARGET_HEIGHT:
+        background = Image.new('RGB', (PHOTO_TARGET_WIDTH, PHOTO_TARGET_HEIGHT), 'white')
+        # Center the image on the background
+        x = (PHOTO_TARGET_WIDTH - img.size[0]) // 2
+        y = (PHOTO_TARGET_HEIGHT - img.size[1]) // 2
+        background.paste(img, (x, y))
+        img = background
+
+    output = io.BytesIO()
+    img.save(output, format='JPEG', quality=90)
+    return output.getvalue()
+
+# Global instance
+_id_card_template = None
+
+def get_id_card_template() -> IDCardTemplate:
+    """Get the global ID card template instance"""
+    global _id_card_template
+    if _id_card_template is None:
+        _id_card_template = IDCardTemplate()
+    return _id_card_template
+
+def render_id_card_pdf(member_data: Dict[str, Any]) -> bytes:
+    """Render a member's ID card PDF (module-level so it can run in the worker pool)"""
+    return get_id_card_template().render(member_data)
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+class InMemoryMemberCacheBackend:
+    """Per-process LRU cache with a TTL on every entry"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+class RedisMemberCacheBackend:
+    """Shared cache so every uvicorn worker sees the same entries and invalidations"""
+
+    name = 'redis'
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise ValueError("MEMBER_CACHE_BACKEND=redis requires the 'redis' package")
+        self._redis = redis.from_url(url)
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self._redis.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl: float):
+        await self._redis.set(key, json.dumps(value, default=str), ex=max(1, int(ttl)))
+
+    async def delete(self, key: str):
+        await self._redis.delete(key)
+
+    async def size(self) -> int:
+        count = 0
+        async for _ in self._redis.scan_iter(match='member:*'):
+            count += 1
+        return count
+
+class MemberCache:
+    def __init__(self):
+        """Read-through cache for member records keyed by member_id"""
+        self.ttl = float(os.getenv('MEMBER_CACHE_TTL_SECONDS', '300'))
+        backend = os.getenv('MEMBER_CACHE_BACKEND', 'memory').lower()
+        if backend == 'redis':
+            self.backend = RedisMemberCacheBackend(os.getenv('MEMBER_CACHE_REDIS_URL', 'redis://localhost:6379/0'))
+        else:
+            self.backend = InMemoryMemberCacheBackend(int(os.getenv('MEMBER_CACHE_MAX_ENTRIES', '5000')))
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(member_id: str) -> str:
+        return f"member:{member_id}"
+
+    async def get(self, member_id: str) -> Optional[Dict[str, Any]]:
+        """Get a cached member (a copy, so callers can't mutate the cache), or None"""
+        try:
+            member = await self.backend.get(self._key(member_id))
+        except Exception as e:
+            logger.warning(f"Member cache read failed: {e}")
+            member = None
+        if member is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(member)
+
+    async def set(self, member: Dict[str, Any]):
+        """Store or refresh a member record"""
+        if not member or not member.get('member_id'):
+            return
+        try:
+            await self.backend.set(self._key(member['member_id']), dict(member), self.ttl)
+        except Exception as e:
+            logger.warning(f"Member cache write failed: {e}")
+
+    async def invalidate(self, member_id: str):
+        """Drop a member so the next read goes to the database"""
+        self.invalidations += 1
+        try:
+            await self.backend.delete(self._key(member_id))
+        except Exception as e:
+            logger.warning(f"Member cache invalidation failed: {e}")
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get hit rate and size metrics"""
+        lookups = self.hits + self.misses
+        try:
+            size = await self.backend.size()
+        except Exception:
+            size = None
+        return {
+            'backend': self.backend.name,
+            'size': size,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'evictions': self.backend.evictions
+        }
+
+# Global instance
+_member_cache = None
+
+def get_member_cache() -> MemberCache:
+    """Get the global member cache instance"""
+    global _member_cache
+    if _member_cache is None:
+        _member_cache = MemberCache()
+    return _member_cache
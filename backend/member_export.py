@@ -0,0 +1,161 @@
+import io
+import os
+import csv
+import json
+import logging
+from typing import Dict, Any, List, Optional, AsyncIterator
+from dotenv import load_dotenv
+from supabase_service import DEFAULT_MEMBER_LIST_FIELDS, MEMBER_PAGE_MAX_LIMIT
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# Columns that are not text in the members table
+BOOLEAN_FIELDS = {'id_card_generated'}
+
+# Leading characters that make spreadsheet apps treat a CSV cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def csv_safe(value):
+    """Neutralise a CSV cell that a spreadsheet would evaluate, by prefixing it with a quote"""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+async def iter_member_pages(supabase_service, first_page: Dict[str, Any], page_size: int,
+                            **query) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Walk the members listing page by page, so only one page is held at a time
+
+    Args:
+        supabase_service: SupabaseService used to fetch pages
+        first_page: Page already fetched by the caller (used to validate the query up front)
+        page_size: Rows per page
+        **query: Filters, date range and fields passed to get_members_page
+    """
+    page = first_page
+    while True:
+        if page['members']:
+            yield page['members']
+        if not page['next_cursor']:
+            return
+        page = await supabase_service.get_members_page(limit=page_size, cursor=page['next_cursor'], **query)
+
+async def stream_csv(pages: AsyncIterator[List[Dict[str, Any]]], fields: List[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    async for rows in pages:
+        # Member-supplied text ends up in admins' spreadsheets, so formulas are defused
+        writer.writerows({field: csv_safe(value) for field, value in row.items()} for row in rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+async def stream_ndjson(pages: AsyncIterator[List[Dict[str, Any]]], fields: List[str]) -> AsyncIterator[bytes]:
+    async for rows in pages:
+        yield ''.join(json.dumps(row, default=str) + '\n' for row in rows).encode('utf-8')
+
+class _ChunkSink:
+    """Write-only file object handing out what has been written since the last drain"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet footers record absolute offsets, so this must count every byte ever written
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+async def stream_parquet(pages: AsyncIterator[List[Dict[str, Any]]], fields: List[str]) -> AsyncIterator[bytes]:
+    """Write one Parquet row group per page and send it as soon as it is encoded"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(field, pa.bool_() if field in BOOLEAN_FIELDS else pa.string()) for field in fields])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        async for rows in pages:
+            columns = {
+                field: [row.get(field) if field in BOOLEAN_FIELDS or row.get(field) is None else str(row.get(field))
+                        for row in rows]
+                for field in fields
+            }
+            writer.write_table(pa.table(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def check_export_format(export_format: str):
+    """Raise ValueError for unknown formats or when Parquet support is not installed"""
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{export_format}'; use one of: {', '.join(EXPORT_FORMATS)}")
+    if export_format == 'parquet':
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export requires the 'pyarrow' package")
+
+async def export_members(supabase_service, export_format: str, filters: Optional[Dict[str, str]] = None,
+                         registered_from=None, registered_to=None,
+                         fields: Optional[List[str]] = None) -> AsyncIterator[bytes]:
+    """
+    Stream the filtered member roster in the requested format
+
+    The first page is fetched before this returns, so a bad filter, field or
+    database error surfaces as an exception rather than a truncated download.
+
+    Returns:
+        Async iterator of encoded chunks
+    """
+    check_export_format(export_format)
+    # Rows fetched per database round trip; get_members_page caps pages at MEMBER_PAGE_MAX_LIMIT
+    page_size = int(os.getenv('MEMBER_EXPORT_PAGE_SIZE', str(MEMBER_PAGE_MAX_LIMIT)))
+    if not 1 <= page_size <= MEMBER_PAGE_MAX_LIMIT:
+        logger.warning(f"MEMBER_EXPORT_PAGE_SIZE={page_size} is outside 1..{MEMBER_PAGE_MAX_LIMIT}; clamping")
+        page_size = max(1, min(page_size, MEMBER_PAGE_MAX_LIMIT))
+    fields = list(fields or DEFAULT_MEMBER_LIST_FIELDS)
+    query = {
+        'filters': filters,
+        'registered_from': registered_from,
+        'registered_to': registered_to,
+        'fields': fields,
+    }
+    first_page = await supabase_service.get_members_page(limit=page_size, **query)
+    pages = iter_member_pages(supabase_service, first_page, page_size, **query)
+
+    if export_format == 'csv':
+        return stream_csv(pages, fields)
+    if export_format == 'ndjson':
+        return stream_ndjson(pages, fields)
+    return stream_parquet(pages, fields)
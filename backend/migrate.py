@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the Supabase Postgres database
+
+Migrations are the NNNN_description.sql files in backend/migrations. Each one
+runs in its own transaction and is recorded in schema_migrations with a
+checksum, so it is applied exactly once and later edits to an applied file
+are reported instead of silently ignored.
+
+Usage:
+    python migrate.py status   # list applied and pending migrations
+    python migrate.py up       # apply pending migrations
+    python migrate.py check    # fail if a known query plans a sequential scan
+
+Requires DATABASE_URL (the direct Postgres connection string, with password).
+"""
+
+import os
+import re
+import sys
+import json
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+import asyncpg
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(os.getenv('MIGRATIONS_DIR', str(ROOT_DIR / 'migrations')))
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# Arbitrary constant shared by every runner so two deploys can't migrate at once
+MIGRATION_LOCK_ID = 7_246_001
+
+CREATE_MIGRATIONS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    applied_at TIMESTAMPTZ DEFAULT NOW()
+);
+"""
+
+# Queries issued by supabase_service.py (as PostgREST generates them) that must be index-backed
+PLAN_CHECK_QUERIES = {
+    'get_activity_logs': "SELECT * FROM activity_logs ORDER BY created_at DESC LIMIT 100",
+    'stats_recent_activity': "SELECT count(*) FROM activity_logs WHERE created_at >= NOW() - INTERVAL '7 days'",
+    'get_blog_posts': "SELECT * FROM blog_posts WHERE published = true ORDER BY created_at DESC",
+    'get_admin_blog_posts': "SELECT * FROM blog_posts ORDER BY created_at DESC",
+    'get_admin_user': "SELECT * FROM admin_users WHERE username = 'admin' AND is_active = true",
+    'get_member_by_id': "SELECT * FROM members WHERE member_id = 'ADYC-2025-000000'",
+    'check_member_email': "SELECT id FROM members WHERE email = 'member@example.com'",
+    'get_members_page': (
+        "SELECT id, registration_date FROM members "
+        "WHERE registration_date < NOW() OR (registration_date = NOW() "
+        "AND id < '00000000-0000-0000-0000-000000000000') "
+        "ORDER BY registration_date DESC, id DESC LIMIT 101"
+    ),
+    'get_members_page_by_state': (
+        "SELECT id, registration_date FROM members WHERE state = 'Lagos' "
+        "ORDER BY registration_date DESC, id DESC LIMIT 101"
+    ),
+    'get_members_page_by_lga': (
+        "SELECT id, registration_date FROM members WHERE lga = 'Ikeja' "
+        "ORDER BY registration_date DESC, id DESC LIMIT 101"
+    ),
+}
+
+def load_migrations() -> List[Tuple[str, str, str, str]]:
+    """Read migration files as (version, name, checksum, sql), ordered by version"""
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob('*.sql')):
+        match = MIGRATION_FILE_PATTERN.match(path.name)
+        if not match:
+            raise ValueError(f"Migration file name must look like 0001_description.sql: {path.name}")
+        sql = path.read_text()
+        checksum = hashlib.sha256(sql.encode('utf-8')).hexdigest()
+        migrations.append((match.group(1), match.group(2), checksum, sql))
+
+    versions = [version for version, _, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Duplicate migration version numbers")
+    return migrations
+
+async def connect() -> asyncpg.Connection:
+    database_url = os.getenv('DATABASE_URL')
+    if not database_url or '[password]' in database_url:
+        raise ValueError("DATABASE_URL with the database password is required to run migrations")
+    return await asyncpg.connect(database_url)
+
+async def get_applied(conn: asyncpg.Connection) -> Dict[str, Dict[str, Any]]:
+    await conn.execute(CREATE_MIGRATIONS_TABLE_SQL)
+    rows = await conn.fetch("SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version")
+    return {row['version']: dict(row) for row in rows}
+
+async def status() -> List[Dict[str, Any]]:
+    """Get every migration with its applied state"""
+    conn = await connect()
+    try:
+        applied = await get_applied(conn)
+    finally:
+        await conn.close()
+
+    result = []
+    for version, name, checksum, _ in load_migrations():
+        record = applied.get(version)
+        result.append({
+            'version': version,
+            'name': name,
+            'applied_at': record['applied_at'] if record else None,
+            'modified': bool(record) and record['checksum'] != checksum
+        })
+    return result
+
+async def migrate_up() -> List[str]:
+    """
+    Apply pending migrations in version order
+
+    Returns:
+        Versions that were applied
+    """
+    migrations = load_migrations()
+    conn = await connect()
+    try:
+        await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+        try:
+            applied = await get_applied(conn)
+            newly_applied = []
+            for version, name, checksum, sql in migrations:
+                if version in applied:
+                    if applied[version]['checksum'] != checksum:
+                        logger.warning(f"Migration {version}_{name} was modified after it was applied")
+                    continue
+
+                logger.info(f"Applying migration {version}_{name}")
+                async with conn.transaction():
+                    await conn.execute(sql)
+                    await conn.execute(
+                        "INSERT INTO schema_migrations (version, name, checksum) VALUES ($1, $2, $3)",
+                        version, name, checksum
+                    )
+                newly_applied.append(version)
+            return newly_applied
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+    finally:
+        await conn.close()
+
+def find_seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Walk an EXPLAIN (FORMAT JSON) plan tree and return the relations read by a Seq Scan"""
+    relations = []
+    if plan.get('Node Type') == 'Seq Scan':
+        relations.append(plan.get('Relation Name', '?'))
+    for child in plan.get('Plans', []):
+        relations.extend(find_seq_scans(child))
+    return relations
+
+async def check_query_plans() -> Dict[str, List[str]]:
+    """
+    EXPLAIN each known query and report the ones that still plan a sequential scan
+
+    Sequential scans are disabled for the check, so on a small table the
+    planner only picks one when no usable index exists.
+
+    Returns:
+        Mapping of query name to the relations it scans sequentially (empty if all pass)
+    """
+    conn = await connect()
+    failures = {}
+    try:
+        async with conn.transaction():
+            await conn.execute("SET LOCAL enable_seqscan = off")
+            for name, query in PLAN_CHECK_QUERIES.items():
+                plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {query}")
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                relations = find_seq_scans(plan[0]['Plan'])
+                if relations:
+                    failures[name] = relations
+    finally:
+        await conn.close()
+    return failures
+
+async def main(command: str) -> int:
+    if command == 'status':
+        for migration in await status():
+            state = f"applied {migration['applied_at']}" if migration['applied_at'] else "pending"
+            if migration['modified']:
+                state += " (modified since applied)"
+            print(f"{migration['version']}_{migration['name']}: {state}")
+        return 0
+
+    if command == 'up':
+        applied = await migrate_up()
+        print(f"Applied {len(applied)} migration(s)" + (f": {', '.join(applied)}" if applied else ""))
+        return 0
+
+    if command == 'check':
+        failures = await check_query_plans()
+        for name, relations in failures.items():
+            print(f"FAIL {name}: sequential scan on {', '.join(relations)}")
+        print(f"{len(PLAN_CHECK_QUERIES) - len(failures)}/{len(PLAN_CHECK_QUERIES)} queries use an index")
+        return 1 if failures else 0
+
+    print(__doc__)
+    return 2
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(main(sys.argv[1] if len(sys.argv) > 1 else 'status')))
@@ -0,0 +1,14 @@
+-- Indexes for the access paths used by supabase_service.py
+-- (activity_logs.created_at is already covered by idx_activity_logs_created_at in 0001)
+
+-- Published posts newest first, and the admin listing of all posts
+CREATE INDEX IF NOT EXISTS idx_blog_posts_published_created_at ON blog_posts(published, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_blog_posts_created_at ON blog_posts(created_at DESC);
+
+-- Admin login: username = ? AND is_active = true
+CREATE INDEX IF NOT EXISTS idx_admin_users_username_active ON admin_users(username, is_active);
+
+-- Members listing and export: keyset order, optionally filtered by state or LGA
+CREATE INDEX IF NOT EXISTS idx_members_registration_date_id ON members(registration_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_members_state_registration ON members(state, registration_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_members_lga_registration ON members(lga, registration_date DESC, id DESC);
@@ -0,0 +1,10 @@
+-- Revoked ID cards; signed QR tokens carry the card serial, so revocation is by serial
+CREATE TABLE IF NOT EXISTS revoked_cards (
+    serial_number TEXT PRIMARY KEY,
+    member_id TEXT NOT NULL,
+    reason TEXT,
+    revoked_by TEXT,
+    revoked_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_revoked_cards_revoked_at ON revoked_cards(revoked_at);
@@ -0,0 +1,3 @@
+-- Incremental verification bundle builds read members in insertion order;
+-- created_at is assigned by the database (DEFAULT NOW()), unlike registration_date
+CREATE INDEX IF NOT EXISTS idx_members_created_at_id ON members(created_at, id);
@@ -0,0 +1,171 @@
+import os
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from dotenv import load_dotenv
+from qr_service import get_qr_service, render_member_qr_png, render_member_qr_svg
+from worker_pool_service import get_worker_pool
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the QR image design changes so cached images are regenerated
+QR_RENDER_VERSION = '2'
+
+# Image kind -> worker-pool renderer
+QR_RENDERERS = {
+    'png': render_member_qr_png,
+    'svg': render_member_qr_svg,
+}
+
+class QRImageCache:
+    def __init__(self):
+        """
+        Two-level cache of rendered member QR images (branded PNG, plain SVG)
+
+        Entries are addressed by a digest of everything the image depends on
+        (member_id, name, frontend URL, signed token and render version), so a
+        changed input simply addresses a new entry and nothing needs to be
+        invalidated. The digest doubles as the strong ETag. Level one is an
+        in-memory LRU (QR_CACHE_MAX_ENTRIES); level two is a directory of
+        <digest>.<png|svg> files (QR_CACHE_DIR, empty to disable) shared by all
+        workers and kept across restarts.
+        """
+        self.max_entries = int(os.getenv('QR_CACHE_MAX_ENTRIES', '2048'))
+        cache_dir = os.getenv('QR_CACHE_DIR', str(ROOT_DIR / 'data' / 'qr_cache'))
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._renders: Dict[str, asyncio.Future] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def digest(member_id: str, member_name: Optional[str], token: Optional[str] = None) -> str:
+        """Address of the QR image for these inputs"""
+        inputs = [QR_RENDER_VERSION, get_qr_service().frontend_url, member_id, member_name or '', token or '']
+        return hashlib.sha256('\x1f'.join(inputs).encode('utf-8')).hexdigest()[:32]
+
+    def _disk_path(self, name: str) -> Path:
+        return self.cache_dir / name[:2] / name
+
+    def _read_disk(self, name: str) -> Optional[bytes]:
+        try:
+            return self._disk_path(name).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, name: str, image_data: bytes):
+        path = self._disk_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{name}.{os.getpid()}.tmp')
+        tmp_path.write_bytes(image_data)
+        os.replace(tmp_path, path)
+
+    def _remember(self, name: str, image_data: bytes):
+        self._images[name] = image_data
+        self._images.move_to_end(name)
+        while len(self._images) > self.max_entries:
+            self._images.popitem(last=False)
+            self.evictions += 1
+
+    async def get_png(self, member_id: str, member_name: Optional[str] = None,
+                      token: Optional[str] = None) -> Tuple[str, bytes]:
+        """
+        Get a member's branded QR PNG, rendering it in the worker pool only when no level has it
+
+        Returns:
+            (digest, png bytes)
+        """
+        return await self._get('png', member_id, member_name, token)
+
+    async def get_svg(self, member_id: str, token: Optional[str] = None) -> Tuple[str, bytes]:
+        """
+        Get a member's plain vector QR code as SVG
+
+        Returns:
+            (digest, svg bytes)
+        """
+        return await self._get('svg', member_id, None, token)
+
+    async def _get(self, kind: str, member_id: str, member_name: Optional[str],
+                   token: Optional[str]) -> Tuple[str, bytes]:
+        digest = self.digest(member_id, member_name, token)
+        name = f"{digest}.{kind}"
+
+        image_data = self._images.get(name)
+        if image_data is not None:
+            self._images.move_to_end(name)
+            self.memory_hits += 1
+            return digest, image_data
+
+        # Concurrent requests for the same image wait on one render
+        pending = self._renders.get(name)
+        if pending is not None:
+            return digest, await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._renders[name] = future
+        try:
+            image_data = None
+            if self.cache_dir is not None:
+                try:
+                    image_data = await asyncio.to_thread(self._read_disk, name)
+                except OSError as e:
+                    logger.warning(f"QR cache read failed: {e}")
+            if image_data is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                image_data = await get_worker_pool().run(QR_RENDERERS[kind], member_id, member_name, token)
+                if self.cache_dir is not None:
+                    try:
+                        await asyncio.to_thread(self._write_disk, name, image_data)
+                    except OSError as e:
+                        logger.warning(f"QR cache write failed: {e}")
+
+            self._remember(name, image_data)
+            future.set_result(image_data)
+            return digest, image_data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved: waiters get the error, and there may be none
+            future.exception()
+            raise
+        finally:
+            self._renders.pop(name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-level hit counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'render_version': QR_RENDER_VERSION,
+            'memory_entries': len(self._images),
+            'max_entries': self.max_entries,
+            'memory_bytes': sum(len(image) for image in self._images.values()),
+            'disk_dir': str(self.cache_dir) if self.cache_dir else None,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+        }
+
+# Global instance
+_qr_image_cache = None
+
+def get_qr_image_cache() -> QRImageCache:
+    """Get the global QR image cache instance"""
+    global _qr_image_cache
+    if _qr_image_cache is None:
+        _qr_image_cache = QRImageCache()
+    return _qr_image_cache
@@ -3,69 +3,98 @@ import logging
 import qrcode
 import io
 import base64
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from PIL import Image, ImageDraw, ImageFont
 from dotenv import load_dotenv
+from qr_signing import verification_url as build_verification_url
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+def qr_module_runs(matrix: List[List[bool]]) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield (x, y, width) for each horizontal run of dark modules
+    
+    Drawing runs instead of single modules keeps vector output small and
+    avoids hairline seams between adjacent squares.
+    """
+    for y, row in enumerate(matrix):
+        x = 0
+        size = len(row)
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                yield start, y, x - start
+            else:
+                x += 1
+
+def qr_module_rects(matrix: List[List[bool]]) -> List[Tuple[int, int, int, int]]:
+    """
+    Merge dark-module runs into (x, y, width, height) rectangles
+    
+    A run that repeats at the same x and width on the next row extends the
+    rectangle above it, which takes care of the finder patterns, timing
+    lines and most vertical strokes.
+    """
+    rects: List[List[int]] = []
+    open_rects: Dict[Tuple[int, int], int] = {}
+    previous_y = None
+    for x, y, width in qr_module_runs(matrix):
+        if y != previous_y:
+            # Rectangles not continued on the previous row are closed
+            if previous_y is not None and y != previous_y + 1:
+                open_rects = {}
+            current_rects, open_rects, previous_y = open_rects, {}, y
+        index = current_rects.get((x, width))
+        if index is None:
+            index = len(rects)
+            rects.append([x, y, width, 1])
+        else:
+            rects[index][3] += 1
+        open_rects[(x, width)] = index
+    return [tuple(rect) for rect in sorted(rects, key=lambda rect: (rect[1], rect[0]))]
+
+def qr_svg_path(matrix: List[List[bool]]) -> str:
+    """SVG path data for the dark modules, using relative moves between rectangles"""
+    commands = []
+    cursor_x = cursor_y = 0
+    for x, y, width, height in qr_module_rects(matrix):
+        dx, dy = x - cursor_x, y - cursor_y
+        commands.append(f"m{dx}{'' if dy < 0 else ' '}{dy}h{width}v{height}h-{width}z")
+        cursor_x, cursor_y = x, y
+    return ''.join(commands)
+
 class QRCodeService:
     def __init__(self):
         self.frontend_url = os.getenv('REACT_APP_FRONTEND_URL', 'https://secure-id-creator.preview.emergentagent.com')
         
-    def generate_member_qr(self, member_id: str, member_name: str = None) -> Dict[str, Any]:
+    def generate_member_qr(self, member_id: str, member_name: str = None, token: str = None) -> Dict[str, Any]:
         """
         Generate QR code for member profile verification
         
         Args:
             member_id: Unique member identifier
             member_name: Optional member name for enhanced QR code
+            token: Optional signed token (see qr_signing) for offline verification
             
         Returns:
             Dict containing QR code data (base64 image and verification URL)
         """
         try:
-            # Create member verification URL
-            verification_url = f"{self.frontend_url}/verify/{member_id}"
-            
-            # Create QR code instance with custom settings
-            qr = qrcode.QRCode(
-                version=1,  # Controls size (1 is smallest)
-                error_correction=qrcode.constants.ERROR_CORRECT_H,  # High error correction for better scanning
-                box_size=10,  # Size of each box in pixels
-                border=4,  # Minimum border size
-            )
-            
-            # Add data and generate QR code
-            qr.add_data(verification_url)
-            qr.make(fit=True)
-            
-            # Create QR code image with custom colors
-            qr_img = qr.make_image(
-                fill_color="#FF6600",  # ADYC orange
-                back_color="white"
-            )
-            
-            # Convert to RGB if not already
-            if qr_img.mode != 'RGB':
-                qr_img = qr_img.convert('RGB')
-            
-            # Enhanced QR code with ADYC branding
-            enhanced_qr = self._enhance_qr_code(qr_img, member_id, member_name)
+            png_data = self.render_member_qr_png(member_id, member_name, token)
             
             # Convert to base64 for easy storage/transmission
-            buffer = io.BytesIO()
-            enhanced_qr.save(buffer, format='PNG', quality=95)
-            img_base64 = base64.b64encode(buffer.getvalue()).decode()
+            img_base64 = base64.b64encode(png_data).decode()
             
             logger.info(f"Successfully generated QR code for member: {member_id}")
             
             return {
                 'qr_code_base64': img_base64,
-                'verification_url': verification_url,
+                'verification_url': build_verification_url(self.frontend_url, member_id, token),
                 'member_id': member_id,
                 'qr_type': 'member_verification'
             }
@@ -74,6 +103,83 @@ class QRCodeService:
             logger.error(f"Error generating QR code for member {member_id}: {e}")
             raise ValueError(f"Failed to generate QR code: {str(e)}")
     
+    def make_member_qr(self, member_id: str, token: str = None, error_correction: str = 'H',
+                       border: int = 4) -> qrcode.QRCode:
+        """
+        Build the QR matrix for a member's verification URL
+        
+        Args:
+            member_id: Unique member identifier
+            token: Optional signed token (see qr_signing)
+            error_correction: 'L', 'M', 'Q' or 'H'; H suits screens and the branded
+                PNG, small print (the ID card) needs a lower level to keep modules large
+            border: Quiet zone in modules
+        """
+        qr = qrcode.QRCode(
+            version=1,  # Controls size (1 is smallest)
+            error_correction=getattr(qrcode.constants, f'ERROR_CORRECT_{error_correction}'),
+            box_size=10,  # Size of each box in pixels
+            border=border,
+        )
+        qr.add_data(build_verification_url(self.frontend_url, member_id, token))
+        qr.make(fit=True)
+        return qr
+    
+    def render_member_qr_png(self, member_id: str, member_name: str = None, token: str = None) -> bytes:
+        """
+        Render the branded member QR code as PNG bytes
+        
+        Args:
+            member_id: Unique member identifier
+            member_name: Optional member name for enhanced QR code
+            token: Optional signed token (see qr_signing) for offline verification
+            
+        Returns:
+            bytes: The PNG image
+        """
+        qr = self.make_member_qr(member_id, token)
+        
+        # Create QR code image with custom colors
+        qr_img = qr.make_image(
+            fill_color="#FF6600",  # ADYC orange
+            back_color="white"
+        )
+        
+        # Convert to RGB if not already
+        if qr_img.mode != 'RGB':
+            qr_img = qr_img.convert('RGB')
+        
+        # Enhanced QR code with ADYC branding
+        enhanced_qr = self._enhance_qr_code(qr_img, member_id, member_name)
+        
+        buffer = io.BytesIO()
+        enhanced_qr.save(buffer, format='PNG', quality=95)
+        return buffer.getvalue()
+    
+    def render_member_qr_svg(self, member_id: str, token: str = None) -> bytes:
+        """
+        Render the member QR code as a plain vector SVG straight from the QR matrix
+        
+        One unit per module (quiet zone included), so it scales to any print size.
+        
+        Args:
+            member_id: Unique member identifier
+            token: Optional signed token (see qr_signing) for offline verification
+            
+        Returns:
+            bytes: The SVG document
+        """
+        matrix = self.make_member_qr(member_id, token).get_matrix()
+        size = len(matrix)
+        path = qr_svg_path(matrix)
+        svg = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+            f'<rect width="{size}" height="{size}" fill="#FFFFFF"/>'
+            f'<path fill="#FF6600" d="{path}"/>'
+            f'</svg>'
+        )
+        return svg.encode('utf-8')
+    
     def _enhance_qr_code(self, qr_img: Image.Image, member_id: str, member_name: str = None) -> Image.Image:
         """
         Enhance QR code with ADYC branding and member information
@@ -210,4 +316,39 @@ def get_qr_service() -> QRCodeService:
     global _qr_service
     if _qr_service is None:
         _qr_service = QRCodeService()
-    return _qr_service
\ No newline at end of file
+    return _qr_service
+
+def render_member_qr(member_id: str, member_name: str = None, token: str = None) -> Dict[str, Any]:
+    """Generate a member QR code (module-level so it can run in the worker pool)"""
+    return get_qr_service().generate_member_qr(member_id=member_id, member_name=member_name, token=token)
+
+def render_member_qr_png(member_id: str, member_name: str = None, token: str = None) -> bytes:
+    """Render a member QR code PNG (module-level so it can run in the worker pool)"""
+    return get_qr_service().render_member_qr_png(member_id, member_name, token)
+
+def render_member_qr_svg(member_id: str, member_name: str = None, token: str = None) -> bytes:
+    """Render a member QR code SVG (module-level so it can run in the worker pool; the name is not drawn)"""
+    return get_qr_service().render_member_qr_svg(member_id, token)
+
+def render_member_qr_runs(items: List[Tuple[str, Optional[str]]]) -> List[Tuple[int, List[Tuple[int, int, int]]]]:
+    """
+    Compute QR module runs for a batch of (member_id, token) pairs (worker-pool job)
+    
+    Returns:
+        One (matrix size, [(x, y, width), ...]) per item, ready for vector drawing
+    """
+    service = get_qr_service()
+    results = []
+    for member_id, token in items:
+        matrix = service.make_member_qr(member_id, token).get_matrix()
+        results.append((len(matrix), list(qr_module_runs(matrix))))
+    return results
+
+def render_member_qr_pngs(items: List[Tuple[str, Optional[str], Optional[str]]]) -> List[bytes]:
+    """Render branded QR PNGs for a batch of (member_id, member_name, token) (worker-pool job)"""
+    service = get_qr_service()
+    return [service.render_member_qr_png(member_id, member_name, token) for member_id, member_name, token in items]
+
+def render_event_qr(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate an event QR code (module-level so it can run in the worker pool)"""
+    return get_qr_service().generate_event_qr(event_data)
@@ -0,0 +1,118 @@
+import os
+import sys
+import logging
+from typing import Dict, Any, List, Optional
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat, PrivateFormat, NoEncryption
+from dotenv import load_dotenv
+from qr_token_verifier import (
+    QRTokenVerifier, InvalidQRToken, TOKEN_QUERY_PARAM, b64url_encode, b64url_decode, public_key_id, encode_payload
+)
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+class QRTokenSigner:
+    def __init__(self):
+        """
+        Ed25519 signer for member QR tokens
+
+        QR_SIGNING_PRIVATE_KEY is the base64url raw 32-byte key (generate one
+        with `python qr_signing.py generate-key`). QR_SIGNING_RETIRED_PUBLIC_KEYS
+        lists comma-separated base64url public keys that are no longer used to
+        sign but whose tokens, already printed on cards, must still verify.
+        Without a private key QR codes carry the plain verification URL.
+        """
+        self._private_key: Optional[Ed25519PrivateKey] = None
+        self.key_id: Optional[str] = None
+        public_keys: Dict[str, Ed25519PublicKey] = {}
+
+        private_key = os.getenv('QR_SIGNING_PRIVATE_KEY')
+        if private_key:
+            self._private_key = Ed25519PrivateKey.from_private_bytes(b64url_decode(private_key))
+            public_key = self._private_key.public_key()
+            self.key_id = public_key_id(public_key)
+            public_keys[self.key_id] = public_key
+        else:
+            logger.warning("QR_SIGNING_PRIVATE_KEY not set; member QR codes will not carry signed tokens")
+
+        for encoded in filter(None, (key.strip() for key in os.getenv('QR_SIGNING_RETIRED_PUBLIC_KEYS', '').split(','))):
+            public_key = Ed25519PublicKey.from_public_bytes(b64url_decode(encoded))
+            public_keys[public_key_id(public_key)] = public_key
+
+        self.verifier = QRTokenVerifier(public_keys)
+
+    @property
+    def enabled(self) -> bool:
+        return self._private_key is not None
+
+    def sign_member(self, member: Dict[str, Any]) -> Optional[str]:
+        """
+        Sign a member's id, card serial and registration date
+
+        The token only depends on the member row and the signing key, so the
+        same card always gets the same QR code.
+
+        Returns:
+            The token, or None when signing is not configured or the member
+            has no registration date
+        """
+        if not self.enabled or not member.get('registration_date'):
+            return None
+        issued_on = str(member['registration_date'])[:10]
+        payload = encode_payload(member['member_id'], member.get('id_card_serial_number') or '', issued_on)
+        return b64url_encode(payload + self._private_key.sign(payload))
+
+    def sign_bytes(self, data: bytes) -> bytes:
+        """Raw Ed25519 signature with the current key (used for offline verification bundles)"""
+        if not self.enabled:
+            raise ValueError("QR_SIGNING_PRIVATE_KEY is not configured")
+        return self._private_key.sign(data)
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Verify a token against the current and retired keys (raises InvalidQRToken)"""
+        return self.verifier.verify(token)
+
+    def get_public_keys(self) -> List[Dict[str, str]]:
+        """Public keys for offline verifiers, current key first"""
+        keys = sorted(self.verifier.public_keys.items(), key=lambda item: item[0] != self.key_id)
+        return [
+            {
+                'key_id': key_id,
+                'algorithm': 'Ed25519',
+                'public_key': b64url_encode(key.public_bytes(Encoding.Raw, PublicFormat.Raw)),
+                'current': key_id == self.key_id
+            }
+            for key_id, key in keys
+        ]
+
+def verification_url(frontend_url: str, member_id: str, token: Optional[str] = None) -> str:
+    """
+    Member verification URL
+
+    With a signed token the URL carries only the token, which already holds
+    the member_id; repeating it in the path would only make QR codes denser.
+    """
+    if token:
+        return f"{frontend_url}/verify?{TOKEN_QUERY_PARAM}={token}"
+    return f"{frontend_url}/verify/{member_id}"
+
+# Global instance
+_qr_token_signer = None
+
+def get_qr_token_signer() -> QRTokenSigner:
+    """Get the global QR token signer instance"""
+    global _qr_token_signer
+    if _qr_token_signer is None:
+        _qr_token_signer = QRTokenSigner()
+    return _qr_token_signer
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ['generate-key']:
+        sys.exit("Usage: python qr_signing.py generate-key")
+    key = Ed25519PrivateKey.generate()
+    print(f"QR_SIGNING_PRIVATE_KEY={b64url_encode(key.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption()))}")
+    print(f"# public key {public_key_id(key.public_key())}: "
+          f"{b64url_encode(key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw))}")
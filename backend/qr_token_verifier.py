@@ -0,0 +1,217 @@
+"""
+Verifier for ADYC signed member QR tokens and offline verification bundles
+
+Standalone on purpose: it only needs the 'cryptography' package, so scanner
+apps and event check-in tools can copy this file and validate ID card QR
+codes offline with the public keys published at /api/verify/public-keys.
+
+Token format: base64url(payload + 64-byte Ed25519 signature over payload)
+Payload: version byte (2), issue date as 2-byte big-endian days since
+2000-01-01, member_id length byte, member_id, card serial (rest), all UTF-8.
+Tokens carry no key id; verifiers try each published key (there are only the
+current key and a few retired ones).
+
+Bundle format (from /api/admin/verification-bundle):
+    magic, 4-byte header length, JSON header, sorted 8-byte member_id
+    fingerprints, sorted 8-byte revoked serial fingerprints, Ed25519 signature
+
+Example:
+    verifier = QRTokenVerifier({'3f9a1c2b': 'base64url public key'})
+    claims = verifier.verify(extract_token(scanned_text))
+    bundle = OfflineBundle(open('bundle.bin', 'rb').read(), verifier.public_keys)
+    status = bundle.check(claims['member_id'], claims['serial'])
+"""
+
+import sys
+import json
+import base64
+import bisect
+import hashlib
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Tuple, Union
+from urllib.parse import urlparse, parse_qs
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+TOKEN_VERSION = 2
+TOKEN_QUERY_PARAM = 't'
+TOKEN_EPOCH = date(2000, 1, 1)
+SIGNATURE_SIZE = 64
+
+BUNDLE_MAGIC = b'ADYCVB1\n'
+BUNDLE_SIGNATURE_SIZE = SIGNATURE_SIZE
+
+class InvalidQRToken(ValueError):
+    """The token is malformed, signed by an unknown key, or its signature does not match"""
+
+class InvalidBundle(ValueError):
+    """The bundle is malformed or its signature does not match"""
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+def b64url_decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+def public_key_id(public_key: Ed25519PublicKey) -> str:
+    """
+    Short id of a public key
+
+    Tokens do not carry it (verify tries every known key); it labels keys in
+    /verify/public-keys, in offline bundle headers and in verify() results.
+    """
+    raw = public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)
+    return hashlib.sha256(raw).hexdigest()[:8]
+
+def encode_payload(member_id: str, serial: str, issued_on: Union[date, str]) -> bytes:
+    """Binary token payload; issued_on is a date or a YYYY-MM-DD / YYYYMMDD string"""
+    if isinstance(issued_on, datetime):
+        issued_on = issued_on.date()
+    elif isinstance(issued_on, str):
+        issued_on = datetime.strptime(issued_on.replace('-', ''), '%Y%m%d').date()
+    days = (issued_on - TOKEN_EPOCH).days
+    encoded_member_id = member_id.encode('utf-8')
+    if not 0 <= days < 1 << 16:
+        raise ValueError("Token issue date out of range")
+    if not 0 < len(encoded_member_id) < 256:
+        raise ValueError("Token member_id must be 1-255 bytes")
+    return b''.join([
+        bytes([TOKEN_VERSION]),
+        days.to_bytes(2, 'big'),
+        bytes([len(encoded_member_id)]),
+        encoded_member_id,
+        (serial or '').encode('utf-8')
+    ])
+
+def decode_payload(payload: bytes) -> Tuple[str, str, date]:
+    """(member_id, serial, issued_on) from a payload built by encode_payload"""
+    if len(payload) < 5 or payload[0] != TOKEN_VERSION:
+        raise ValueError("bad payload")
+    member_id_end = 4 + payload[3]
+    if payload[3] == 0 or member_id_end > len(payload):
+        raise ValueError("bad payload")
+    issued_on = TOKEN_EPOCH + timedelta(days=int.from_bytes(payload[1:3], 'big'))
+    return payload[4:member_id_end].decode('utf-8'), payload[member_id_end:].decode('utf-8'), issued_on
+
+def extract_token(scanned: str) -> str:
+    """Get the token from a scanned verification URL, or return the text as-is if it is a bare token"""
+    if '://' in scanned:
+        values = parse_qs(urlparse(scanned).query).get(TOKEN_QUERY_PARAM)
+        if not values:
+            raise InvalidQRToken("QR code does not carry a signed token")
+        return values[0]
+    return scanned.strip()
+
+class QRTokenVerifier:
+    def __init__(self, public_keys: Dict[str, Union[Ed25519PublicKey, str]]):
+        """
+        Args:
+            public_keys: Mapping of key id to public key (object or base64url raw bytes)
+        """
+        self.public_keys = {
+            key_id: key if isinstance(key, Ed25519PublicKey) else Ed25519PublicKey.from_public_bytes(b64url_decode(key))
+            for key_id, key in public_keys.items()
+        }
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Check a token's signature without any network or database access
+
+        Returns:
+            Dict with member_id, serial, issued_on (date) and the key_id that signed it
+
+        Raises:
+            InvalidQRToken: If the token is malformed or not validly signed
+        """
+        try:
+            data = b64url_decode(token.strip())
+        except ValueError:
+            raise InvalidQRToken("Malformed QR token")
+        payload, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+        if len(payload) < 5:
+            raise InvalidQRToken("Malformed QR token")
+        if payload[0] != TOKEN_VERSION:
+            raise InvalidQRToken(f"Unsupported QR token version {payload[0]}")
+
+        for key_id, public_key in self.public_keys.items():
+            try:
+                public_key.verify(signature, payload)
+                break
+            except InvalidSignature:
+                continue
+        else:
+            raise InvalidQRToken("QR token is not validly signed by a known key")
+
+        try:
+            member_id, serial, issued_on = decode_payload(payload)
+        except ValueError:
+            raise InvalidQRToken("Malformed QR token")
+        return {'member_id': member_id, 'serial': serial, 'issued_on': issued_on, 'key_id': key_id}
+
+def bundle_fingerprint(value: str) -> int:
+    """64-bit fingerprint stored in bundles in place of member ids and serials"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def load_fingerprints(data: bytes) -> array:
+    """Sorted big-endian 8-byte fingerprints -> array of ints (still sorted)"""
+    fingerprints = array('Q', data)
+    if sys.byteorder == 'little':
+        fingerprints.byteswap()
+    return fingerprints
+
+class OfflineBundle:
+    def __init__(self, data: bytes, public_keys: Dict[str, Union[Ed25519PublicKey, str]]):
+        """
+        Load and authenticate a signed verification bundle
+
+        Args:
+            data: Bundle bytes as downloaded
+            public_keys: Mapping of key id to public key, as for QRTokenVerifier
+
+        Raises:
+            InvalidBundle: If the bundle is malformed or not validly signed
+        """
+        try:
+            if not data.startswith(BUNDLE_MAGIC):
+                raise ValueError("bad magic")
+            header_start = len(BUNDLE_MAGIC) + 4
+            header_length = int.from_bytes(data[len(BUNDLE_MAGIC):header_start], 'big')
+            self.header = json.loads(data[header_start:header_start + header_length])
+            body_start = header_start + header_length
+            members_end = body_start + self.header['member_count'] * 8
+            revoked_end = members_end + self.header['revoked_count'] * 8
+            if revoked_end + BUNDLE_SIGNATURE_SIZE != len(data):
+                raise ValueError("bad length")
+        except (ValueError, KeyError, TypeError):
+            raise InvalidBundle("Malformed verification bundle")
+
+        public_key = QRTokenVerifier(public_keys).public_keys.get(self.header.get('key_id'))
+        if public_key is None:
+            raise InvalidBundle(f"Bundle signed with unknown key {self.header.get('key_id')}")
+        try:
+            public_key.verify(data[revoked_end:], data[:revoked_end])
+        except InvalidSignature:
+            raise InvalidBundle("Bundle signature is invalid")
+
+        self.members = load_fingerprints(data[body_start:members_end])
+        self.revoked = load_fingerprints(data[members_end:revoked_end])
+
+    @staticmethod
+    def _contains(fingerprints: array, value: str) -> bool:
+        fingerprint = bundle_fingerprint(value)
+        index = bisect.bisect_left(fingerprints, fingerprint)
+        return index < len(fingerprints) and fingerprints[index] == fingerprint
+
+    def is_member(self, member_id: str) -> bool:
+        return self._contains(self.members, member_id)
+
+    def is_revoked(self, serial: str) -> bool:
+        return bool(serial) and self._contains(self.revoked, serial)
+
+    def check(self, member_id: str, serial: str = None) -> str:
+        """'verified', 'revoked' or 'unknown' (not a member as of the bundle's generated_at)"""
+        if not self.is_member(member_id):
+            return 'unknown'
+        return 'revoked' if serial and self.is_revoked(serial) else 'verified'
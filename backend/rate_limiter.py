@@ -0,0 +1,83 @@
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Tuple
+from dotenv import load_dotenv
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+class RateLimitedError(Exception):
+    """Raised when a client has used up its budget"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Rate limit exceeded")
+        self.retry_after = retry_after
+
+class RateLimiter:
+    def __init__(self, rate_per_minute: int, burst: int, max_clients: int = 10000):
+        """
+        Per-client token bucket held in this process
+
+        Each client may spend up to `burst` units at once, refilled at
+        `rate_per_minute`. The least recently seen clients are forgotten once
+        `max_clients` are tracked. Limits are per API process, so the
+        effective budget scales with the number of workers.
+
+        Args:
+            rate_per_minute: Units refilled per minute
+            burst: Bucket size (largest single spend)
+            max_clients: Number of client buckets kept (LRU eviction)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def check(self, client: str, cost: int = 1):
+        """
+        Spend `cost` units of the client's budget
+
+        Raises:
+            RateLimitedError: If the bucket does not hold `cost` units
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens < cost:
+                self._buckets[client] = (tokens, now)
+                self.rejected += 1
+                raise RateLimitedError(max(1, math.ceil((min(cost, self.burst) - tokens) / self.rate)))
+            self._buckets[client] = (tokens - cost, now)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+            self.allowed += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'clients': len(self._buckets),
+                'allowed': self.allowed,
+                'rejected': self.rejected
+            }
+
+# Global instance
+_verify_rate_limiter = None
+
+def get_verify_rate_limiter() -> RateLimiter:
+    """Get the limiter for public verification scans (cost is the number of scans)"""
+    global _verify_rate_limiter
+    if _verify_rate_limiter is None:
+        _verify_rate_limiter = RateLimiter(
+            rate_per_minute=int(os.getenv('VERIFY_RATE_LIMIT_PER_MINUTE', '600')),
+            burst=int(os.getenv('VERIFY_RATE_LIMIT_BURST', os.getenv('VERIFY_BATCH_MAX_ITEMS', '500'))),
+            max_clients=int(os.getenv('VERIFY_RATE_LIMIT_MAX_CLIENTS', '10000'))
+        )
+    return _verify_rate_limiter
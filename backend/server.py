@@ -1,19 +1,35 @@
-from fastapi import FastAPI, APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from fastapi.responses import JSONResponse, StreamingResponse, Response, FileResponse
 from starlette.middleware.cors import CORSMiddleware
 import os
+import re
+import asyncio
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
+from urllib.parse import urlparse, parse_qs
 import uuid
+import base64
+import gzip
 from datetime import datetime, timedelta
-from email_service import get_email_service
+from email_service import get_email_service, shutdown_email_service
 from supabase_service import get_supabase_service
 from cloudinary_service import get_cloudinary_service
 from sanity_service import get_sanity_service
-from qr_service import get_qr_service
+from qr_service import get_qr_service, render_event_qr
+from qr_cache import get_qr_image_cache
+from qr_signing import get_qr_token_signer, InvalidQRToken, verification_url
+from verification_bundle import get_verification_bundle_builder
+from id_card_service import get_id_card_service
+from asset_service import get_asset_registry
+from worker_pool_service import get_worker_pool, PoolSaturatedError
+from rate_limiter import get_verify_rate_limiter, RateLimitedError
+from email_outbox import get_email_outbox, start_inprocess_worker, stop_inprocess_worker
+from member_export import export_members, EXPORT_FORMATS
+from badge_jobs import get_badge_job_manager, BADGE_FORMATS
 import jwt
 from passlib.context import CryptContext
 
@@ -36,6 +52,13 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "adyc-super-secret-key-change-in-produc
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Largest number of scans accepted by POST /api/verify/batch
+VERIFY_BATCH_MAX_ITEMS = int(os.getenv("VERIFY_BATCH_MAX_ITEMS", "500"))
+# Scanned ids are only looked up when they look like member ids (they go into a PostgREST in.() list)
+MEMBER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+# Columns a batch scan needs; photos are left out so a burst of scans stays small, email is only logged
+VERIFY_BATCH_MEMBER_FIELDS = ['member_id', 'full_name', 'email', 'registration_date', 'id_card_serial_number']
+
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -70,6 +93,10 @@ class MemberRegistration(BaseModel):
     gender: str
     registration_date: datetime = Field(default_factory=datetime.utcnow)
 
+class MemberPage(BaseModel):
+    members: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
 class MemberRegistrationCreate(BaseModel):
     email: EmailStr
     passport: str  # base64 encoded image
@@ -136,6 +163,25 @@ class PhotoUploadResponse(BaseModel):
     format: Optional[str] = None
     bytes: Optional[int] = None
 
+class VerifyBatchRequest(BaseModel):
+    items: List[str]  # member ids, signed tokens or scanned verification URLs
+
+# Badge Job Models
+class BadgeJobCreate(BaseModel):
+    format: str = "pdf"  # pdf (A4 badge sheets) or zip (one PNG per member)
+    state: Optional[str] = None
+    lga: Optional[str] = None
+    ward: Optional[str] = None
+    gender: Optional[str] = None
+    registered_from: Optional[datetime] = None
+    registered_to: Optional[datetime] = None
+
+class EventQRCreate(BaseModel):
+    id: str
+    name: Optional[str] = None
+    date: Optional[str] = None
+    location: Optional[str] = None
+
 # QR Code Models
 class QRCodeResponse(BaseModel):
     qr_code_base64: str
@@ -196,15 +242,19 @@ async def get_status_checks():
 
 # Member Registration Endpoints
 @api_router.post("/register", response_model=MemberRegistration)
-async def register_member(input: MemberRegistrationCreate, background_tasks: BackgroundTasks):
+async def register_member(input: MemberRegistrationCreate):
     member_dict = input.dict()
     
     try:
-        # First, upload photo to Cloudinary
-        member_id_temp = f"temp_{uuid.uuid4().hex[:8]}"
+        # Reject known duplicates before paying for the photo upload
+        if await supabase_service.is_email_registered(member_dict['email']):
+            raise ValueError("Email already registered")
+        
+        # Reserve member_id and serial first so the photo is uploaded once under its final id
+        identifiers = supabase_service.generate_member_identifiers()
         photo_result = await cloudinary_service.upload_member_photo(
             base64_image=member_dict['passport'],
-            member_id=member_id_temp
+            member_id=identifiers['member_id']
         )
         
         # Replace base64 passport with Cloudinary URL
@@ -212,41 +262,23 @@ async def register_member(input: MemberRegistrationCreate, background_tasks: Bac
         # Temporarily comment out photo_public_id due to missing column
         # member_dict['photo_public_id'] = photo_result['public_id']
         
-        # Create member using Supabase service (it handles member_id generation and email checking)
-        result = await supabase_service.create_member(member_dict)
-        
-        # Update Cloudinary photo with actual member_id
-        if result.get('member_id'):
-            try:
-                # Upload with correct member_id
-                final_photo_result = await cloudinary_service.upload_member_photo(
-                    base64_image=input.passport,
-                    member_id=result['member_id']
-                )
-                # Update member record with correct photo URL (temporarily skip photo_public_id)
-                await supabase_service.update_member_photo(
-                    result['member_id'], 
-                    final_photo_result['url'],
-                    final_photo_result['public_id']
-                )
-                result['passport'] = final_photo_result['url']
-                # result['photo_public_id'] = final_photo_result['public_id']
-                
-                # Clean up temporary photo
-                await cloudinary_service.delete_member_photo(photo_result['public_id'])
-            except Exception as e:
-                logger.warning(f"Error updating photo with actual member_id: {e}")
+        try:
+            # Create member using Supabase service (duplicate emails fail the insert)
+            result = await supabase_service.create_member(member_dict, identifiers=identifiers)
+        except Exception:
+            # Undo the upload so failed registrations don't leave orphaned photos
+            await cloudinary_service.delete_member_photo(photo_result['public_id'])
+            raise
         
         member_obj = MemberRegistration(**result)
         
-        # Send registration email with ID card PDF in background
-        background_tasks.add_task(get_email_service().send_registration_email, result)
-        
-        # Send admin notification email in background
-        background_tasks.add_task(get_email_service().send_admin_notification_email, result)
+        # Queue the member confirmation and admin notification emails in the durable outbox
+        await asyncio.to_thread(get_email_outbox().enqueue_registration_emails, result)
         
         return member_obj
         
+    except PoolSaturatedError:
+        raise
     except ValueError as e:
         from fastapi import HTTPException
         raise HTTPException(status_code=400, detail=str(e))
@@ -255,10 +287,33 @@ async def register_member(input: MemberRegistrationCreate, background_tasks: Bac
         from fastapi import HTTPException
         raise HTTPException(status_code=500, detail="Registration failed")
 
-@api_router.get("/members", response_model=List[MemberRegistration])
-async def get_members():
-    members = await supabase_service.get_members()
-    return [MemberRegistration(**member) for member in members]
+@api_router.get("/members", response_model=MemberPage)
+async def get_members(
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    state: Optional[str] = None,
+    lga: Optional[str] = None,
+    ward: Optional[str] = None,
+    gender: Optional[str] = None,
+    registered_from: Optional[datetime] = None,
+    registered_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return")
+):
+    """List members newest first; pass next_cursor back as cursor to get the following page"""
+    filters = {name: value for name, value in
+               (('state', state), ('lga', lga), ('ward', ward), ('gender', gender)) if value}
+    try:
+        page = await supabase_service.get_members_page(
+            limit=limit,
+            cursor=cursor,
+            filters=filters,
+            registered_from=registered_from,
+            registered_to=registered_to,
+            fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return MemberPage(**page)
 
 @api_router.get("/members/{member_id}", response_model=MemberRegistration)
 async def get_member(member_id: str):
@@ -268,27 +323,105 @@ async def get_member(member_id: str):
         raise HTTPException(status_code=404, detail="Member not found")
     return MemberRegistration(**member)
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 requires for this header)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag in (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))
+
+# QR images only change when their inputs do, so clients revalidate instead of re-downloading
+QR_CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
 @api_router.get("/members/{member_id}/qr-code", response_model=QRCodeResponse)
-async def get_member_qr_code(member_id: str):
+async def get_member_qr_code(member_id: str, if_none_match: Optional[str] = Header(None)):
     """Generate QR code for member verification"""
     member = await supabase_service.get_member_by_id(member_id)
     if not member:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Member not found")
     
+    qr_cache = get_qr_image_cache()
+    token = get_qr_token_signer().sign_member(member)
+    etag = f'"{qr_cache.digest(member_id, member.get("full_name"), token)}.json"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, **QR_CACHE_HEADERS})
+    
     try:
-        qr_data = qr_service.generate_member_qr(
+        _, png_data = await qr_cache.get_png(member_id, member.get('full_name'), token)
+        qr_data = QRCodeResponse(
+            qr_code_base64=base64.b64encode(png_data).decode(),
+            verification_url=verification_url(get_qr_service().frontend_url, member_id, token),
             member_id=member_id,
-            member_name=member.get('full_name')
+            qr_type='member_verification'
         )
+        return JSONResponse(content=qr_data.dict(), headers={"ETag": etag, **QR_CACHE_HEADERS})
         
-        return QRCodeResponse(**qr_data)
-        
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         logger.error(f"Error generating QR code for member {member_id}: {e}")
         from fastapi import HTTPException
         raise HTTPException(status_code=500, detail="Error generating QR code")
 
+# Raw images can be reused briefly (e.g. badge pages embedding many of them), then revalidated by ETag
+QR_IMAGE_CACHE_HEADERS = {"Cache-Control": "public, max-age=300"}
+
+async def member_qr_image_response(member_id: str, kind: str, if_none_match: Optional[str],
+                                   accept_encoding: Optional[str] = None) -> Response:
+    member = await supabase_service.get_member_by_id(member_id)
+    if not member:
+        raise HTTPException(status_code=404, detail="Member not found")
+    
+    qr_cache = get_qr_image_cache()
+    token = get_qr_token_signer().sign_member(member)
+    # Only the PNG has the name drawn on it
+    member_name = member.get('full_name') if kind == 'png' else None
+    # SVG is text and compresses well (PNG already is compressed); each encoding gets its own ETag
+    use_gzip = kind == 'svg' and 'gzip' in (accept_encoding or '').lower()
+    etag = f'"{qr_cache.digest(member_id, member_name, token)}.{kind}{".gz" if use_gzip else ""}"'
+    headers = {"ETag": etag, **QR_IMAGE_CACHE_HEADERS}
+    if kind == 'svg':
+        headers["Vary"] = "Accept-Encoding"
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    try:
+        if kind == 'png':
+            _, image_data = await qr_cache.get_png(member_id, member_name, token)
+        else:
+            _, image_data = await qr_cache.get_svg(member_id, token)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating QR {kind} for member {member_id}: {e}")
+        raise HTTPException(status_code=500, detail="Error generating QR code")
+    
+    if use_gzip:
+        image_data = gzip.compress(image_data, mtime=0)
+        headers["Content-Encoding"] = "gzip"
+    
+    return Response(
+        content=image_data,
+        media_type="image/png" if kind == 'png' else "image/svg+xml",
+        headers=headers
+    )
+
+@api_router.get("/members/{member_id}/qr-code.png")
+async def get_member_qr_code_png(member_id: str, if_none_match: Optional[str] = Header(None)):
+    """Branded member verification QR code as a PNG image"""
+    return await member_qr_image_response(member_id, 'png', if_none_match)
+
+@api_router.get("/members/{member_id}/qr-code.svg")
+async def get_member_qr_code_svg(
+    member_id: str,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """Member verification QR code as a vector SVG, for printing at any size (gzipped when accepted)"""
+    return await member_qr_image_response(member_id, 'svg', if_none_match, accept_encoding)
+
 @api_router.post("/upload-photo", response_model=PhotoUploadResponse)
 async def upload_member_photo(member_id: str, base64_image: str):
     """Upload member photo to Cloudinary"""
@@ -300,11 +433,164 @@ async def upload_member_photo(member_id: str, base64_image: str):
         
         return PhotoUploadResponse(**photo_result)
         
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         logger.error(f"Error uploading photo for member {member_id}: {e}")
         from fastapi import HTTPException
         raise HTTPException(status_code=500, detail="Error uploading photo")
 
+@api_router.get("/verify/public-keys")
+async def get_verification_public_keys():
+    """Public keys for verifying signed QR tokens offline (public endpoint)"""
+    return {'keys': get_qr_token_signer().get_public_keys()}
+
+@api_router.get("/verify/token/{token}")
+async def verify_member_token(token: str):
+    """Verify a signed QR token without reading the member record (public endpoint)"""
+    signer = get_qr_token_signer()
+    if not signer.verifier.public_keys:
+        raise HTTPException(status_code=503, detail="Signed QR verification is not configured")
+    try:
+        claims = signer.verify(token)
+    except InvalidQRToken as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # The only database dependency, and it is served from a cached list
+    try:
+        revoked = claims['serial'] in await supabase_service.get_revoked_serials()
+        revocation_checked = True
+    except Exception as e:
+        logger.warning(f"Revocation list unavailable: {e}")
+        revoked, revocation_checked = False, False
+    
+    await supabase_service.log_activity(
+        user_email=None,
+        action='MEMBER_VERIFICATION',
+        resource_type='member',
+        resource_id=claims['member_id'],
+        details={'verification_method': 'signed_token', 'serial_number': claims['serial'], 'revoked': revoked}
+    )
+    
+    return {
+        'member_id': claims['member_id'],
+        'serial_number': claims['serial'],
+        'issued_on': claims['issued_on'].isoformat(),
+        'revoked': revoked,
+        'revocation_checked': revocation_checked,
+        'verified': not revoked
+    }
+
+def parse_scan(scanned: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split a scanned value into (member_id, signed token); exactly one is set (tokens are longer than any member id)"""
+    scanned = scanned.strip()
+    if '://' in scanned:
+        url = urlparse(scanned)
+        token = parse_qs(url.query).get('t')
+        if token:
+            return None, token[0]
+        return url.path.rstrip('/').rsplit('/', 1)[-1], None
+    if MEMBER_ID_PATTERN.match(scanned):
+        return scanned, None
+    return None, scanned
+
+@api_router.post("/verify/batch")
+async def verify_members_batch(request: VerifyBatchRequest, http_request: Request):
+    """
+    Verify a burst of queued gate scans in one request (public endpoint)
+    
+    Tokens are checked by signature, plain member ids with a single IN query.
+    Each client address gets a budget of scans per minute (VERIFY_RATE_LIMIT_*).
+    Results carry no contact details. Matched scans are logged one row each,
+    and all misses share one summary row, written in a single multi-row
+    activity log insert. If the member lookup fails, only the plain-id scans
+    are reported 'unavailable'.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No scans to verify")
+    if len(request.items) > VERIFY_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {VERIFY_BATCH_MAX_ITEMS} scans per batch")
+    client_ip = http_request.client.host if http_request.client else None
+    get_verify_rate_limiter().check(client_ip or 'unknown', cost=len(request.items))
+    
+    signer = get_qr_token_signer()
+    scans = [parse_scan(item) for item in request.items]
+    member_ids = [member_id for member_id, _ in scans if member_id and MEMBER_ID_PATTERN.match(member_id)]
+    try:
+        members = await supabase_service.get_members_by_ids(member_ids, fields=VERIFY_BATCH_MEMBER_FIELDS) if member_ids else {}
+    except Exception as e:
+        logger.warning(f"Member lookup unavailable for batch verification: {e}")
+        members = None
+    try:
+        revoked_serials = await supabase_service.get_revoked_serials()
+        revocation_checked = True
+    except Exception as e:
+        logger.warning(f"Revocation list unavailable: {e}")
+        revoked_serials, revocation_checked = frozenset(), False
+    
+    results = []
+    activity = []
+    misses: Dict[str, int] = {}
+    for item, (member_id, token) in zip(request.items, scans):
+        result = {'input': item, 'member_id': member_id, 'verified': False}
+        if token:
+            try:
+                claims = signer.verify(token)
+                result.update({
+                    'member_id': claims['member_id'],
+                    'serial_number': claims['serial'],
+                    'issued_on': claims['issued_on'].isoformat(),
+                    'status': 'revoked' if claims['serial'] in revoked_serials else 'verified'
+                })
+            except InvalidQRToken as e:
+                result.update({'status': 'invalid_token', 'error': str(e)})
+        elif members is None:
+            result['status'] = 'unavailable'
+        else:
+            member = members.get(member_id)
+            if member is None:
+                result['status'] = 'not_found'
+            else:
+                result.update({
+                    'full_name': member.get('full_name'),
+                    'registration_date': member.get('registration_date'),
+                    'status': 'revoked' if member.get('id_card_serial_number') in revoked_serials else 'verified'
+                })
+        result['verified'] = result['status'] == 'verified'
+        results.append(result)
+        
+        if result['status'] in ('verified', 'revoked'):
+            member = (members or {}).get(member_id) or {}
+            activity.append({
+                'user_email': member.get('email'),
+                'action': 'MEMBER_VERIFICATION',
+                'resource_type': 'member',
+                'resource_id': result['member_id'],
+                'details': {'verification_method': 'batch_token' if token else 'batch_id', 'status': result['status']},
+                'ip_address': client_ip
+            })
+        else:
+            misses[result['status']] = misses.get(result['status'], 0) + 1
+    
+    if misses:
+        # Unknown ids and bad tokens are summarised so junk scans cannot flood the activity log
+        activity.append({
+            'user_email': None,
+            'action': 'MEMBER_VERIFICATION_BATCH_MISSES',
+            'resource_type': 'member',
+            'details': {'scans': len(results), 'misses': sum(misses.values()), 'by_status': misses},
+            'ip_address': client_ip
+        })
+    
+    await supabase_service.log_activities(activity)
+    
+    return {
+        'results': results,
+        'count': len(results),
+        'verified': sum(1 for result in results if result['verified']),
+        'revocation_checked': revocation_checked
+    }
+
 @api_router.get("/verify/{member_id}")
 async def verify_member(member_id: str):
     """Verify member for QR code scanning (public endpoint)"""
@@ -338,42 +624,39 @@ async def download_id_card(member_id: str):
     from fastapi.responses import Response
     from fastapi import HTTPException
     
-    member = await supabase_service.get_member_by_id(member_id)
+    # Claim first: only one concurrent request can flip id_card_generated
+    member = await supabase_service.claim_id_card_issuance(member_id)
     if not member:
-        raise HTTPException(status_code=404, detail="Member not found")
+        if not await supabase_service.get_member_by_id(member_id):
+            raise HTTPException(status_code=404, detail="Member not found")
+        raise HTTPException(status_code=400, detail="ID card has already been generated for this member. Each member can only generate their ID card once for security purposes.")
     
     try:
-        # Check if ID card has already been generated
-        if member.get('id_card_generated', False):
-            raise HTTPException(status_code=400, detail="ID card has already been generated for this member. Each member can only generate their ID card once for security purposes.")
-        
-        # Generate PDF
-        pdf_data = get_email_service().generate_id_card_pdf(member)
-        
-        # Mark ID card as generated to prevent future generations
-        await supabase_service.mark_id_card_generated(member_id)
-        
-        # Log the activity
-        await supabase_service.log_activity(
-            user_email=member.get('email'),
-            action='ID_CARD_GENERATED',
-            resource_type='id_card',
-            resource_id=member_id,
-            details={'serial_number': member.get('id_card_serial_number')}
-        )
-        
-        # Return PDF as response
-        return Response(
-            content=pdf_data,
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"attachment; filename=ADYC_ID_Card_{member_id}.pdf"}
-        )
-    except HTTPException:
-        # Re-raise HTTPExceptions (like the 400 error above)
-        raise
+        # Reuses the PDF rendered for the registration emails when it is in this process or the shared ID_CARD_CACHE_DIR
+        pdf_data = await get_id_card_service().get_id_card_pdf_async(member)
     except Exception as e:
+        # The card never reached the member, so give the claim back
+        await supabase_service.release_id_card_claim(member_id)
+        if isinstance(e, PoolSaturatedError):
+            raise
         logger.error(f"Error generating ID card: {e}")
         raise HTTPException(status_code=500, detail="Error generating ID card")
+    
+    # Log the activity
+    await supabase_service.log_activity(
+        user_email=member.get('email'),
+        action='ID_CARD_GENERATED',
+        resource_type='id_card',
+        resource_id=member_id,
+        details={'serial_number': member.get('id_card_serial_number')}
+    )
+    
+    # Return PDF as response
+    return Response(
+        content=pdf_data,
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"attachment; filename=ADYC_ID_Card_{member_id}.pdf"}
+    )
 
 @api_router.post("/send-test-email")
 async def send_test_email(member_id: str):
@@ -509,6 +792,220 @@ async def get_activity_logs(
     logs = await supabase_service.get_activity_logs(limit)
     return logs
 
+@api_router.get("/admin/members/export")
+async def export_member_roster(
+    export_format: str = Query("csv", alias="format", description="csv, ndjson or parquet"),
+    state: Optional[str] = None,
+    lga: Optional[str] = None,
+    ward: Optional[str] = None,
+    gender: Optional[str] = None,
+    registered_from: Optional[datetime] = None,
+    registered_to: Optional[datetime] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to export"),
+    current_admin: dict = Depends(get_current_admin_user)
+):
+    """Stream the member roster as CSV, NDJSON or Parquet (admin only)"""
+    filters = {name: value for name, value in
+               (('state', state), ('lga', lga), ('ward', ward), ('gender', gender)) if value}
+    try:
+        chunks = await export_members(
+            supabase_service,
+            export_format,
+            filters=filters,
+            registered_from=registered_from,
+            registered_to=registered_to,
+            fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await supabase_service.log_activity(
+        user_email=current_admin['email'],
+        action='MEMBERS_EXPORTED',
+        resource_type='member',
+        details={'format': export_format, 'filters': filters}
+    )
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = f"adyc_members_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@api_router.post("/admin/id-cards/{member_id}/revoke")
+async def revoke_id_card(
+    member_id: str,
+    reason: Optional[str] = None,
+    current_admin: dict = Depends(get_current_admin_user)
+):
+    """Revoke a member's current ID card so its signed QR token stops verifying (admin only)"""
+    revocation = await supabase_service.revoke_id_card(member_id, reason=reason, revoked_by=current_admin['email'])
+    if not revocation:
+        raise HTTPException(status_code=404, detail="Member or ID card not found")
+    
+    await supabase_service.log_activity(
+        user_email=current_admin['email'],
+        action='ID_CARD_REVOKED',
+        resource_type='id_card',
+        resource_id=member_id,
+        details={'serial_number': revocation['serial_number'], 'reason': reason}
+    )
+    return revocation
+
+@api_router.get("/admin/verification-bundle")
+async def download_verification_bundle(
+    full: bool = False,
+    current_admin: dict = Depends(get_current_admin_user)
+):
+    """Signed member/revocation bundle for scanners at events without connectivity (admin only)"""
+    builder = get_verification_bundle_builder()
+    try:
+        bundle = await builder.build(supabase_service, get_qr_token_signer(), full=full)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    await supabase_service.log_activity(
+        user_email=current_admin['email'],
+        action='VERIFICATION_BUNDLE_DOWNLOADED',
+        resource_type='verification_bundle',
+        details=builder.last_build
+    )
+    
+    return Response(
+        content=bundle,
+        media_type="application/octet-stream",
+        headers={
+            "Content-Disposition": f"attachment; filename=adyc_verification_bundle_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.bin",
+            "X-Bundle-Member-Count": str(builder.last_build['member_count']),
+            "X-Bundle-Revoked-Count": str(builder.last_build['revoked_count'])
+        }
+    )
+
+@api_router.post("/admin/badges/jobs", status_code=202)
+async def create_badge_job(
+    request: BadgeJobCreate,
+    current_admin: dict = Depends(get_current_admin_user)
+):
+    """Start rendering QR badges for the matching members as A4 sheets or a ZIP (admin only)"""
+    filters = {name: value for name, value in
+               (('state', request.state), ('lga', request.lga), ('ward', request.ward), ('gender', request.gender)) if value}
+    query = {'filters': filters, 'registered_from': request.registered_from, 'registered_to': request.registered_to}
+    try:
+        job = get_badge_job_manager().create_job(
+            supabase_service, get_qr_token_signer(), request.format, query, created_by=current_admin['email']
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await supabase_service.log_activity(
+        user_email=current_admin['email'],
+        action='BADGE_JOB_STARTED',
+        resource_type='badge_job',
+        resource_id=job.id,
+        details={'format': request.format, 'filters': filters}
+    )
+    return job.snapshot()
+
+def get_badge_job_or_404(job_id: str):
+    job = get_badge_job_manager().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Badge job not found")
+    return job
+
+@api_router.get("/admin/badges/jobs/{job_id}")
+async def get_badge_job(job_id: str, current_admin: dict = Depends(get_current_admin_user)):
+    """Get a badge job's progress (admin only)"""
+    return get_badge_job_or_404(job_id).snapshot()
+
+@api_router.get("/admin/badges/jobs/{job_id}/events")
+async def stream_badge_job_events(job_id: str, current_admin: dict = Depends(get_current_admin_user)):
+    """Stream a badge job's progress as server-sent events (admin only)"""
+    job = get_badge_job_or_404(job_id)
+    return StreamingResponse(
+        get_badge_job_manager().stream_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@api_router.get("/admin/badges/jobs/{job_id}/download")
+async def download_badge_job(job_id: str, current_admin: dict = Depends(get_current_admin_user)):
+    """Download a finished badge job's PDF or ZIP (admin only)"""
+    job = get_badge_job_or_404(job_id)
+    if job.status == 'failed':
+        raise HTTPException(status_code=500, detail=f"Badge job failed: {job.error}")
+    if job.status != 'done':
+        raise HTTPException(status_code=409, detail="Badge job is still running")
+    return FileResponse(
+        job.path,
+        media_type=BADGE_FORMATS[job.output_format],
+        filename=f"adyc_badges_{datetime.utcfromtimestamp(job.created_at).strftime('%Y%m%d_%H%M%S')}.{job.output_format}"
+    )
+
+@api_router.post("/admin/events/qr-code")
+async def create_event_qr_code(
+    event: EventQRCreate,
+    current_admin: dict = Depends(get_current_admin_user)
+):
+    """Generate a QR code for an event (admin only)"""
+    try:
+        return await get_worker_pool().run(render_event_qr, event.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/admin/qr/cache-stats")
+async def get_qr_cache_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get QR image cache hit/miss counters per level (admin only)"""
+    return get_qr_image_cache().get_stats()
+
+@api_router.get("/admin/id-cards/cache-stats")
+async def get_id_card_cache_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get ID card render cache hit/miss counters (admin only)"""
+    return get_id_card_service().get_stats()
+
+@api_router.get("/admin/worker-pool/stats")
+async def get_worker_pool_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get worker pool queue depth and job latency metrics (admin only)"""
+    return get_worker_pool().get_stats()
+
+@api_router.get("/admin/email/smtp-stats")
+async def get_smtp_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get SMTP connection pool metrics (admin only)"""
+    return get_email_service().get_smtp_stats()
+
+@api_router.get("/admin/email/outbox")
+async def get_email_outbox_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get outbound email queue depth and failure counts (admin only)"""
+    return await asyncio.to_thread(get_email_outbox().get_stats)
+
+@api_router.post("/admin/email/outbox/{job_id}/retry")
+async def retry_dead_email_job(job_id: int, current_admin: dict = Depends(get_current_admin_user)):
+    """Requeue a dead-lettered email job (admin only)"""
+    if not await asyncio.to_thread(get_email_outbox().retry_dead, job_id):
+        raise HTTPException(status_code=404, detail="Dead-lettered email job not found")
+    return {"message": "Email job requeued", "job_id": job_id}
+
+@api_router.get("/admin/db/query-stats")
+async def get_db_query_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get per-call database latency statistics (admin only)"""
+    return supabase_service.get_query_stats()
+
+@api_router.get("/admin/cache/members")
+async def get_member_cache_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get member cache hit rate and size (admin only)"""
+    return await supabase_service.member_cache.get_stats()
+
+@api_router.get("/admin/registration/email-filter")
+async def get_email_filter_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get registered email Bloom filter state and counters (admin only)"""
+    return supabase_service.email_filter.get_stats()
+
+@api_router.get("/admin/activity/sink-stats")
+async def get_activity_log_sink_stats(current_admin: dict = Depends(get_current_admin_user)):
+    """Get activity log buffer counters (admin only)"""
+    return supabase_service.activity_log_sink.get_stats()
+
 # ADMIN SETUP ENDPOINT (for initial admin creation)
 @api_router.post("/setup/admin")
 async def setup_admin(username: str, email: EmailStr, password: str, setup_key: str):
@@ -536,6 +1033,24 @@ async def setup_admin(username: str, email: EmailStr, password: str, setup_key:
 # Include the router in the main app
 app.include_router(api_router)
 
+@app.exception_handler(RateLimitedError)
+async def rate_limited_handler(request, exc: RateLimitedError):
+    """Tell clients how long to wait once their scan budget is used up"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many verification requests, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request, exc: PoolSaturatedError):
+    """Tell clients to back off when the CPU worker pool is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -554,4 +1069,19 @@ logger = logging.getLogger(__name__)
 # Initialize Supabase tables on startup
 @app.on_event("startup")
 async def startup_event():
-    await supabase_service.create_tables()
\ No newline at end of file
+    await supabase_service.connect()
+    await supabase_service.create_tables()
+    # Activity logs are buffered and written in batches off the request path
+    await supabase_service.activity_log_sink.start()
+    supabase_service.start_email_filter_load()
+    # Decode branding images once so ID card renders never fetch them
+    get_asset_registry().load()
+    # Deliver queued emails from this process unless an external worker is configured
+    start_inprocess_worker()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_inprocess_worker()
+    get_worker_pool().shutdown()
+    shutdown_email_service()
+    await supabase_service.close()
\ No newline at end of file
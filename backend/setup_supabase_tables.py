@@ -3,6 +3,8 @@
 Setup script to create Supabase tables
 Note: This requires direct database access or service role key
 For now, these SQL commands should be executed in the Supabase dashboard
+With DATABASE_URL set, `python migrate.py up` applies this schema plus later
+migrations from backend/migrations instead
 """
 
 # SQL commands to create tables in Supabase:
@@ -0,0 +1,157 @@
+import os
+import time
+import queue
+import smtplib
+import logging
+import threading
+from collections import deque
+from email.message import Message
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the pooled session is no longer usable and should be replaced
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+# Seconds of send timestamps kept for the sends_per_sec stat
+SEND_RATE_WINDOW = 60.0
+
+class SMTPConnectionPool:
+    def __init__(self, host: str, port: int, username: str, password: str, use_tls: bool = True,
+                 pool_size: Optional[int] = None, idle_timeout: Optional[float] = None,
+                 max_messages_per_connection: Optional[int] = None):
+        """
+        Pool of authenticated SMTP sessions shared across sends
+
+        Args:
+            host: SMTP server host
+            port: SMTP server port
+            username: Login username
+            password: Login password
+            use_tls: Whether to STARTTLS before login
+            pool_size: Maximum number of concurrent sessions
+            idle_timeout: Seconds after which an idle session is closed instead of reused
+            max_messages_per_connection: Recycle a session after this many messages
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.pool_size = pool_size or int(os.getenv('EMAIL_SMTP_POOL_SIZE', '2'))
+        self.idle_timeout = idle_timeout or float(os.getenv('EMAIL_SMTP_IDLE_TIMEOUT', '60'))
+        self.max_messages_per_connection = max_messages_per_connection or int(
+            os.getenv('EMAIL_SMTP_MAX_MESSAGES_PER_CONNECTION', '100'))
+
+        # Idle sessions as (connection, last_used, messages_sent); LIFO keeps the warmest one in use
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float, int]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._stats_lock = threading.Lock()
+        self._recent_sends: deque = deque()
+        self.sent = 0
+        self.failed = 0
+        self.handshakes = 0
+        self.reconnects = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open a session: connect, STARTTLS and login"""
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        with self._stats_lock:
+            self.handshakes += 1
+        return server
+
+    def _close(self, server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _acquire(self) -> Tuple[smtplib.SMTP, int]:
+        """Take an idle session that is still fresh, or open a new one"""
+        now = time.monotonic()
+        while True:
+            try:
+                server, last_used, messages_sent = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect(), 0
+            if now - last_used < self.idle_timeout:
+                return server, messages_sent
+            # The provider has most likely dropped it already
+            self._close(server)
+
+    def _release(self, server: smtplib.SMTP, messages_sent: int):
+        if messages_sent >= self.max_messages_per_connection:
+            self._close(server)
+        else:
+            self._idle.put((server, time.monotonic(), messages_sent))
+
+    def send_message(self, msg: Message):
+        """
+        Send a message over a pooled session
+
+        A session that turns out to be disconnected is replaced and the send
+        is retried once on a fresh connection.
+        """
+        with self._slots:
+            server = None
+            try:
+                server, messages_sent = self._acquire()
+                try:
+                    server.send_message(msg)
+                except RECONNECT_ERRORS as e:
+                    logger.info(f"SMTP session dropped ({e}), reconnecting")
+                    self._close(server)
+                    with self._stats_lock:
+                        self.reconnects += 1
+                    server, messages_sent = None, 0
+                    server = self._connect()
+                    server.send_message(msg)
+            except Exception:
+                if server is not None:
+                    self._close(server)
+                with self._stats_lock:
+                    self.failed += 1
+                raise
+
+            self._release(server, messages_sent + 1)
+            with self._stats_lock:
+                self.sent += 1
+                self._recent_sends.append(time.monotonic())
+                self._prune_recent_sends()
+
+    def close_all(self):
+        """Close every idle session"""
+        while True:
+            try:
+                server, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+    def _prune_recent_sends(self):
+        # Caller holds _stats_lock
+        cutoff = time.monotonic() - SEND_RATE_WINDOW
+        while self._recent_sends and self._recent_sends[0] < cutoff:
+            self._recent_sends.popleft()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get send throughput and handshake counters"""
+        with self._stats_lock:
+            self._prune_recent_sends()
+            return {
+                'pool_size': self.pool_size,
+                'idle_connections': self._idle.qsize(),
+                'sent': self.sent,
+                'failed': self.failed,
+                'handshakes': self.handshakes,
+                'reconnects': self.reconnects,
+                'sends_per_sec': round(len(self._recent_sends) / SEND_RATE_WINDOW, 3),
+                'messages_per_handshake': round(self.sent / self.handshakes, 2) if self.handshakes else 0.0
+            }
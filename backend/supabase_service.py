@@ -1,10 +1,17 @@
 import os
+import time
 import asyncio
-from typing import List, Dict, Any, Optional
-from supabase import create_client, Client
-import asyncpg
+from typing import List, Dict, Any, Callable, Optional
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from postgrest.exceptions import APIError
 from dotenv import load_dotenv
+from member_cache import get_member_cache
+from activity_log_sink import ActivityLogSink
+from email_filter import RegisteredEmailFilter
 import logging
+import json
+import base64
+import binascii
 from datetime import datetime, timedelta
 import uuid
 
@@ -13,27 +20,126 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Columns that may be requested from the members listing; the default projection
+# leaves out passport, which holds a full base64 image on legacy rows
+MEMBER_LIST_FIELDS = (
+    'id', 'member_id', 'email', 'passport', 'full_name', 'dob', 'ward', 'lga', 'state',
+    'country', 'address', 'language', 'marital_status', 'gender', 'registration_date',
+    'id_card_generated', 'id_card_serial_number', 'created_at', 'updated_at'
+)
+DEFAULT_MEMBER_LIST_FIELDS = tuple(field for field in MEMBER_LIST_FIELDS if field != 'passport')
+MEMBER_LIST_FILTERS = ('state', 'lga', 'ward', 'gender')
+MEMBER_PAGE_MAX_LIMIT = 500
+
+def encode_member_cursor(member: Dict[str, Any]) -> str:
+    """Encode the (registration_date, id) position of the last row on a page"""
+    position = json.dumps([str(member['registration_date']), str(member['id'])], separators=(',', ':'))
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+def decode_member_cursor(cursor: str) -> tuple:
+    """Decode a members cursor back into (registration_date, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        registration_date, member_uuid = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        datetime.fromisoformat(registration_date)
+        uuid.UUID(member_uuid)
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    return registration_date, member_uuid
+
 class SupabaseService:
     def __init__(self):
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
-        self.database_url = os.getenv('DATABASE_URL')
         
         if not all([self.supabase_url, self.supabase_key]):
             raise ValueError("Missing Supabase configuration. Please check SUPABASE_URL and SUPABASE_ANON_KEY.")
         
-        # Initialize Supabase client
-        self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
-        self._connection_pool = None
+        # Async Supabase client, created on first use; its PostgREST HTTP session is shared by all calls
+        self.supabase: Optional[AsyncClient] = None
+        self._client_lock = asyncio.Lock()
+        self._query_stats: Dict[str, Dict[str, float]] = {}
+        self.member_cache = get_member_cache()
+        self.activity_log_sink = ActivityLogSink(self._insert_activity_logs)
+        self.email_filter = RegisteredEmailFilter()
+        self._email_filter_task: Optional[asyncio.Task] = None
         
-    async def init_connection_pool(self):
-        """Initialize the async connection pool"""
-        if not self._connection_pool:
-            # Extract connection details from DATABASE_URL if needed for direct async operations
-            if self.database_url and '[password]' in self.database_url:
-                # For now, we'll primarily use the Supabase client which handles authentication
-                # If direct DB access is needed, the service key would be required
-                pass
+        # Dashboard stats: PostgREST count method (exact, planned or estimated) and snapshot lifetime
+        self.stats_count_method = os.getenv('DASHBOARD_STATS_COUNT_METHOD', 'exact')
+        self.stats_ttl = float(os.getenv('DASHBOARD_STATS_TTL_SECONDS', '30'))
+        self._stats_snapshot = None
+        self._stats_lock = asyncio.Lock()
+        
+        # Revoked card serials, served stale while a refresh runs so scans never wait on the database
+        self.revocations_ttl = float(os.getenv('REVOCATION_LIST_TTL_SECONDS', '60'))
+        self._revocations_snapshot = None
+        self._revocations_lock = asyncio.Lock()
+        self._revocations_refresh: Optional[asyncio.Task] = None
+        
+    async def connect(self) -> AsyncClient:
+        """Create the shared async Supabase client if it doesn't exist yet"""
+        if self.supabase is None:
+            async with self._client_lock:
+                if self.supabase is None:
+                    self.supabase = await acreate_client(
+                        self.supabase_url,
+                        self.supabase_key,
+                        options=AsyncClientOptions(
+                            postgrest_client_timeout=float(os.getenv('SUPABASE_QUERY_TIMEOUT', '10'))
+                        )
+                    )
+        return self.supabase
+    
+    async def close(self):
+        """Flush buffered activity logs, then close the Supabase HTTP session"""
+        if self._email_filter_task is not None:
+            self._email_filter_task.cancel()
+            self._email_filter_task = None
+        await self.activity_log_sink.stop()
+        if self.supabase is not None:
+            try:
+                await self.supabase.postgrest.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing Supabase client: {e}")
+            self.supabase = None
+    
+    async def _execute(self, name: str, build: Callable[[AsyncClient], Any]):
+        """
+        Build and execute a query on the shared async client, recording its latency
+        
+        Args:
+            name: Label the call is timed under
+            build: Function taking the client and returning a query builder
+            
+        Returns:
+            The PostgREST API response
+        """
+        client = await self.connect()
+        stats = self._query_stats.setdefault(name, {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        start = time.perf_counter()
+        try:
+            return await build(client).execute()
+        except Exception:
+            stats['errors'] += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            logger.debug(f"Supabase {name} took {elapsed_ms:.1f}ms")
+    
+    def get_query_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get per-call database latency statistics"""
+        return {
+            name: {
+                'calls': stats['calls'],
+                'errors': stats['errors'],
+                'avg_ms': round(stats['total_ms'] / stats['calls'], 2) if stats['calls'] else 0.0,
+                'max_ms': round(stats['max_ms'], 2)
+            }
+            for name, stats in self._query_stats.items()
+        }
             
     async def create_tables(self):
         """Create necessary tables if they don't exist using Supabase client"""
@@ -74,7 +180,7 @@ class SupabaseService:
                 'timestamp': datetime.utcnow().isoformat()
             }
             
-            result = self.supabase.table('status_checks').insert(data).execute()
+            result = await self._execute('create_status_check', lambda db: db.table('status_checks').insert(data))
             return result.data[0] if result.data else data
             
         except Exception as e:
@@ -84,7 +190,7 @@ class SupabaseService:
     async def get_status_checks(self) -> List[Dict[str, Any]]:
         """Get all status checks"""
         try:
-            result = self.supabase.table('status_checks').select('*').limit(1000).execute()
+            result = await self._execute('get_status_checks', lambda db: db.table('status_checks').select('*').limit(1000))
             return result.data
             
         except Exception as e:
@@ -92,29 +198,45 @@ class SupabaseService:
             raise
     
     # MEMBERS OPERATIONS
-    async def create_member(self, member_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create a new member"""
+    def generate_member_identifiers(self) -> Dict[str, str]:
+        """
+        Allocate the identifiers for a new member ahead of the insert
+        
+        Returns:
+            Dict with the row id, member_id and id_card_serial_number, so callers
+            can key external resources (e.g. the Cloudinary photo) on the final
+            member_id before the row exists.
+        """
+        current_year = datetime.now().year
+        random_id = f"{uuid.uuid4().hex[:6].upper()}"
+        return {
+            'id': str(uuid.uuid4()),
+            'member_id': f"ADYC-{current_year}-{random_id}",
+            'id_card_serial_number': f"SN-{uuid.uuid4().hex[:8].upper()}"
+        }
+    
+    async def create_member(self, member_data: Dict[str, Any],
+                            identifiers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Create a new member, using pre-allocated identifiers when given"""
         try:
-            # Check if email already exists
-            existing = self.supabase.table('members').select('id').eq('email', member_data['email']).execute()
-            if existing.data:
-                raise ValueError("Email already registered")
-            
-            # Generate unique member ID and serial number
-            current_year = datetime.now().year
-            random_id = f"{uuid.uuid4().hex[:6].upper()}"
-            member_id = f"ADYC-{current_year}-{random_id}"
-            serial_number = f"SN-{uuid.uuid4().hex[:8].upper()}"
+            # Generate unique member ID and serial number unless already reserved
+            identifiers = identifiers or self.generate_member_identifiers()
+            member_id = identifiers['member_id']
             
             data = {
-                'id': str(uuid.uuid4()),
-                'member_id': member_id,
-                'id_card_serial_number': serial_number,
+                **identifiers,
                 'registration_date': datetime.utcnow().isoformat(),
                 **member_data
             }
             
-            result = self.supabase.table('members').insert(data).execute()
+            # The UNIQUE constraint on members.email rejects duplicates, even concurrent ones
+            try:
+                result = await self._execute('insert_member', lambda db: db.table('members').insert(data))
+            except APIError as e:
+                if e.code == '23505' and 'email' in f"{e.message} {e.details}":
+                    raise ValueError("Email already registered")
+                raise
+            self.email_filter.add(member_data['email'])
             
             # Log the activity
             await self.log_activity(
@@ -131,48 +253,326 @@ class SupabaseService:
             logger.error(f"Error creating member: {e}")
             raise
     
-    async def get_members(self) -> List[Dict[str, Any]]:
-        """Get all members"""
+    async def is_email_registered(self, email: str) -> bool:
+        """
+        Cheap duplicate pre-check for registration
+        
+        Only emails the Bloom filter reports as possibly present cost a query;
+        with the filter disabled or still loading this always returns False
+        and the insert's unique constraint does the rejecting.
+        """
+        if not self.email_filter.might_contain(email):
+            return False
+        result = await self._execute('check_member_email', lambda db: db.table('members').select('id').eq('email', email).limit(1))
+        self.email_filter.record_confirmation(bool(result.data))
+        return bool(result.data)
+    
+    def start_email_filter_load(self):
+        """Fill the registered email filter in the background, if it is enabled"""
+        if self.email_filter.enabled and self._email_filter_task is None:
+            self._email_filter_task = asyncio.create_task(self._load_email_filter())
+    
+    async def _load_email_filter(self):
+        page_size = 1000
+        last_id = None
+        try:
+            while True:
+                def build(db):
+                    query = db.table('members').select('id,email').order('id').limit(page_size)
+                    return query.gt('id', last_id) if last_id else query
+                
+                result = await self._execute('load_email_filter', build)
+                self.email_filter.bloom.add_many(row['email'] for row in result.data)
+                if len(result.data) < page_size:
+                    break
+                last_id = result.data[-1]['id']
+            self.email_filter.mark_loaded()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error loading registered email filter, duplicate pre-check disabled: {e}")
+    
+    async def get_members_page(self, limit: int = 100, cursor: Optional[str] = None,
+                               filters: Optional[Dict[str, str]] = None,
+                               registered_from: Optional[datetime] = None,
+                               registered_to: Optional[datetime] = None,
+                               fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get one page of members, newest first, using keyset pagination
+
+        Rows are ordered by (registration_date, id) descending and the page
+        starts strictly after the cursor position, so every page costs one
+        index range scan no matter how deep it is.
+
+        Args:
+            limit: Page size, capped at MEMBER_PAGE_MAX_LIMIT
+            cursor: next_cursor from the previous page
+            filters: Exact-match filters on state, lga, ward and gender
+            registered_from: Only members registered at or after this time
+            registered_to: Only members registered before this time
+            fields: Columns to return (defaults to DEFAULT_MEMBER_LIST_FIELDS)
+
+        Returns:
+            Dict with 'members' and 'next_cursor' (None on the last page)
+        """
+        limit = max(1, min(limit, MEMBER_PAGE_MAX_LIMIT))
+        fields = list(fields or DEFAULT_MEMBER_LIST_FIELDS)
+        unknown = [field for field in fields if field not in MEMBER_LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        unknown = [name for name in (filters or {}) if name not in MEMBER_LIST_FILTERS]
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(unknown)}")
+        position = decode_member_cursor(cursor) if cursor else None
+
+        # The sort key is always selected so the next cursor can be built
+        columns = list(dict.fromkeys(fields + ['registration_date', 'id']))
+
+        def build(db):
+            query = db.table('members').select(','.join(columns))
+            for name, value in (filters or {}).items():
+                query = query.eq(name, value)
+            if registered_from:
+                query = query.gte('registration_date', registered_from.isoformat())
+            if registered_to:
+                query = query.lt('registration_date', registered_to.isoformat())
+            if position:
+                registration_date, member_uuid = position
+                query = query.or_(
+                    f'registration_date.lt."{registration_date}",'
+                    f'and(registration_date.eq."{registration_date}",id.lt.{member_uuid})'
+                )
+            # One extra row tells us whether another page exists
+            return query.order('registration_date', desc=True).order('id', desc=True).limit(limit + 1)
+
+        try:
+            result = await self._execute('get_members_page', build)
+        except Exception as e:
+            logger.error(f"Error fetching members page: {e}")
+            raise
+
+        rows = result.data
+        next_cursor = encode_member_cursor(rows[limit - 1]) if len(rows) > limit else None
+        members = [{field: row.get(field) for field in fields} for row in rows[:limit]]
+        return {'members': members, 'next_cursor': next_cursor}
+    
+    async def get_members_since(self, after: Optional[tuple] = None, since: Optional[str] = None, limit: int = 1000,
+                                fields: str = 'id,member_id,created_at') -> List[Dict[str, Any]]:
+        """
+        Get members in insertion order (created_at, id), oldest first
+        
+        created_at is assigned by the database, unlike the app-assigned
+        registration_date. Rows that commit late can still land behind a
+        saved position, so incremental readers should re-read an overlap
+        window by passing `since` rather than resuming exactly. Pass the last
+        row's (created_at, id) as `after` to fetch the next page.
+        """
+        def build(db):
+            query = db.table('members').select(fields)
+            if since:
+                query = query.gte('created_at', since)
+            if after:
+                created_at, member_uuid = after
+                query = query.or_(
+                    f'created_at.gt."{created_at}",'
+                    f'and(created_at.eq."{created_at}",id.gt.{member_uuid})'
+                )
+            return query.order('created_at').order('id').limit(limit)
+        
         try:
-            result = self.supabase.table('members').select('*').limit(1000).execute()
+            result = await self._execute('get_members_since', build)
             return result.data
-            
         except Exception as e:
-            logger.error(f"Error fetching members: {e}")
+            logger.error(f"Error fetching members since {after}: {e}")
             raise
     
     async def get_member_by_id(self, member_id: str) -> Optional[Dict[str, Any]]:
-        """Get member by member_id"""
+        """Get member by member_id (read-through member cache)"""
         try:
-            result = self.supabase.table('members').select('*').eq('member_id', member_id).execute()
-            return result.data[0] if result.data else None
+            member = await self.member_cache.get(member_id)
+            if member is not None:
+                return member
+            
+            result = await self._execute('get_member_by_id', lambda db: db.table('members').select('*').eq('member_id', member_id))
+            if not result.data:
+                return None
+            
+            await self.member_cache.set(result.data[0])
+            return result.data[0]
             
         except Exception as e:
             logger.error(f"Error fetching member by ID: {e}")
             raise
     
-    async def mark_id_card_generated(self, member_id: str) -> bool:
-        """Mark ID card as generated for a member"""
+    async def get_members_by_ids(self, member_ids: List[str], fields: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get many members by member_id: cached ones from the member cache, the rest with one IN query
+        
+        Args:
+            member_ids: Member ids to look up
+            fields: Columns to read for uncached members (default all); partial rows are not cached
+        
+        Returns:
+            Mapping of member_id to member for the ids that exist
+        """
+        try:
+            members = {}
+            missing = []
+            for member_id in dict.fromkeys(member_ids):
+                member = await self.member_cache.get(member_id)
+                if member is not None:
+                    members[member_id] = member
+                else:
+                    missing.append(member_id)
+            
+            if missing:
+                columns = ','.join(dict.fromkeys(['member_id', *fields])) if fields else '*'
+                result = await self._execute('get_members_by_ids', lambda db: db.table('members').select(columns).in_('member_id', missing))
+                for member in result.data:
+                    if not fields:
+                        await self.member_cache.set(member)
+                    members[member['member_id']] = member
+            
+            return members
+            
+        except Exception as e:
+            logger.error(f"Error fetching members by ID: {e}")
+            raise
+    
+    async def claim_id_card_issuance(self, member_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Atomically mark a member's ID card as issued
+
+        A single conditional update (WHERE id_card_generated is not true) that
+        returns the row, so when requests race only one of them gets it back.
+
+        Returns:
+            The claimed member row, or None if the member does not exist or
+            the card was already issued
+        """
         try:
-            result = self.supabase.table('members').update({
+            result = await self._execute('claim_id_card_issuance', lambda db: db.table('members').update({
                 'id_card_generated': True,
                 'updated_at': datetime.utcnow().isoformat()
-            }).eq('member_id', member_id).execute()
+            }).eq('member_id', member_id).not_.is_('id_card_generated', 'true'))
             
-            return bool(result.data)
+            if not result.data:
+                return None
+            
+            await self.member_cache.set(result.data[0])
+            return result.data[0]
+            
+        except Exception as e:
+            logger.error(f"Error claiming ID card issuance: {e}")
+            raise
+    
+    async def release_id_card_claim(self, member_id: str):
+        """Undo a claim whose card could not be delivered, so the member can try again"""
+        try:
+            result = await self._execute('release_id_card_claim', lambda db: db.table('members').update({
+                'id_card_generated': False,
+                'updated_at': datetime.utcnow().isoformat()
+            }).eq('member_id', member_id))
+            
+            if result.data:
+                await self.member_cache.set(result.data[0])
+            else:
+                await self.member_cache.invalidate(member_id)
+            
+        except Exception as e:
+            logger.error(f"Error releasing ID card claim: {e}")
+            raise
+    
+    async def revoke_id_card(self, member_id: str, reason: Optional[str] = None,
+                             revoked_by: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Revoke a member's current ID card by its serial number
+        
+        Returns:
+            The revocation row, or None if the member has no card serial
+        """
+        try:
+            member = await self.get_member_by_id(member_id)
+            if not member or not member.get('id_card_serial_number'):
+                return None
+            
+            data = {
+                'serial_number': member['id_card_serial_number'],
+                'member_id': member_id,
+                'reason': reason,
+                'revoked_by': revoked_by
+            }
+            result = await self._execute('revoke_id_card', lambda db: db.table('revoked_cards').upsert(data))
+            
+            # Visible to this process immediately; other processes pick it up on their next refresh
+            if self._revocations_snapshot:
+                expires_at, serials = self._revocations_snapshot
+                self._revocations_snapshot = (expires_at, serials | {data['serial_number']})
+            
+            return result.data[0] if result.data else data
             
         except Exception as e:
-            logger.error(f"Error marking ID card as generated: {e}")
+            logger.error(f"Error revoking ID card: {e}")
             raise
     
+    async def get_revoked_serials(self) -> frozenset:
+        """
+        Get the set of revoked card serial numbers
+        
+        Once loaded, an expired list is returned as-is while it is refreshed in
+        the background. Only the very first call waits on the database.
+        """
+        snapshot = self._revocations_snapshot
+        if snapshot is None:
+            return await self._refresh_revocations()
+        if snapshot[0] <= time.monotonic() and (self._revocations_refresh is None or self._revocations_refresh.done()):
+            self._revocations_refresh = asyncio.create_task(self._refresh_revocations_quietly())
+        return snapshot[1]
+    
+    async def _refresh_revocations_quietly(self):
+        try:
+            await self._refresh_revocations()
+        except Exception as e:
+            logger.warning(f"Revocation list refresh failed, serving the previous list: {e}")
+    
+    async def _refresh_revocations(self) -> frozenset:
+        async with self._revocations_lock:
+            snapshot = self._revocations_snapshot
+            if snapshot and snapshot[0] > time.monotonic():
+                return snapshot[1]
+            
+            page_size = 1000
+            serials = set()
+            last_serial = None
+            while True:
+                def build(db):
+                    query = db.table('revoked_cards').select('serial_number').order('serial_number').limit(page_size)
+                    return query.gt('serial_number', last_serial) if last_serial else query
+                
+                result = await self._execute('get_revoked_serials', build)
+                serials.update(row['serial_number'] for row in result.data)
+                if len(result.data) < page_size:
+                    break
+                last_serial = result.data[-1]['serial_number']
+            
+            revoked = frozenset(serials)
+            self._revocations_snapshot = (time.monotonic() + self.revocations_ttl, revoked)
+            return revoked
+    
     async def update_member_photo(self, member_id: str, photo_url: str, photo_public_id: str) -> bool:
         """Update member photo URL (temporarily skip photo_public_id due to missing column)"""
         try:
-            result = self.supabase.table('members').update({
+            result = await self._execute('update_member_photo', lambda db: db.table('members').update({
                 'passport': photo_url,
                 # 'photo_public_id': photo_public_id,  # Temporarily commented out
                 'updated_at': datetime.utcnow().isoformat()
-            }).eq('member_id', member_id).execute()
+            }).eq('member_id', member_id))
+            
+            # Refresh the cached copy with the updated row
+            if result.data:
+                await self.member_cache.set(result.data[0])
+            else:
+                await self.member_cache.invalidate(member_id)
             
             return bool(result.data)
             
@@ -190,7 +590,7 @@ class SupabaseService:
                 **post_data
             }
             
-            result = self.supabase.table('blog_posts').insert(data).execute()
+            result = await self._execute('create_blog_post', lambda db: db.table('blog_posts').insert(data))
             
             # Log the activity
             await self.log_activity(
@@ -210,11 +610,13 @@ class SupabaseService:
     async def get_blog_posts(self, published_only: bool = True) -> List[Dict[str, Any]]:
         """Get blog posts"""
         try:
-            query = self.supabase.table('blog_posts').select('*')
-            if published_only:
-                query = query.eq('published', True)
+            def build(db):
+                query = db.table('blog_posts').select('*')
+                if published_only:
+                    query = query.eq('published', True)
+                return query.order('created_at', desc=True)
             
-            result = query.order('created_at', desc=True).execute()
+            result = await self._execute('get_blog_posts', build)
             return result.data
             
         except Exception as e:
@@ -226,7 +628,7 @@ class SupabaseService:
         try:
             update_data['updated_at'] = datetime.utcnow().isoformat()
             
-            result = self.supabase.table('blog_posts').update(update_data).eq('id', post_id).execute()
+            result = await self._execute('update_blog_post', lambda db: db.table('blog_posts').update(update_data).eq('id', post_id))
             return result.data[0] if result.data else None
             
         except Exception as e:
@@ -236,7 +638,7 @@ class SupabaseService:
     async def delete_blog_post(self, post_id: str) -> bool:
         """Delete a blog post"""
         try:
-            result = self.supabase.table('blog_posts').delete().eq('id', post_id).execute()
+            result = await self._execute('delete_blog_post', lambda db: db.table('blog_posts').delete().eq('id', post_id))
             return bool(result.data)
             
         except Exception as e:
@@ -244,36 +646,46 @@ class SupabaseService:
             raise
     
     async def get_dashboard_stats(self) -> Dict[str, Any]:
-        """Get dashboard statistics"""
+        """Get dashboard statistics (short-TTL snapshot of server-side counts)"""
         try:
-            # Get member count
-            members_result = self.supabase.table('members').select('id').execute()
-            member_count = len(members_result.data)
-            
-            # Get blog post count
-            posts_result = self.supabase.table('blog_posts').select('id').execute()
-            blog_post_count = len(posts_result.data)
-            
-            # Get published blog post count
-            published_posts_result = self.supabase.table('blog_posts').select('id').eq('published', True).execute()
-            published_post_count = len(published_posts_result.data)
-            
-            # Get recent activity count (last 7 days)
-            seven_days_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-            recent_activity_result = self.supabase.table('activity_logs').select('id').gte('created_at', seven_days_ago).execute()
-            recent_activity_count = len(recent_activity_result.data)
-            
-            return {
-                'total_members': member_count,
-                'total_blog_posts': blog_post_count,
-                'published_blog_posts': published_post_count,
-                'recent_activity_count': recent_activity_count
-            }
+            snapshot = self._stats_snapshot
+            if snapshot and snapshot[0] > time.monotonic():
+                return dict(snapshot[1])
+            
+            # One refresh at a time; concurrent dashboard loads reuse its result
+            async with self._stats_lock:
+                snapshot = self._stats_snapshot
+                if snapshot and snapshot[0] > time.monotonic():
+                    return dict(snapshot[1])
+                
+                stats = await self._count_dashboard_stats()
+                self._stats_snapshot = (time.monotonic() + self.stats_ttl, stats)
+                return dict(stats)
             
         except Exception as e:
             logger.error(f"Error fetching dashboard stats: {e}")
             raise
     
+    async def _count_dashboard_stats(self) -> Dict[str, Any]:
+        """Count rows server-side (HEAD requests carrying only a Content-Range count)"""
+        seven_days_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
+        count = self.stats_count_method
+        
+        # Independent queries, so run them concurrently
+        members_result, posts_result, published_posts_result, recent_activity_result = await asyncio.gather(
+            self._execute('stats_members', lambda db: db.table('members').select('id', count=count, head=True)),
+            self._execute('stats_blog_posts', lambda db: db.table('blog_posts').select('id', count=count, head=True)),
+            self._execute('stats_published_posts', lambda db: db.table('blog_posts').select('id', count=count, head=True).eq('published', True)),
+            self._execute('stats_recent_activity', lambda db: db.table('activity_logs').select('id', count=count, head=True).gte('created_at', seven_days_ago))
+        )
+        
+        return {
+            'total_members': members_result.count or 0,
+            'total_blog_posts': posts_result.count or 0,
+            'published_blog_posts': published_posts_result.count or 0,
+            'recent_activity_count': recent_activity_result.count or 0
+        }
+    
     # ADMIN OPERATIONS
     async def create_admin_user(self, admin_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new admin user"""
@@ -284,7 +696,7 @@ class SupabaseService:
                 **admin_data
             }
             
-            result = self.supabase.table('admin_users').insert(data).execute()
+            result = await self._execute('create_admin_user', lambda db: db.table('admin_users').insert(data))
             return result.data[0] if result.data else data
             
         except Exception as e:
@@ -294,7 +706,7 @@ class SupabaseService:
     async def get_admin_user(self, username: str) -> Optional[Dict[str, Any]]:
         """Get admin user by username"""
         try:
-            result = self.supabase.table('admin_users').select('*').eq('username', username).eq('is_active', True).execute()
+            result = await self._execute('get_admin_user', lambda db: db.table('admin_users').select('*').eq('username', username).eq('is_active', True))
             return result.data[0] if result.data else None
             
         except Exception as e:
@@ -306,29 +718,53 @@ class SupabaseService:
                           resource_id: Optional[str] = None, details: Optional[Dict] = None,
                           ip_address: Optional[str] = None, user_agent: Optional[str] = None):
         """Log user activity"""
+        await self.log_activities([{
+            'user_email': user_email,
+            'action': action,
+            'resource_type': resource_type,
+            'resource_id': resource_id,
+            'details': details,
+            'ip_address': ip_address,
+            'user_agent': user_agent
+        }])
+    
+    async def log_activities(self, entries: List[Dict[str, Any]]):
+        """Log several activities at once (keys as in log_activity); written as one multi-row insert"""
         try:
-            data = {
+            created_at = datetime.utcnow().isoformat()
+            rows = [{
                 'id': str(uuid.uuid4()),
-                'user_email': user_email,
-                'action': action,
-                'resource_type': resource_type,
-                'resource_id': resource_id,
-                'details': details,
-                'ip_address': ip_address,
-                'user_agent': user_agent,
-                'created_at': datetime.utcnow().isoformat()
-            }
-            
-            self.supabase.table('activity_logs').insert(data).execute()
+                'user_email': entry.get('user_email'),
+                'action': entry['action'],
+                'resource_type': entry['resource_type'],
+                'resource_id': entry.get('resource_id'),
+                'details': entry.get('details'),
+                'ip_address': entry.get('ip_address'),
+                'user_agent': entry.get('user_agent'),
+                'created_at': created_at
+            } for entry in entries]
+            if not rows:
+                return
+            
+            # Buffered and written in batches by the sink; direct insert when it isn't running (e.g. scripts)
+            if self.activity_log_sink.running:
+                for row in rows:
+                    self.activity_log_sink.enqueue(row)
+            else:
+                await self._insert_activity_logs(rows)
             
         except Exception as e:
             logger.error(f"Error logging activity: {e}")
             # Don't raise here as this shouldn't break the main operation
     
+    async def _insert_activity_logs(self, rows: List[Dict[str, Any]]):
+        """Insert activity log rows in one multi-row statement"""
+        await self._execute('insert_activity_logs', lambda db: db.table('activity_logs').insert(rows))
+    
     async def get_activity_logs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get recent activity logs"""
         try:
-            result = self.supabase.table('activity_logs').select('*').order('created_at', desc=True).limit(limit).execute()
+            result = await self._execute('get_activity_logs', lambda db: db.table('activity_logs').select('*').order('created_at', desc=True).limit(limit))
             return result.data
             
         except Exception as e:
@@ -0,0 +1,176 @@
+import os
+import sys
+import json
+import heapq
+import asyncio
+import logging
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Callable
+from dotenv import load_dotenv
+from qr_token_verifier import BUNDLE_MAGIC, bundle_fingerprint, load_fingerprints
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT_VERSION = 1
+
+def dump_fingerprints(fingerprints: array) -> bytes:
+    """Array of ints -> big-endian 8-byte fingerprints"""
+    data = array('Q', fingerprints)
+    if sys.byteorder == 'little':
+        data.byteswap()
+    return data.tobytes()
+
+def merge_fingerprints(existing: array, new: Iterable[int]) -> array:
+    """Merge new fingerprints into a sorted array, keeping it sorted and free of duplicates"""
+    merged = array('Q')
+    previous = None
+    for fingerprint in heapq.merge(existing, sorted(new)):
+        if fingerprint != previous:
+            merged.append(fingerprint)
+            previous = fingerprint
+    return merged
+
+def encode_bundle(members: array, revoked: array, header: Dict[str, Any], key_id: str,
+                  sign: Callable[[bytes], bytes]) -> bytes:
+    """Serialize and sign a bundle in the layout OfflineBundle reads"""
+    header = {
+        **header,
+        'version': BUNDLE_FORMAT_VERSION,
+        'key_id': key_id,
+        'member_count': len(members),
+        'revoked_count': len(revoked)
+    }
+    encoded_header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    body = b''.join([
+        BUNDLE_MAGIC,
+        len(encoded_header).to_bytes(4, 'big'),
+        encoded_header,
+        dump_fingerprints(members),
+        dump_fingerprints(revoked)
+    ])
+    return body + sign(body)
+
+class VerificationBundleBuilder:
+    def __init__(self):
+        """
+        Incrementally maintained offline verification bundle
+
+        The sorted member fingerprints are kept in VERIFICATION_BUNDLE_DIR with
+        the start time of the build that produced them. The next build reads
+        only members whose database-assigned created_at is at or after that
+        time, minus VERIFICATION_BUNDLE_OVERLAP_SECONDS. The overlap catches
+        inserts that committed after the previous build read past their
+        timestamp, as well as clock skew between the app and the database;
+        re-read members are deduplicated by the merge. As a backstop, a full
+        rebuild runs every VERIFICATION_BUNDLE_FULL_REBUILD_HOURS. The
+        revocation list is small and taken in full every time.
+        """
+        self.state_dir = Path(os.getenv('VERIFICATION_BUNDLE_DIR', str(ROOT_DIR / 'data' / 'verification_bundle')))
+        self.page_size = int(os.getenv('VERIFICATION_BUNDLE_PAGE_SIZE', '1000'))
+        self.overlap = timedelta(seconds=float(os.getenv('VERIFICATION_BUNDLE_OVERLAP_SECONDS', '300')))
+        self.full_rebuild_interval = timedelta(hours=float(os.getenv('VERIFICATION_BUNDLE_FULL_REBUILD_HOURS', '24')))
+        self._lock = asyncio.Lock()
+        self.last_build: Optional[Dict[str, Any]] = None
+
+    @property
+    def _members_path(self) -> Path:
+        return self.state_dir / 'members.bin'
+
+    @property
+    def _state_path(self) -> Path:
+        return self.state_dir / 'state.json'
+
+    def _load_state(self):
+        if not (self._members_path.exists() and self._state_path.exists()):
+            return array('Q'), None
+        state = json.loads(self._state_path.read_text())
+        # State from the registration_date-ordered builder cannot be resumed
+        if 'since' not in state:
+            return array('Q'), None
+        return load_fingerprints(self._members_path.read_bytes()), state
+
+    def _save_state(self, members: Optional[array], state: Dict[str, Any]):
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        # Write both files before swapping either in, and swap the members first, so a
+        # crash never leaves a read position pointing past fingerprints that weren't saved
+        state_tmp = self._state_path.with_suffix('.tmp')
+        state_tmp.write_text(json.dumps(state))
+        if members is not None:
+            members_tmp = self._members_path.with_suffix('.tmp')
+            members_tmp.write_bytes(dump_fingerprints(members))
+            os.replace(members_tmp, self._members_path)
+        os.replace(state_tmp, self._state_path)
+
+    async def build(self, supabase_service, signer, full: bool = False) -> bytes:
+        """
+        Bring the bundle up to date and return it signed
+
+        Args:
+            supabase_service: SupabaseService to read members and revocations from
+            signer: QRTokenSigner holding the signing key
+            full: Rebuild from scratch instead of from the saved position
+
+        Raises:
+            ValueError: If QR signing is not configured
+        """
+        if not signer.enabled:
+            raise ValueError("QR_SIGNING_PRIVATE_KEY is required to sign verification bundles")
+
+        async with self._lock:
+            started = datetime.utcnow()
+            members, state = (array('Q'), None) if full else await asyncio.to_thread(self._load_state)
+            if state is not None and started - datetime.fromisoformat(state['full_built_at']) >= self.full_rebuild_interval:
+                members, state = array('Q'), None
+            full = state is None
+            since = None if full else state['since']
+            previous_count = len(members)
+
+            fingerprints = []
+            position = None
+            while True:
+                rows = await supabase_service.get_members_since(position, since=since, limit=self.page_size)
+                fingerprints.extend(bundle_fingerprint(row['member_id']) for row in rows)
+                if rows:
+                    position = (rows[-1]['created_at'], rows[-1]['id'])
+                if len(rows) < self.page_size:
+                    break
+
+            if fingerprints:
+                members = await asyncio.to_thread(merge_fingerprints, members, fingerprints)
+            new_state = {
+                'since': (started - self.overlap).isoformat() + '+00:00',
+                'full_built_at': started.isoformat() if full else state['full_built_at'],
+                'count': len(members)
+            }
+            changed = full or len(members) != previous_count
+            await asyncio.to_thread(self._save_state, members if changed else None, new_state)
+
+            revoked = array('Q', sorted(bundle_fingerprint(serial) for serial in await supabase_service.get_revoked_serials()))
+            header = {'generated_at': started.isoformat() + 'Z'}
+            bundle = await asyncio.to_thread(encode_bundle, members, revoked, header, signer.key_id, signer.sign_bytes)
+
+            self.last_build = {
+                **header,
+                'member_count': len(members),
+                'revoked_count': len(revoked),
+                'new_members': len(members) - previous_count,
+                'full': full,
+                'size_bytes': len(bundle)
+            }
+            logger.info(f"Built verification bundle: {self.last_build}")
+            return bundle
+
+# Global instance
+_verification_bundle_builder = None
+
+def get_verification_bundle_builder() -> VerificationBundleBuilder:
+    """Get the global verification bundle builder instance"""
+    global _verification_bundle_builder
+    if _verification_bundle_builder is None:
+        _verification_bundle_builder = VerificationBundleBuilder()
+    return _verification_bundle_builder
@@ -0,0 +1,139 @@
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, Optional
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+class PoolSaturatedError(Exception):
+    """Raised when the worker pool has no capacity left for another job"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Worker pool is saturated")
+        self.retry_after = retry_after
+
+def _init_worker():
+    """Per-process setup: decode branding assets once for every job this worker runs"""
+    from asset_service import get_asset_registry
+    get_asset_registry().load()
+
+def _timed_call(fn: Callable, args: tuple):
+    """Run a job inside the worker and report how long it ran, separate from queue wait"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+class WorkerPool:
+    def __init__(self):
+        """
+        Size-bounded process pool for CPU-bound image, PDF and QR jobs
+
+        Jobs run outside the asyncio event loop. Once every worker is busy and
+        the wait queue is full, new jobs are rejected with PoolSaturatedError
+        instead of queueing without bound.
+        """
+        self.max_workers = int(os.getenv('WORKER_POOL_SIZE', str(os.cpu_count() or 2)))
+        self.max_queue = int(os.getenv('WORKER_POOL_MAX_QUEUE', str(self.max_workers * 4)))
+        self.retry_after = int(os.getenv('WORKER_POOL_RETRY_AFTER', '2'))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._jobs: Dict[str, Dict[str, float]] = {}
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn keeps workers from inheriting the event loop and open client sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker
+            )
+            logger.info(f"Started worker pool with {self.max_workers} processes (queue limit {self.max_queue})")
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run a picklable, module-level function in the worker pool
+
+        Args:
+            fn: Function to run in a worker process
+            *args: Positional arguments for the function (must be picklable)
+
+        Returns:
+            The function's return value
+
+        Raises:
+            PoolSaturatedError: If all workers are busy and the wait queue is full
+        """
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(self.retry_after)
+
+        job_name = getattr(fn, '__qualname__', repr(fn))
+        job_stats = self._jobs.setdefault(job_name, {
+            'completed': 0, 'failed': 0, 'total_seconds': 0.0,
+            'run_seconds': 0.0, 'max_seconds': 0.0
+        })
+
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result, run_seconds = await loop.run_in_executor(self._get_executor(), _timed_call, fn, args)
+            elapsed = time.perf_counter() - start
+            job_stats['completed'] += 1
+            job_stats['total_seconds'] += elapsed
+            job_stats['run_seconds'] += run_seconds
+            job_stats['max_seconds'] = max(job_stats['max_seconds'], elapsed)
+            return result
+        except Exception:
+            job_stats['failed'] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, rejection and per-job latency metrics"""
+        jobs = {}
+        for name, stats in self._jobs.items():
+            completed = stats['completed']
+            jobs[name] = {
+                'completed': completed,
+                'failed': stats['failed'],
+                'avg_latency_ms': round(stats['total_seconds'] / completed * 1000, 2) if completed else 0.0,
+                'avg_run_ms': round(stats['run_seconds'] / completed * 1000, 2) if completed else 0.0,
+                'avg_queue_wait_ms': round((stats['total_seconds'] - stats['run_seconds']) / completed * 1000, 2) if completed else 0.0,
+                'max_latency_ms': round(stats['max_seconds'] * 1000, 2)
+            }
+
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'in_flight': self._in_flight,
+            'queue_depth': max(0, self._in_flight - self.max_workers),
+            'rejected': self.rejected,
+            'jobs': jobs
+        }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+# Global instance
+_worker_pool = None
+
+def get_worker_pool() -> WorkerPool:
+    """Get the global worker pool instance"""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool()
+    return _worker_pool
@@ -21,6 +21,22 @@ def create_test_passport_image():
     # Simple 1x1 pixel PNG in base64
     return "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
 
+def find_member_in_list(member_id):
+    """Page through GET /members (newest first) until member_id turns up; returns (response, member)"""
+    cursor = None
+    while True:
+        params = {"limit": 500, "fields": "member_id"}
+        if cursor:
+            params["cursor"] = cursor
+        response = requests.get(f"{BACKEND_URL}/members", params=params)
+        if response.status_code != 200:
+            return response, None
+        page = response.json()
+        member = next((m for m in page["members"] if m["member_id"] == member_id), None)
+        cursor = page["next_cursor"]
+        if member or not cursor:
+            return response, member
+
 def test_comprehensive_member_registration():
     """Test comprehensive member registration with all fields"""
     print("\n=== Comprehensive Member Registration Test ===")
@@ -151,11 +167,8 @@ def test_data_integrity_and_persistence():
             print(f"❌ Failed to retrieve member for integrity check: {response.text}")
             
         # Test data persistence by retrieving from members list
-        response = requests.get(f"{BACKEND_URL}/members")
+        response, found_member = find_member_in_list(member_id)
         if response.status_code == 200:
-            all_members = response.json()
-            found_member = next((m for m in all_members if m["member_id"] == member_id), None)
-            
             if found_member:
                 print("✅ Member persisted in database and retrievable from list")
             else:
@@ -464,10 +477,8 @@ def test_full_crud_operations():
             print(f"❌ READ failed: {response.text}")
         
         # READ - Get all members (should include our test member)
-        response = requests.get(f"{BACKEND_URL}/members")
+        response, found = find_member_in_list(member_id)
         if response.status_code == 200:
-            all_members = response.json()
-            found = any(m["member_id"] == member_id for m in all_members)
             if found:
                 print("✅ READ ALL: Member found in members list")
             else:
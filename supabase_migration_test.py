@@ -52,9 +52,9 @@ def test_supabase_connection():
         print(f"GET /api/members - Status: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            data = response.json()["members"]
             print("✅ Supabase connection working - members table accessible")
-            print(f"✅ Found {len(data)} members in database")
+            print(f"✅ Found {len(data)} members on the first page")
             return True
         elif response.status_code == 500:
             print("❌ Supabase connection issue - likely missing tables")
@@ -118,12 +118,12 @@ def test_member_operations():
     print("\n=== Testing Member Operations ===")
     
     try:
-        # Test GET /api/members (should return empty array if no data)
+        # Test GET /api/members (first page; empty members array if no data)
         response = requests.get(f"{BACKEND_URL}/members")
         print(f"GET /api/members - Status: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
+            data = response.json().get("members")
             if isinstance(data, list):
                 print(f"✅ Members GET endpoint working - returned {len(data)} members")
                 if len(data) == 0:
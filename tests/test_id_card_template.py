@@ -0,0 +1,102 @@
+"""Structural checks on rendered ID card PDFs (backend/id_card_template.py)"""
+
+import re
+import sys
+import zlib
+import base64
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("reportlab")
+pytest.importorskip("qrcode")
+pytest.importorskip("PIL")
+pytest.importorskip("cryptography")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from reportlab import rl_config
+
+MEMBER = {
+    "member_id": "ADYC-2025-5A5514",
+    "full_name": "Zitta Victor",
+    "email": "zittavictor26@gmail.com",
+    "state": "Plateau",
+    "lga": "Jos North",
+    "gender": "Male",
+    "dob": "2005-07-15",
+    "id_card_serial_number": "SN-1A2B3C4D",
+    "registration_date": "2025-09-04T08:59:21.000000",
+}
+
+OBJECT = re.compile(rb"(\d+) 0 obj\s*(.*?)\s*endobj", re.S)
+STREAM = re.compile(rb"^(.*?)stream\r?\n(.*?)\s*endstream$", re.S)
+GS_OPERATOR = re.compile(rb"/([^\s/\[\]<>()]+)\s+gs\b")
+
+def parse_objects(pdf):
+    """Map object number -> (dictionary text, decoded stream or None)"""
+    objects = {}
+    for number, body in OBJECT.findall(pdf):
+        match = STREAM.match(body)
+        if not match:
+            objects[int(number)] = (body, None)
+            continue
+        header, data = match.groups()
+        if b"/ASCII85Decode" in header:
+            data = base64.a85decode(data.strip().rstrip(b"~>"))
+        if b"/FlateDecode" in header:
+            data = zlib.decompress(data)
+        objects[int(number)] = (header, data)
+    return objects
+
+def entry(objects, text, key):
+    """Value of /key in a dictionary, following an indirect reference; None when absent"""
+    match = re.search(rb"/" + key + rb"\s*(<<|(\d+) 0 R)", text)
+    if not match:
+        return None
+    if match.group(2):
+        return objects[int(match.group(2))][0]
+    # Inline dictionary: return it up to its balanced closing >>
+    depth, position = 0, match.start(1)
+    while True:
+        if text.startswith(b"<<", position):
+            depth += 1
+            position += 2
+        elif text.startswith(b">>", position):
+            depth -= 1
+            position += 2
+            if depth == 0:
+                return text[match.start(1):position]
+        else:
+            position += 1
+
+def ext_gstate_names(objects, resources):
+    ext_gstate = entry(objects, resources, b"ExtGState") if resources else None
+    # Entries are inline dictionaries or indirect references; their own keys are never followed by either
+    return set(re.findall(rb"/([^\s/\[\]<>()]+)\s*(?:<<|\d+ 0 R)", (ext_gstate or b"<<>>")[2:-2]))
+
+@pytest.fixture
+def card_pdf(monkeypatch):
+    monkeypatch.setenv("ADYC_ASSETS_REMOTE_FALLBACK", "False")
+    monkeypatch.delenv("QR_SIGNING_PRIVATE_KEY", raising=False)
+    monkeypatch.setattr(rl_config, "pageCompression", 0)
+    from id_card_template import IDCardTemplate
+    return IDCardTemplate().render(MEMBER)
+
+def test_every_gs_operator_resolves_to_a_resource(card_pdf):
+    objects = parse_objects(card_pdf)
+    checked = 0
+    for header, data in objects.values():
+        if re.search(rb"/Type\s*/Page\b", header):
+            content = objects[int(re.search(rb"/Contents\s+(\d+) 0 R", header).group(1))][1]
+        elif re.search(rb"/Subtype\s*/Form\b", header):
+            content = data
+        else:
+            continue
+        # Forms only see their own /Resources, pages their own
+        available = ext_gstate_names(objects, entry(objects, header, b"Resources"))
+        for name in GS_OPERATOR.findall(content):
+            assert name in available, f"/{name.decode()} gs has no ExtGState resource"
+            checked += 1
+    # The translucent watermarks and hologram must have been drawn
+    assert checked
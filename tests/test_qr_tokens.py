@@ -0,0 +1,100 @@
+"""Unit tests for signed member QR tokens (backend/qr_token_verifier.py, backend/qr_signing.py)"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat, PublicFormat, NoEncryption
+from qr_token_verifier import (
+    QRTokenVerifier, InvalidQRToken, b64url_encode, b64url_decode, public_key_id, extract_token, SIGNATURE_SIZE
+)
+from qr_signing import QRTokenSigner, verification_url
+
+MEMBER = {
+    "member_id": "ADYC-2025-5A5514",
+    "id_card_serial_number": "SN-1A2B3C4D",
+    "registration_date": "2025-09-04T08:59:21.000000",
+}
+
+def raw_private_key(key):
+    return b64url_encode(key.private_bytes(Encoding.Raw, PrivateFormat.Raw, NoEncryption()))
+
+def raw_public_key(key):
+    return b64url_encode(key.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw))
+
+@pytest.fixture
+def signing_key():
+    return Ed25519PrivateKey.generate()
+
+@pytest.fixture
+def signer(monkeypatch, signing_key):
+    monkeypatch.setenv("QR_SIGNING_PRIVATE_KEY", raw_private_key(signing_key))
+    monkeypatch.delenv("QR_SIGNING_RETIRED_PUBLIC_KEYS", raising=False)
+    return QRTokenSigner()
+
+def test_round_trip(signer, signing_key):
+    token = signer.sign_member(MEMBER)
+    claims = QRTokenVerifier({public_key_id(signing_key.public_key()): raw_public_key(signing_key)}).verify(token)
+    assert claims == {
+        "member_id": "ADYC-2025-5A5514",
+        "serial": "SN-1A2B3C4D",
+        "issued_on": date(2025, 9, 4),
+        "key_id": signer.key_id,
+    }
+
+def test_token_is_deterministic_and_compact(signer):
+    token = signer.sign_member(MEMBER)
+    assert token == signer.sign_member(dict(MEMBER))
+    # version + date + length byte + member_id + serial + signature, no key id or separators
+    assert len(b64url_decode(token)) == 4 + len(MEMBER["member_id"]) + len(MEMBER["id_card_serial_number"]) + SIGNATURE_SIZE
+
+def test_url_carries_token_only(signer):
+    token = signer.sign_member(MEMBER)
+    url = verification_url("https://adyc.example", MEMBER["member_id"], token)
+    assert url == f"https://adyc.example/verify?t={token}"
+    assert MEMBER["member_id"] not in url
+    assert extract_token(url) == token
+    assert verification_url("https://adyc.example", MEMBER["member_id"]) == "https://adyc.example/verify/ADYC-2025-5A5514"
+
+def test_tampered_payload_is_rejected(signer):
+    data = bytearray(b64url_decode(signer.sign_member(MEMBER)))
+    # Flip one character of the member_id
+    data[4] ^= 0x01
+    with pytest.raises(InvalidQRToken):
+        signer.verify(b64url_encode(bytes(data)))
+
+def test_wrong_signature_is_rejected(signer):
+    data = b64url_decode(signer.sign_member(MEMBER))
+    other_signature = Ed25519PrivateKey.generate().sign(data[:-SIGNATURE_SIZE])
+    with pytest.raises(InvalidQRToken):
+        signer.verify(b64url_encode(data[:-SIGNATURE_SIZE] + other_signature))
+
+def test_unknown_key_is_rejected(signer, monkeypatch):
+    token = signer.sign_member(MEMBER)
+    monkeypatch.setenv("QR_SIGNING_PRIVATE_KEY", raw_private_key(Ed25519PrivateKey.generate()))
+    with pytest.raises(InvalidQRToken):
+        QRTokenSigner().verify(token)
+
+def test_retired_key_still_verifies(signer, signing_key, monkeypatch):
+    token = signer.sign_member(MEMBER)
+    monkeypatch.setenv("QR_SIGNING_PRIVATE_KEY", raw_private_key(Ed25519PrivateKey.generate()))
+    monkeypatch.setenv("QR_SIGNING_RETIRED_PUBLIC_KEYS", raw_public_key(signing_key))
+    rotated = QRTokenSigner()
+    assert rotated.verify(token)["key_id"] == public_key_id(signing_key.public_key()) != rotated.key_id
+
+@pytest.mark.parametrize("token", ["", "not a token", "AAAA", b64url_encode(b"\x01" * 90)])
+def test_malformed_tokens_are_rejected(signer, token):
+    with pytest.raises(InvalidQRToken):
+        signer.verify(token)
+
+def test_unsigned_when_not_configured(monkeypatch):
+    monkeypatch.delenv("QR_SIGNING_PRIVATE_KEY", raising=False)
+    monkeypatch.delenv("QR_SIGNING_RETIRED_PUBLIC_KEYS", raising=False)
+    assert QRTokenSigner().sign_member(MEMBER) is None